@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""
+Batch transcription benchmark against a local stand-in server.
+Writes a folder of synthetic recordings and transcribes it with
+BatchTranscriber at several concurrency limits, with a fresh folder of
+transcripts each time. The stand-in answers after a fixed latency plus a
+share of each file's length. Reports wall time, files per minute, audio
+hours per minute and the most requests the server saw at once, then runs
+the last limit again to check every file is skipped. Exits non-zero if
+the server saw more requests in flight than the limit, a file failed, or
+the second run sent anything.
+
+Usage: python benchmarks/bench_batch.py [--files 40] [--minutes 2]
+           [--workers 1,4,8] [--latency-ms 500] [--rtf 0.002]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_chunked import transcribe_request, write_speech  # noqa: E402
+from benchmarks.fake_deepgram import FakeDeepgramHTTPServer  # noqa: E402
+from src.transcription import TRANSCRIPT_SUFFIX, BatchTranscriber, Transcript  # noqa: E402
+
+
+def run_batch(folder: Path, workers: int, latency_ms: float, rtf: float) -> dict:
+    with FakeDeepgramHTTPServer(latency_ms=latency_ms, seconds_per_audio_second=rtf) as server:
+        batch = BatchTranscriber(
+            lambda path: Transcript.from_result(transcribe_request(server.url, path)), max_workers=workers
+        )
+        report = batch.run([folder])
+        report.update(workers=workers, requests=server.received, max_in_flight=server.max_active)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=40)
+    parser.add_argument("--minutes", type=float, default=2.0, help="Length of each recording")
+    parser.add_argument("--rate", type=int, default=16000)
+    parser.add_argument("--workers", default="1,4,8", help="Comma-separated concurrency limits")
+    parser.add_argument("--latency-ms", type=float, default=500.0, help="Stand-in fixed latency per request")
+    parser.add_argument("--rtf", type=float, default=0.002, help="Stand-in seconds per audio second")
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+    limits = [int(w) for w in args.workers.split(",")]
+
+    with tempfile.TemporaryDirectory() as root:
+        folder = Path(root) / "recordings"
+        folder.mkdir()
+        for i in range(args.files):
+            write_speech(folder / f"memo_{i:03d}.wav", args.minutes, args.rate, seed=i)
+
+        runs = []
+        for workers in limits:
+            for sidecar in folder.glob(f"*{TRANSCRIPT_SUFFIX}"):
+                sidecar.unlink()
+            runs.append(run_batch(folder, workers, args.latency_ms, args.rtf))
+        rerun = run_batch(folder, limits[-1], args.latency_ms, args.rtf)
+        sidecars = len(list(folder.glob(f"*{TRANSCRIPT_SUFFIX}")))
+
+    print(f"{args.files} recordings of {args.minutes:g} min, stand-in latency {args.latency_ms:g} ms")
+    print(f"{'workers':>7} {'wall':>8} {'files/min':>10} {'audio h/min':>12} {'in flight':>10} {'failed':>7}")
+    for run in runs:
+        print(f"{run['workers']:>7} {run['elapsed']:>7.2f}s {run['files_per_minute']:>10.1f} "
+              f"{run['audio_hours_per_minute']:>12.2f} {run['max_in_flight']:>10} {run['failed']:>7}")
+    print(f"rerun     {rerun['skipped']}/{rerun['total']} skipped, {rerun['requests']} requests "
+          f"in {rerun['elapsed'] * 1000:.1f} ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"runs": runs, "rerun": rerun, "sidecars": sidecars}, f, indent=2)
+
+    if (
+        any(run["max_in_flight"] > run["workers"] or run["failed"] for run in runs)
+        or rerun["requests"] or rerun["skipped"] != args.files or sidecars != args.files
+    ):
+        print("\nFAIL: concurrency limit exceeded, a file failed, or the rerun sent requests")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""
+Transcript cache benchmark against a local stand-in server.
+Transcribes a folder of synthetic recordings three times through
+TranscriptCache: cold (hash + request), warm (same files, unchanged) and
+after copying the folder elsewhere, as a restore from sync would. Reports
+per-file latency, hit/miss counts and the cache size, then fills a small
+cache to check LRU eviction keeps it under its limit. Exits non-zero if
+a warm lookup is slower than --max-hit-ms or a restored copy misses.
+
+Usage: python benchmarks/bench_cache.py [--files 20] [--minutes 5]
+           [--latency-ms 300] [--max-hit-ms 10]
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_chunked import transcribe_request, write_speech  # noqa: E402
+from benchmarks.fake_deepgram import FakeDeepgramHTTPServer  # noqa: E402
+from src.transcription import Transcript, TranscriptCache  # noqa: E402
+
+OPTIONS = {"model": "nova-2", "smart_format": True, "punctuate": True, "paragraphs": True}
+
+
+def transcribe(cache: TranscriptCache, url: str, path: Path) -> tuple[Transcript, bool]:
+    """Cache-first transcription, as DeepgramService.transcribe_file does it."""
+    key = cache.key_for(path, OPTIONS)
+    result = cache.get(key)
+    if result is not None:
+        return result, True
+    result = Transcript.from_result(transcribe_request(url, path))
+    cache.put(key, result)
+    return result, False
+
+
+def run_pass(name: str, cache: TranscriptCache, url: str, files: list[Path]) -> dict:
+    times = []
+    hits = 0
+    for path in files:
+        start = time.perf_counter()
+        _, hit = transcribe(cache, url, path)
+        times.append(1000 * (time.perf_counter() - start))
+        hits += hit
+    times = np.array(times)
+    return {
+        "pass": name,
+        "hits": hits,
+        "files": len(files),
+        "ms_p50": float(np.percentile(times, 50)),
+        "ms_max": float(times.max()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--minutes", type=float, default=5.0, help="Length of each recording")
+    parser.add_argument("--rate", type=int, default=16000)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--max-hit-ms", type=float, default=10.0)
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder, FakeDeepgramHTTPServer(latency_ms=args.latency_ms) as server:
+        folder = Path(folder)
+        originals = folder / "recordings"
+        originals.mkdir()
+        files = []
+        for i in range(args.files):
+            path = originals / f"memo_{i:03d}.wav"
+            write_speech(path, args.minutes, args.rate, seed=i)
+            files.append(path)
+        restored = folder / "restored"
+        shutil.copytree(originals, restored)
+        copies = sorted(restored.glob("*.wav"))
+
+        cache = TranscriptCache(folder / "cache.sqlite")
+        passes = [
+            run_pass("cold", cache, server.url, files),
+            run_pass("warm", cache, server.url, files),
+            run_pass("restored", cache, server.url, copies),
+        ]
+        stats = cache.stats()
+        cache.close()
+
+        # A cache that fits about a quarter of the files must stay under its limit
+        entry_bytes = stats["bytes"] / max(1, stats["entries"])
+        small = TranscriptCache(folder / "small.sqlite", max_bytes=int(entry_bytes * args.files / 4))
+        for path in files:
+            transcribe(small, server.url, path)
+        small_stats = small.stats()
+        evicted_ok = small_stats["bytes"] <= small_stats["max_bytes"]
+        # The most recent file must have survived eviction
+        newest_kept = small.get(small.key_for(files[-1], OPTIONS)) is not None
+        small.close()
+
+    print(f"{'pass':<9} {'hits':>6} {'p50':>9} {'max':>9}")
+    for p in passes:
+        print(f"{p['pass']:<9} {p['hits']:>3}/{p['files']:<2} {p['ms_p50']:>7.2f}ms {p['ms_max']:>7.2f}ms")
+    print(f"cache     {stats['entries']} entries, {stats['bytes'] / 1024:.0f} KiB, "
+          f"{stats['hits']} hits / {stats['misses']} misses")
+    print(f"lru       {small_stats['entries']} of {args.files} kept, "
+          f"{small_stats['bytes'] / 1024:.0f} of {small_stats['max_bytes'] / 1024:.0f} KiB, newest kept: {newest_kept}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"passes": passes, "stats": stats, "lru": small_stats}, f, indent=2)
+
+    warm, copy = passes[1], passes[2]
+    if (
+        warm["hits"] != warm["files"] or copy["hits"] != copy["files"]
+        or warm["ms_max"] > args.max_hit_ms or not evicted_ok or not newest_kept
+    ):
+        print("\nFAIL: missed a cached file, slow hit, or eviction over the limit")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
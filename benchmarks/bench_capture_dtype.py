@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+"""
+Benchmark: float32 capture vs native int16 raw capture
+Measures bytes copied per second of audio and callback CPU time for the
+original queue path, the float32 ring path and the int16 RawInputStream path.
+
+Usage: python benchmarks/bench_capture_dtype.py [--seconds 60] [--block 512]
+"""
+
+import argparse
+import queue
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.audio import ChunkedWriter, RingBuffer  # noqa: E402
+
+
+def make_audio(seconds: float, rate: int, channels: int) -> np.ndarray:
+    """Synthesize int16 speech-like noise, as a device would deliver it."""
+    rng = np.random.default_rng(0)
+    audio = rng.standard_normal((int(seconds * rate), channels)) * 3000
+    return audio.astype(np.int16)
+
+
+def run_queue_float32(path, audio, rate, block):
+    """Original path: float32 InputStream, indata.copy() into a queue."""
+    float_audio = audio.astype(np.float32) / 32768
+    q: queue.Queue = queue.Queue()
+    copied = 0
+    callback_times = []
+    with sf.SoundFile(path, "w", samplerate=rate, channels=audio.shape[1],
+                      format="WAV", subtype="PCM_16") as f:
+        for i in range(0, len(float_audio), block):
+            indata = float_audio[i:i + block]
+            t0 = time.perf_counter()
+            q.put(indata.copy())
+            callback_times.append(time.perf_counter() - t0)
+            copied += indata.nbytes
+            data = q.get_nowait()
+            # libsndfile reads the float32 block and converts it to int16
+            f.write(data)
+            copied += data.nbytes
+    return copied, callback_times
+
+
+def run_ring(path, audio, rate, block, raw: bool):
+    """Ring buffer path, either float32 arrays or raw int16 bytes."""
+    channels = audio.shape[1]
+    if raw:
+        dtype, blocks = np.int16, [audio[i:i + block].tobytes() for i in range(0, len(audio), block)]
+    else:
+        float_audio = audio.astype(np.float32) / 32768
+        dtype, blocks = np.float32, [float_audio[i:i + block] for i in range(0, len(audio), block)]
+
+    chunk = rate
+    ring = RingBuffer(2 * chunk, channels, dtype)
+    copied = 0
+    callback_times = []
+    with sf.SoundFile(path, "w", samplerate=rate, channels=channels,
+                      format="WAV", subtype="PCM_16") as f:
+        writer = ChunkedWriter(f, chunk, channels, dtype)
+        for indata in blocks:
+            t0 = time.perf_counter()
+            ring.write(memoryview(indata) if raw else indata)
+            callback_times.append(time.perf_counter() - t0)
+            copied += memoryview(indata).nbytes
+            if ring.available >= chunk:
+                frames = ring.available
+                writer.drain(ring)
+                copied += frames * channels * np.dtype(dtype).itemsize
+        frames = ring.available
+        writer.drain(ring)
+        writer.flush()
+        copied += frames * channels * np.dtype(dtype).itemsize
+    # Chunks handed to libsndfile are read once more on the way to disk
+    copied += writer.frames_written * channels * np.dtype(dtype).itemsize
+    return copied, callback_times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--block", type=int, default=512)
+    parser.add_argument("--rate", type=int, default=44100)
+    parser.add_argument("--channels", type=int, default=1)
+    args = parser.parse_args()
+
+    audio = make_audio(args.seconds, args.rate, args.channels)
+    paths = {
+        "queue float32": lambda p: run_queue_float32(p, audio, args.rate, args.block),
+        "ring float32": lambda p: run_ring(p, audio, args.rate, args.block, raw=False),
+        "ring int16 raw": lambda p: run_ring(p, audio, args.rate, args.block, raw=True),
+    }
+
+    print(f"{args.seconds:.0f}s of audio, {args.rate} Hz, {args.channels} ch, {args.block}-frame blocks\n")
+    print(f"{'path':<16} {'KB copied/s':>12} {'cb mean (us)':>13} {'cb p99 (us)':>12} {'total cpu (s)':>14}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, run in paths.items():
+            start = time.process_time()
+            copied, times = run(Path(tmp) / "bench.wav")
+            cpu = time.process_time() - start
+            times_us = np.array(times) * 1e6
+            print(f"{name:<16} {copied / args.seconds / 1024:>12.1f} "
+                  f"{times_us.mean():>13.2f} {np.percentile(times_us, 99):>12.2f} {cpu:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+"""
+Chunked transcription benchmark against a local stand-in server.
+Writes a long speech-like recording (tone bursts separated by short
+pauses) and transcribes it once as a single request and once through
+ChunkedTranscriber. The stand-in's recognition time grows with audio
+length and it can fail every Nth request. Reports wall time and speedup,
+chunk count, retries, how quiet each cut point was, and whether the
+stitched word timings run in order to the end of the audio. Exits
+non-zero if the timings are out of order or a cut landed in speech.
+
+Usage: python benchmarks/bench_chunked.py [--minutes 60] [--chunk-seconds 300]
+           [--workers 8] [--rtf 0.005] [--fail-every 7]
+"""
+
+import argparse
+import http.client
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import numpy as np
+import soundfile as sf
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.fake_deepgram import FakeDeepgramHTTPServer  # noqa: E402
+from src.transcription import (  # noqa: E402
+    ChunkedTranscriber,
+    iter_file_chunks,
+    plan_chunks,
+    silence_levels,
+    upload_headers,
+)
+
+
+def write_speech(path: Path, minutes: float, rate: int, seed: int = 0):
+    """Write tone "phrases" of 1-3 s separated by 0.3-0.8 s pauses."""
+    rng = np.random.default_rng(seed)
+    total = int(minutes * 60 * rate)
+    written = 0
+    with sf.SoundFile(path, "w", samplerate=rate, channels=1, subtype="PCM_16") as f:
+        while written < total:
+            speech = int(rng.uniform(1.0, 3.0) * rate)
+            t = np.arange(speech) / rate
+            phrase = 0.3 * np.sin(2 * np.pi * rng.uniform(150, 300) * t)
+            phrase += 0.01 * rng.standard_normal(speech)
+            pause = 0.001 * rng.standard_normal(int(rng.uniform(0.3, 0.8) * rate))
+            block = np.concatenate([phrase, pause]).astype(np.float32)[:total - written]
+            f.write(block)
+            written += len(block)
+
+
+def transcribe_request(url: str, path: Path) -> dict:
+    """POST one file to the stand-in, raising on an error status."""
+    parts = urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=600)
+    try:
+        headers = {"Content-Type": "audio/*", **upload_headers(path)}
+        conn.request("POST", parts.path, body=iter_file_chunks(path), headers=headers)
+        response = conn.getresponse()
+        body = response.read()
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status}: {body[:100]!r}")
+        return json.loads(body)
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=60.0)
+    parser.add_argument("--rate", type=int, default=16000)
+    parser.add_argument("--chunk-seconds", type=float, default=300.0)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Stand-in fixed latency per request")
+    parser.add_argument("--rtf", type=float, default=0.005, help="Stand-in seconds per audio second")
+    parser.add_argument("--fail-every", type=int, default=7, help="Every Nth request fails with 503 (0 = never)")
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = Path(folder) / "long.wav"
+        write_speech(path, args.minutes, args.rate)
+
+        with FakeDeepgramHTTPServer(latency_ms=args.latency_ms, seconds_per_audio_second=args.rtf) as server:
+            start = time.perf_counter()
+            single = transcribe_request(server.url, path)
+            single_seconds = time.perf_counter() - start
+
+        with FakeDeepgramHTTPServer(
+            latency_ms=args.latency_ms, seconds_per_audio_second=args.rtf, fail_every=args.fail_every
+        ) as server:
+            chunker = ChunkedTranscriber(
+                lambda chunk: transcribe_request(server.url, chunk),
+                chunk_seconds=args.chunk_seconds,
+                max_workers=args.workers,
+                retry_delay=0.2,
+            )
+            start = time.perf_counter()
+            stitched = chunker.transcribe(path)
+            chunked_seconds = time.perf_counter() - start
+            max_active = server.max_active
+            failures = server.failures
+
+        chunks = plan_chunks(path, args.chunk_seconds)
+        levels, window = silence_levels(path)
+        cut_levels = [float(levels[min(end // window, len(levels) - 1)]) for _, end in chunks[:-1]]
+
+    duration = args.minutes * 60
+    words = stitched.channels[0]
+    in_order = bool(np.all(np.diff(words.starts) >= 0))
+    last_end = float(words.ends[-1]) if len(words) else 0.0
+    single_words = len(single["results"]["channels"][0]["alternatives"][0]["words"])
+
+    result = {
+        "minutes": args.minutes,
+        "chunks": len(chunks),
+        "single_seconds": single_seconds,
+        "chunked_seconds": chunked_seconds,
+        "speedup": single_seconds / chunked_seconds if chunked_seconds else 0.0,
+        "max_in_flight": max_active,
+        "injected_failures": failures,
+        "attempts": chunker.attempts,
+        "cut_level_db_max": max(cut_levels) if cut_levels else None,
+        "words_single": single_words,
+        "words_chunked": len(words),
+        "timings_in_order": in_order,
+        "last_word_end": last_end,
+        "duration": duration,
+    }
+
+    print(f"recording         {args.minutes:g} min in {len(chunks)} chunks of <= {args.chunk_seconds:g} s")
+    print(f"single request    {single_seconds:.2f} s")
+    print(f"chunked           {chunked_seconds:.2f} s ({result['speedup']:.1f}x, "
+          f"{max_active} in flight, {failures} failures, {chunker.attempts} attempts)")
+    if cut_levels:
+        print(f"loudest cut       {max(cut_levels):.1f} dBFS")
+    print(f"words             {single_words} single, {len(words)} stitched, in order: {in_order}")
+    print(f"last word ends    {last_end:.1f} s of {duration:.1f} s")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if not in_order or (cut_levels and max(cut_levels) > -40.0) or last_end > duration:
+        print("\nFAIL: stitched timings out of order or a cut landed in speech")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+"""
+Job queue durability and drain-rate benchmark against a local stand-in.
+Crash: queues a folder of recordings (twice, to check deduplication),
+drains it from a worker process that is killed part-way, then reopens
+the queue and checks the interrupted jobs resume and every recording
+ends up transcribed. Outage: queues more recordings while the stand-in
+answers 503, brings it back, and measures how fast the backlog returns
+to it. Priority: queues the recordings again at a slow drain rate, then
+an interpret job with priority 1, and times how long it waits. Exits
+non-zero if a job is lost or duplicated, the busiest second after
+reconnecting exceeds the drain rate plus its burst, or the priority job
+waits a second or more behind the backlog.
+
+Usage: python benchmarks/bench_jobs.py [--files 30] [--outage-seconds 4]
+           [--per-minute 300] [--workers 4]
+"""
+
+import argparse
+import json
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_chunked import transcribe_request, write_speech  # noqa: E402
+from benchmarks.fake_deepgram import FakeDeepgramHTTPServer  # noqa: E402
+from src.transcription import (  # noqa: E402
+    TRANSCRIPT_SUFFIX,
+    JobQueue,
+    JobRunner,
+    Transcript,
+    write_transcript,
+)
+
+
+def transcribe_handler(url: str):
+    def handler(payload: dict) -> str:
+        path = Path(payload["path"])
+        write_transcript(path, Transcript.from_result(transcribe_request(url, path)))
+        return path.name
+    return handler
+
+
+def drain_in_child(queue_path: str, url: str, per_minute: float, workers: int):
+    """Worker process that drains the queue until it is killed."""
+    queue = JobQueue(queue_path, base_delay=0.2, max_delay=2.0)
+    JobRunner(queue, {"transcribe": transcribe_handler(url)}, per_minute, workers, poll_seconds=0.1).start()
+    while True:
+        time.sleep(1)
+
+
+def drain(queue: JobQueue, runner: JobRunner, timeout: float = 120.0) -> float:
+    """Run until nothing is pending or running; returns seconds taken."""
+    start = time.perf_counter()
+    runner.start()
+    while time.perf_counter() - start < timeout:
+        counts = queue.counts()
+        if not counts["pending"] and not counts["running"]:
+            break
+        time.sleep(0.05)
+    runner.stop()
+    return time.perf_counter() - start
+
+
+def busiest_second(arrivals: list[float]) -> int:
+    """Most requests that arrived within any one-second window."""
+    best = 0
+    first = 0
+    for last, stamp in enumerate(arrivals):
+        while stamp - arrivals[first] >= 1.0:
+            first += 1
+        best = max(best, last - first + 1)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=30)
+    parser.add_argument("--seconds", type=float, default=20.0, help="Length of each recording")
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--per-minute", type=float, default=300.0, help="Queue drain rate")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--outage-seconds", type=float, default=4.0)
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root, FakeDeepgramHTTPServer(latency_ms=args.latency_ms) as server:
+        root = Path(root)
+        files = []
+        for i in range(args.files * 2):
+            path = root / f"memo_{i:03d}.wav"
+            write_speech(path, args.seconds / 60, 16000, seed=i)
+            files.append(path)
+        crash_files, outage_files = files[:args.files], files[args.files:]
+        handlers = {"transcribe": transcribe_handler(server.url)}
+        queue_path = root / "jobs.sqlite"
+
+        # Crash part-way through, then resume
+        queue = JobQueue(queue_path)
+        queued = sum(queue.enqueue("transcribe", str(p), {"path": str(p)}) is not None for p in crash_files)
+        duplicates = sum(queue.enqueue("transcribe", str(p), {"path": str(p)}) is not None for p in crash_files)
+        queue.close()
+
+        child = multiprocessing.get_context("spawn").Process(
+            target=drain_in_child, args=(str(queue_path), server.url, args.per_minute, args.workers)
+        )
+        child.start()
+        while len(list(root.glob(f"*{TRANSCRIPT_SUFFIX}"))) < args.files // 2:
+            time.sleep(0.01)
+        child.kill()
+        child.join()
+        done_before = len(list(root.glob(f"*{TRANSCRIPT_SUFFIX}")))
+
+        queue = JobQueue(queue_path, base_delay=0.2, max_delay=2.0)
+        resumed = queue.resumed
+        left = queue.counts()["pending"]
+        runner = JobRunner(queue, handlers, args.per_minute, args.workers, poll_seconds=0.1)
+        drain(queue, runner)
+        crash_done = sum((p.with_name(p.stem + TRANSCRIPT_SUFFIX)).exists() for p in crash_files)
+        crash_counts = queue.counts()
+
+        # Outage: everything fails until the server comes back
+        server.down = True
+        for path in outage_files:
+            queue.enqueue("transcribe", str(path), {"path": str(path)})
+        runner = JobRunner(queue, handlers, args.per_minute, args.workers, poll_seconds=0.1)
+        runner.start()
+        time.sleep(args.outage_seconds)
+        failed_attempts = server.failures
+        server.down = False
+        back_at = time.monotonic()
+        runner.stop()
+        recovery = drain(queue, JobRunner(queue, handlers, args.per_minute, args.workers, poll_seconds=0.1))
+        after = [stamp for stamp in server.arrivals if stamp >= back_at]
+        peak = busiest_second(after)
+        outage_done = sum((p.with_name(p.stem + TRANSCRIPT_SUFFIX)).exists() for p in outage_files)
+        outage_counts = queue.counts()
+
+        # Priority: an interactive job queued behind a slow-draining backlog
+        for path in outage_files:
+            queue.enqueue("transcribe", str(path), {"path": str(path)})
+        finished = {}
+        runner = JobRunner(
+            queue,
+            {**handlers, "interpret": lambda payload: time.perf_counter()},
+            per_minute=30,
+            max_workers=args.workers,
+            poll_seconds=0.1,
+            on_done=lambda job, result: finished.setdefault(job["kind"], result),
+        )
+        runner.start()
+        time.sleep(1.0)
+        queued_at = time.perf_counter()
+        queue.enqueue("interpret", "open the notes", {"transcript": "open the notes"}, ttl=120, priority=1)
+        runner.wake()
+        while "interpret" not in finished and time.perf_counter() - queued_at < 30:
+            time.sleep(0.01)
+        priority_wait = finished.get("interpret", float("inf")) - queued_at
+        backlog_left = queue.counts()["pending"]
+        runner.stop()
+        queue.close()
+
+    allowed = args.per_minute / 60 + args.workers
+    result = {
+        "queued": queued,
+        "duplicates_added": duplicates,
+        "done_before_kill": done_before,
+        "resumed_running": resumed,
+        "pending_after_kill": left,
+        "crash_transcribed": crash_done,
+        "crash_counts": crash_counts,
+        "outage_failed_attempts": failed_attempts,
+        "outage_transcribed": outage_done,
+        "outage_counts": outage_counts,
+        "recovery_seconds": recovery,
+        "peak_per_second": peak,
+        "allowed_per_second": allowed,
+        "priority_wait_seconds": priority_wait,
+        "backlog_left": backlog_left,
+    }
+
+    print(f"queued            {queued} jobs, {duplicates} duplicates added on re-enqueue")
+    print(f"crash             killed after {done_before} done; {resumed} interrupted jobs resumed, {left} pending")
+    print(f"after resume      {crash_done}/{args.files} transcribed, {crash_counts['failed']} failed")
+    print(f"outage            {failed_attempts} failed attempts in {args.outage_seconds:g}s, "
+          f"{args.files} jobs held")
+    print(f"after reconnect   {outage_done}/{args.files} transcribed in {recovery:.2f}s, "
+          f"busiest second {peak} requests (limit {allowed:g})")
+    print(f"priority job      ran {priority_wait * 1000:.0f}ms after queueing, {backlog_left} transcriptions "
+          f"still waiting")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if (duplicates or crash_done != args.files or outage_done != args.files or peak > allowed
+            or priority_wait >= 1.0):
+        print("\nFAIL: a job was lost or duplicated, the reconnect burst exceeded the drain rate, "
+              "or the priority job waited behind the backlog")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
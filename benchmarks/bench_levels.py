@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+"""
+Live level-meter benchmark using a synthetic audio device.
+Records with and without the LevelAnalyzer attached and reports the
+frames it delivered per second, its cost per frame, and the audio callback
+timing in both runs. Exits non-zero if the analyzer exceeds --max-fps or
+the capture path drops audio while it runs.
+
+Usage: python benchmarks/bench_levels.py [--seconds 10] [--fps 30] [--bands 16]
+           [--block 128]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.fake_device import fake_stream_factory  # noqa: E402
+from src.audio import LevelAnalyzer  # noqa: E402
+from src.recorder import VoiceRecorder  # noqa: E402
+
+
+def run(args, folder: str, with_meter: bool) -> dict:
+    """Record args.seconds, optionally with a level analyzer polling the ring."""
+    config = VoiceRecorder(None)._default_config()
+    config.update(output_folder=folder, format="wav", sample_rate=args.rate, channels=args.channels)
+    recorder = VoiceRecorder(config, stream_factory=fake_stream_factory(blocksize=args.block))
+
+    frame_times = []
+    analyzer = LevelAnalyzer(
+        recorder, lambda frame: frame_times.append(time.perf_counter()),
+        fps=args.fps, bands=args.bands, fft_size=args.fft_size,
+    )
+
+    recorder.start_recording("bench_levels")
+    if with_meter:
+        analyzer.start()
+    time.sleep(args.seconds)
+    recorder.stop_recording()
+    if with_meter:
+        analyzer.stop()
+    recorder.wait_finalized()
+    snapshot = recorder.metrics.snapshot()
+
+    # Cost of one frame, measured on its own so sleeps don't count
+    cost_ms = None
+    if with_meter:
+        recorder.arm()
+        time.sleep(0.5)
+        start = time.perf_counter()
+        for _ in range(200):
+            analyzer.analyze()
+        cost_ms = (time.perf_counter() - start) / 200 * 1000
+        recorder.close()
+
+    span = frame_times[-1] - frame_times[0] if len(frame_times) > 1 else 0.0
+    return {
+        "meter": with_meter,
+        "frames": len(frame_times),
+        "fps": (len(frame_times) - 1) / span if span else 0.0,
+        "frame_cost_ms": cost_ms,
+        "dropouts": snapshot["queue"]["overrun_count"] + snapshot["input_overflow_count"],
+        "callback_us_p99": snapshot["callback_us"]["p99"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--bands", type=int, default=16)
+    parser.add_argument("--fft-size", type=int, default=2048)
+    parser.add_argument("--rate", type=int, default=44100)
+    parser.add_argument("--channels", type=int, default=1)
+    parser.add_argument("--block", type=int, default=128)
+    parser.add_argument("--max-fps", type=float, default=31.0)
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        results = [run(args, folder, False), run(args, folder, True)]
+
+    print(f"{'meter':<6} {'frames':>7} {'fps':>6} {'cost':>8} {'drops':>6} {'cb p99':>8}")
+    failed = False
+    for r in results:
+        cost = f"{r['frame_cost_ms']:.3f}ms" if r["frame_cost_ms"] is not None else "-"
+        print(f"{'on' if r['meter'] else 'off':<6} {r['frames']:>7} {r['fps']:>6.1f} {cost:>8} "
+              f"{r['dropouts']:>6} {r['callback_us_p99']:>6.0f}us")
+        if r["meter"] and (r["fps"] > args.max_fps or r["dropouts"]):
+            failed = True
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if failed:
+        print(f"\nFAIL: meter above {args.max_fps:g} fps or capture dropped audio")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
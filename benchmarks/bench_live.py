@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+"""
+Live streaming transcription benchmark against a local stand-in server.
+Records from a synthetic device while a LiveTranscriptionSession streams
+the capture feed to FakeDeepgramServer, then reports time-to-first-word
+(REC to first interim text), stop-to-final (STOP to the last final result
+and a closed session), bytes on the wire, feed drops and callback timing.
+Exits non-zero if the feed dropped audio or a latency exceeds its limit.
+
+Usage: python benchmarks/bench_live.py [--seconds 10] [--latency-ms 50]
+           [--mode thread|process] [--max-first-word-ms 1500]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.fake_deepgram import FakeDeepgramServer  # noqa: E402
+from benchmarks.fake_device import fake_stream_factory  # noqa: E402
+from src.recorder import VoiceRecorder  # noqa: E402
+from src.recorder_process import RecorderProcess  # noqa: E402
+from src.transcription import LiveTranscriptionSession  # noqa: E402
+
+
+def run(args, folder: str, server: FakeDeepgramServer) -> dict:
+    """Record args.seconds with a live session attached."""
+    config = VoiceRecorder(None)._default_config()
+    config.update(output_folder=folder, format="wav", sample_rate=args.rate, channels=args.channels)
+    factory = fake_stream_factory(blocksize=args.block)
+    if args.mode == "process":
+        recorder = RecorderProcess(config, stream_factory=factory)
+    else:
+        recorder = VoiceRecorder(config, stream_factory=factory)
+
+    partials = []
+    finals = []
+    errors = []
+    feed = recorder.create_live_feed()
+    session = LiveTranscriptionSession(
+        feed,
+        url=server.url,
+        on_partial=partials.append,
+        on_final=finals.append,
+        on_error=errors.append,
+    )
+
+    start = time.perf_counter()
+    recorder.start_recording("bench_live")
+    session.start()
+    time.sleep(args.seconds)
+    stop = time.perf_counter()
+    recorder.stop_recording()
+    session.wait(30)
+    recorder.wait_finalized()
+    snapshot = recorder.metrics.snapshot() if args.mode == "thread" else recorder.refresh_metrics()
+    recorder.close()
+
+    return {
+        "mode": args.mode,
+        "first_word_ms": 1000 * (session.first_word_at - start) if session.first_word_at else None,
+        "stop_to_final_ms": 1000 * (session.finished_at - stop) if session.finished_at else None,
+        "bytes_sent": session.bytes_sent,
+        "messages": session.messages_sent,
+        "audio_seconds": session.bytes_sent / 2 / feed.target_rate,
+        "feed_dropped_frames": feed.dropped_frames,
+        "partials": len(partials),
+        "finals": len([text for text in finals if text]),
+        "words": len(session.transcript.split()),
+        "errors": errors,
+        "callback_us_p99": snapshot["callback_us"]["p99"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--mode", choices=["thread", "process"], default="thread")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Stand-in server reply delay")
+    parser.add_argument("--rate", type=int, default=44100)
+    parser.add_argument("--channels", type=int, default=1)
+    parser.add_argument("--block", type=int, default=512)
+    parser.add_argument("--max-first-word-ms", type=float, default=1500.0)
+    parser.add_argument("--max-stop-to-final-ms", type=float, default=1000.0)
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+
+    with FakeDeepgramServer(latency_ms=args.latency_ms) as server, tempfile.TemporaryDirectory() as folder:
+        result = run(args, folder, server)
+
+    first = result["first_word_ms"]
+    final = result["stop_to_final_ms"]
+    print(f"mode              {result['mode']}")
+    print(f"first word        {first:.0f} ms" if first is not None else "first word        -")
+    print(f"stop to final     {final:.0f} ms" if final is not None else "stop to final     -")
+    print(f"sent              {result['bytes_sent'] / 1024:.0f} KiB in {result['messages']} messages "
+          f"({result['audio_seconds']:.1f} s of audio)")
+    print(f"results           {result['partials']} partial, {result['finals']} final, {result['words']} words")
+    print(f"feed drops        {result['feed_dropped_frames']} frames")
+    print(f"callback p99      {result['callback_us_p99']:.0f} us")
+    for error in result["errors"]:
+        print(f"error             {error}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if (
+        result["errors"]
+        or result["feed_dropped_frames"]
+        or first is None or first > args.max_first_word_ms
+        or final is None or final > args.max_stop_to_final_ms
+    ):
+        print("\nFAIL: errors, dropped live audio or latency over the limit")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+"""
+Headless multi-device capture benchmark using synthetic audio devices.
+Records N fake devices whose clocks run a few ppm apart and open at
+different times, then reports per-device dropouts, padding, measured drift
+against the injected drift, start offsets and CPU use. Exits non-zero on
+dropouts or when a drift estimate is off by more than --max-drift-error.
+
+Usage: python benchmarks/bench_multi.py [--devices 4] [--seconds 30] [--speed 2]
+           [--layout channels|files] [--drift-ppm 40] [--jitter-ms 1]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import soundfile as sf
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.fake_device import fake_stream_factory  # noqa: E402
+from src.recorder import VoiceRecorder  # noqa: E402
+
+
+def run(args, folder: str) -> dict:
+    """Record args.seconds from args.devices fake devices."""
+    devices = list(range(args.devices))
+    # Spread clocks over +-drift_ppm and stagger opening by 20 ms per device
+    spread = [args.drift_ppm * (2 * i / max(1, len(devices) - 1) - 1) for i in devices]
+    device_options = {
+        device: {"clock_ppm": ppm, "start_delay": 0.02 * device, "seed": device}
+        for device, ppm in zip(devices, spread)
+    }
+    factory = fake_stream_factory(
+        device_options=device_options,
+        blocksize=args.block,
+        jitter_ms=args.jitter_ms,
+        speed=args.speed,
+    )
+
+    config = VoiceRecorder(None)._default_config()
+    config.update(
+        output_folder=folder,
+        format=args.format,
+        sample_rate=args.rate,
+        channels=args.channels,
+        multi_devices=devices,
+        multi_layout=args.layout,
+    )
+    recorder = VoiceRecorder(config, stream_factory=factory)
+
+    cpu_before = time.process_time()
+    wall_before = time.perf_counter()
+    path = recorder.start_recording("bench_multi")
+    capture = recorder._multi_capture
+    time.sleep(args.seconds / args.speed)
+    recorder.stop_recording()
+    recorder.wait_finalized()
+    wall = time.perf_counter() - wall_before
+    cpu = time.process_time() - cpu_before
+
+    reference_ppm = spread[0]
+    lanes = []
+    for lane, injected in zip(capture.lanes, spread):
+        snap = lane.snapshot()
+        expected = ((1 + injected / 1e6) / (1 + reference_ppm / 1e6) - 1) * 1e6
+        lanes.append({
+            "device": lane.device,
+            "dropouts": snap["capture"]["queue"]["overrun_count"] + snap["capture"]["input_overflow_count"],
+            "gap_frames": snap["gap_frames"],
+            "offset_ms": 1000 * snap["offset_frames"] / args.rate,
+            "drift_ppm": snap["drift_ppm"],
+            "expected_ppm": expected,
+            "drift_error_ppm": abs(snap["drift_ppm"] - expected),
+            "callback_us_p99": snap["capture"]["callback_us"]["p99"],
+        })
+
+    files = capture.output_paths(path)
+    return {
+        "layout": args.layout,
+        "lanes": lanes,
+        "files": [{"name": p.name, "frames": sf.info(str(p)).frames} for p in files],
+        "cpu_percent": 100 * cpu / wall if wall else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--devices", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=30.0, help="Audio seconds to record")
+    parser.add_argument("--speed", type=float, default=1.0, help="Deliver audio N times faster than real time")
+    parser.add_argument("--rate", type=int, default=44100)
+    parser.add_argument("--channels", type=int, default=1)
+    parser.add_argument("--block", type=int, default=512)
+    parser.add_argument("--jitter-ms", type=float, default=1.0)
+    parser.add_argument("--drift-ppm", type=float, default=40.0, help="Clock spread across devices")
+    parser.add_argument("--layout", choices=["channels", "files"], default="channels")
+    parser.add_argument("--format", choices=["wav", "flac", "ogg"], default="wav")
+    parser.add_argument("--max-dropouts", type=int, default=0)
+    parser.add_argument("--max-drift-error", type=float, default=20.0, help="ppm")
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        result = run(args, folder)
+
+    print(f"{'dev':>3} {'drops':>6} {'gap':>7} {'offset':>8} {'drift':>9} {'expect':>9} {'cb p99':>8}")
+    failed = False
+    for lane in result["lanes"]:
+        print(f"{lane['device']:>3} {lane['dropouts']:>6} {lane['gap_frames']:>7} {lane['offset_ms']:>6.1f}ms "
+              f"{lane['drift_ppm']:>6.1f}ppm {lane['expected_ppm']:>6.1f}ppm {lane['callback_us_p99']:>6.0f}us")
+        if lane["dropouts"] > args.max_dropouts or lane["drift_error_ppm"] > args.max_drift_error:
+            failed = True
+    for f in result["files"]:
+        print(f"{f['name']}: {f['frames']} frames")
+    print(f"cpu {result['cpu_percent']:.1f}%")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if failed:
+        print(f"\nFAIL: dropouts > {args.max_dropouts} or drift error > {args.max_drift_error:g} ppm")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""
+Upload preparation benchmark against a local stand-in server.
+Writes a speech-like capture as the recorder does (44.1 kHz 16-bit WAV)
+and measures stop-to-transcript time and bytes on the wire for three
+paths: the raw file, PreparedUpload to 16 kHz mono FLAC, and to Opus.
+The stand-in reads request bodies no faster than a simulated uplink and
+reports the audio length it decoded from each. Exits non-zero if a
+prepared upload isn't at least --min-ratio times smaller and faster than
+the raw one, or the stand-in heard a different length of audio.
+
+Usage: python benchmarks/bench_prepare.py [--minutes 10] [--uplink-mbps 10]
+           [--channels 1] [--min-ratio 4]
+"""
+
+import argparse
+import http.client
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import numpy as np
+import soundfile as sf
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_chunked import write_speech  # noqa: E402
+from benchmarks.fake_deepgram import FakeDeepgramHTTPServer  # noqa: E402
+from src.transcription import PreparedUpload, iter_file_chunks, upload_headers  # noqa: E402
+
+
+def post(url: str, body, headers: dict) -> dict:
+    """POST a body (chunked if it has no Content-Length) and parse the reply."""
+    parts = urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=600)
+    try:
+        conn.request("POST", parts.path, body=body, headers=headers)
+        response = conn.getresponse()
+        data = response.read()
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status}: {data[:100]!r}")
+        return json.loads(data)
+    finally:
+        conn.close()
+
+
+def run_path(name: str, path: Path, server: FakeDeepgramHTTPServer) -> dict:
+    start = time.perf_counter()
+    if name == "raw":
+        result = post(server.url, iter_file_chunks(path), {"Content-Type": "audio/*", **upload_headers(path)})
+    else:
+        body = PreparedUpload(path, name)
+        result = post(server.url, iter(body), {"Content-Type": body.content_type})
+    seconds = time.perf_counter() - start
+    request = server.requests[-1]
+    return {
+        "path": name,
+        "bytes": request["bytes"],
+        "seconds": seconds,
+        "heard_seconds": result["metadata"]["duration"],
+        "words": len(result["results"]["channels"][0]["alternatives"][0]["words"]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=10.0)
+    parser.add_argument("--rate", type=int, default=44100)
+    parser.add_argument("--channels", type=int, default=1)
+    parser.add_argument("--uplink-mbps", type=float, default=10.0, help="Simulated upload bandwidth")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="Stand-in recognition latency")
+    parser.add_argument("--min-ratio", type=float, default=4.0, help="Required size reduction of prepared uploads")
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        mono = Path(folder) / "mono.wav"
+        write_speech(mono, args.minutes, args.rate)
+        path = Path(folder) / "capture.wav"
+        audio, _ = sf.read(mono, dtype="int16")
+        sf.write(path, np.repeat(audio[:, None], args.channels, axis=1), args.rate, subtype="PCM_16")
+        duration = sf.info(str(path)).duration
+
+        runs = []
+        with FakeDeepgramHTTPServer(latency_ms=args.latency_ms, upload_mbps=args.uplink_mbps) as server:
+            for name in ("raw", "flac", "opus"):
+                runs.append(run_path(name, path, server))
+
+    raw = runs[0]
+    print(f"capture {args.minutes:g} min, {args.rate} Hz, {args.channels} ch; uplink {args.uplink_mbps:g} Mbit/s")
+    print(f"{'path':<6} {'on wire':>10} {'ratio':>7} {'stop->text':>11} {'speedup':>8} {'heard':>9} {'words':>7}")
+    for run in runs:
+        run["size_ratio"] = raw["bytes"] / run["bytes"]
+        run["speedup"] = raw["seconds"] / run["seconds"]
+        print(f"{run['path']:<6} {run['bytes'] / 1e6:>8.2f}MB {run['size_ratio']:>6.1f}x "
+              f"{run['seconds']:>10.2f}s {run['speedup']:>7.1f}x {run['heard_seconds']:>8.1f}s {run['words']:>7}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"duration": duration, "runs": runs}, f, indent=2)
+
+    prepared = runs[1:]
+    if (
+        any(run["size_ratio"] < args.min_ratio or run["speedup"] < 1.0 for run in prepared)
+        or any(abs(run["heard_seconds"] - duration) > 0.1 for run in runs)
+    ):
+        print("\nFAIL: prepared upload not smaller/faster enough, or audio length changed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
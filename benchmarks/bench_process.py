@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+"""
+Stress benchmark: capture in-process vs. in a dedicated capture process.
+Keeps this process's "UI" thread and N helper threads busy with pure-Python
+work that holds the GIL, records synthetic audio both ways, and reports
+callback overflows (blocks the device could not hand over in time), ring
+dropouts and how often the shared monitor feed had fresh audio for a UI
+frame. Exits non-zero if the capture-process mode has any dropouts or
+overflows.
+
+Usage: python benchmarks/bench_process.py [--seconds 15] [--busy-threads 4]
+           [--modes thread process]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.fake_device import fake_stream_factory  # noqa: E402
+from src.recorder import VoiceRecorder  # noqa: E402
+from src.recorder_process import RecorderProcess  # noqa: E402
+
+
+def busy(stop: threading.Event):
+    """Hold the GIL with pure-Python work, like a parser or a PTY reader."""
+    while not stop.is_set():
+        total = 0
+        for i in range(20000):
+            total += i * i
+
+
+def run_mode(mode: str, args, folder: str) -> dict:
+    """Record args.seconds with the GIL under load."""
+    config = VoiceRecorder(None)._default_config()
+    config.update(
+        output_folder=folder,
+        format=args.format,
+        sample_rate=args.rate,
+        channels=args.channels,
+    )
+    factory = fake_stream_factory(blocksize=args.block, report_late=True)
+    if mode == "process":
+        recorder = RecorderProcess(config, stream_factory=factory)
+    else:
+        recorder = VoiceRecorder(config, stream_factory=factory)
+
+    finalized = threading.Event()
+    recorder.on_finalized = lambda path: finalized.set()
+
+    stop = threading.Event()
+    helpers = [threading.Thread(target=busy, args=(stop,), daemon=True) for _ in range(args.busy_threads)]
+    for thread in helpers:
+        thread.start()
+
+    # The "UI thread": poll levels at ~30 fps and burn the rest of each frame
+    monitor = getattr(recorder, "monitor", None)
+    polls = fresh = 0
+    last_pos = 0
+    recorder.start_recording(f"bench_{mode}")
+    deadline = time.perf_counter() + args.seconds
+    while time.perf_counter() < deadline:
+        frame_end = time.perf_counter() + 1 / 30
+        if monitor is not None and monitor.sample_rate:
+            monitor.peek_latest(monitor.sample_rate // 30)
+            polls += 1
+            fresh += monitor.write_pos > last_pos
+            last_pos = monitor.write_pos
+        while time.perf_counter() < frame_end:
+            sum(i * i for i in range(2000))
+
+    recorder.stop_recording()
+    finalized.wait(30)
+    stop.set()
+    for thread in helpers:
+        thread.join()
+
+    if mode == "process":
+        snapshot = recorder.refresh_metrics()
+    else:
+        snapshot = recorder.metrics.snapshot()
+    recorder.close()
+
+    return {
+        "mode": mode,
+        "overflows": snapshot["input_overflow_count"],
+        "dropouts": snapshot["queue"]["overrun_count"],
+        "callbacks": snapshot["callback_count"],
+        "callback_us_p99": snapshot["callback_us"]["p99"],
+        "write_max_ms": snapshot["write_max_ms"],
+        "monitor_fresh": fresh / polls if polls else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=15.0)
+    parser.add_argument("--busy-threads", type=int, default=4, help="GIL-holding helper threads")
+    parser.add_argument("--rate", type=int, default=44100)
+    parser.add_argument("--channels", type=int, default=1)
+    parser.add_argument("--block", type=int, default=256)
+    parser.add_argument("--format", choices=["wav", "flac", "ogg"], default="flac")
+    parser.add_argument("--modes", nargs="+", choices=["thread", "process"], default=["thread", "process"])
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as folder:
+        for mode in args.modes:
+            results.append(run_mode(mode, args, folder))
+
+    print(f"{'mode':<8} {'overflow':>8} {'drops':>6} {'callbacks':>9} {'cb p99':>8} {'wr max':>8} {'fresh':>6}")
+    failed = False
+    for r in results:
+        fresh = f"{r['monitor_fresh']:.0%}" if r["monitor_fresh"] is not None else "-"
+        print(f"{r['mode']:<8} {r['overflows']:>8} {r['dropouts']:>6} {r['callbacks']:>9} "
+              f"{r['callback_us_p99']:>6.0f}us {r['write_max_ms']:>6.1f}ms {fresh:>6}")
+        if r["mode"] == "process" and (r["overflows"] or r["dropouts"]):
+            failed = True
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if failed:
+        print("\nFAIL: the capture process dropped audio while this process was busy")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+"""
+Headless VoiceRecorder benchmark using a synthetic audio device.
+Reports dropouts, capture-to-disk latency, CPU use and memory growth per
+format, and exits non-zero when a threshold is exceeded so CI can gate on it.
+
+Usage: python benchmarks/bench_recorder.py [--seconds 20] [--speed 4]
+           [--jitter-ms 2] [--slow-write-ms 0] [--formats wav flac ogg]
+"""
+
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.fake_device import fake_stream_factory  # noqa: E402
+from src.recorder import VoiceRecorder  # noqa: E402
+
+
+def rss_bytes() -> int:
+    """Current resident set size (falls back to peak RSS off Linux)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def capture_latencies(deliveries: list, writes: list) -> np.ndarray:
+    """Seconds from each block's delivery until a write covering it finished."""
+    write_frames = [frames for frames, _ in writes]
+    latencies = []
+    for frames, delivered_at in deliveries:
+        i = bisect_left(write_frames, frames)
+        if i < len(writes):
+            latencies.append(writes[i][1] - delivered_at)
+    return np.array(latencies) if latencies else np.zeros(1)
+
+
+def run_scenario(fmt: str, args, folder: str) -> dict:
+    """Record args.seconds of synthetic audio in one format."""
+    deliveries: list = []
+    writes: list = []
+    config = VoiceRecorder(None)._default_config()
+    config.update(
+        output_folder=folder,
+        format=fmt,
+        sample_rate=args.rate,
+        channels=args.channels,
+        capture_dtype=args.dtype,
+        write_chunk_seconds=args.chunk_seconds,
+    )
+    factory = fake_stream_factory(
+        blocksize=args.block,
+        jitter_ms=args.jitter_ms,
+        speed=args.speed,
+        delivery_log=deliveries,
+    )
+    recorder = VoiceRecorder(config, stream_factory=factory)
+
+    def on_written(total_frames: int):
+        writes.append((total_frames, time.perf_counter()))
+        if args.slow_write_ms:
+            # Simulate a slow disk or sync client holding up the writer
+            time.sleep(args.slow_write_ms / 1000)
+
+    recorder.on_chunk_written = on_written
+
+    rss_before = rss_bytes()
+    cpu_before = time.process_time()
+    wall_before = time.perf_counter()
+
+    recorder.start_recording(f"bench_{fmt}")
+    time.sleep(args.seconds / args.speed)
+    stream = recorder.stream
+    stop_before = time.perf_counter()
+    path = recorder.stop_recording()
+    stop_ms = (time.perf_counter() - stop_before) * 1000
+    recorder.wait_finalized()
+    finalize_ms = (time.perf_counter() - stop_before) * 1000
+
+    wall = time.perf_counter() - wall_before
+    cpu = time.process_time() - cpu_before
+    latencies = capture_latencies(deliveries, writes) * 1000
+    snapshot = recorder.metrics.snapshot()
+
+    return {
+        "format": fmt,
+        "audio_seconds": stream.frames_delivered / args.rate,
+        "dropouts": snapshot["queue"]["overrun_count"] + snapshot["input_overflow_count"],
+        "late_deliveries": stream.late_blocks,
+        "dropped_frames": snapshot["queue"]["dropped_frames"],
+        "queue_high_water": snapshot["queue"]["high_water_mark"],
+        "latency_ms_p50": float(np.percentile(latencies, 50)),
+        "latency_ms_p99": float(np.percentile(latencies, 99)),
+        "latency_ms_max": float(latencies.max()),
+        "callback_us_p99": snapshot["callback_us"]["p99"],
+        "stop_ms": stop_ms,
+        "finalize_ms": finalize_ms,
+        "cpu_percent": 100 * cpu / wall if wall else 0.0,
+        "rss_growth_mb": (rss_bytes() - rss_before) / 1e6,
+        "file_bytes": Path(path).stat().st_size if path and Path(path).exists() else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=20.0, help="Audio seconds per format")
+    parser.add_argument("--speed", type=float, default=1.0, help="Deliver audio N times faster than real time")
+    parser.add_argument("--rate", type=int, default=44100)
+    parser.add_argument("--channels", type=int, default=1)
+    parser.add_argument("--block", type=int, default=512)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--slow-write-ms", type=float, default=0.0, help="Extra delay after every file write")
+    parser.add_argument("--chunk-seconds", type=float, default=1.0)
+    parser.add_argument("--dtype", choices=["float32", "int16"], default="float32")
+    parser.add_argument("--formats", nargs="+", default=["wav", "flac", "ogg"])
+    parser.add_argument("--max-dropouts", type=int, default=0)
+    parser.add_argument("--max-latency-ms", type=float, default=None,
+                        help="p99 capture-to-disk limit (default: chunk length + 500 ms)")
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+
+    max_latency = args.max_latency_ms or args.chunk_seconds * 1000 / args.speed + 500
+
+    results = []
+    with tempfile.TemporaryDirectory() as folder:
+        for fmt in args.formats:
+            results.append(run_scenario(fmt, args, folder))
+
+    print(f"{'format':<6} {'drops':>6} {'late':>5} {'lat p50':>9} {'lat p99':>9} {'cb p99':>8} {'stop':>7} {'cpu %':>6} {'rss +MB':>8}")
+    failed = False
+    for r in results:
+        print(f"{r['format']:<6} {r['dropouts']:>6} {r['late_deliveries']:>5} {r['latency_ms_p50']:>7.0f}ms {r['latency_ms_p99']:>7.0f}ms "
+              f"{r['callback_us_p99']:>6.0f}us {r['stop_ms']:>5.1f}ms {r['cpu_percent']:>6.1f} {r['rss_growth_mb']:>8.1f}")
+        if r["dropouts"] > args.max_dropouts or r["latency_ms_p99"] > max_latency:
+            failed = True
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if failed:
+        print(f"\nFAIL: dropouts > {args.max_dropouts} or p99 latency > {max_latency:.0f}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""
+Crash recovery check for segmented recordings.
+For each format, a child process writes --seconds of audio through a
+SegmentedSink with --segment-seconds segments and is killed with
+os._exit before closing it, leaving the last segment unfinalized. The
+orphaned folder is then recovered as on startup. Reports the recovered
+length and recovery time. Exits non-zero if a format loses any closed
+segment, recovers more than was written, or leaves a partial file or
+segment folder behind.
+
+Usage: python benchmarks/bench_recovery.py [--seconds 5] [--segment-seconds 2]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.audio import SegmentedSink, recover_orphaned_segments  # noqa: E402
+
+FORMATS = {"wav": "WAV", "flac": "FLAC", "ogg": "OGG"}
+
+
+def record_and_crash(path: str, fmt: str, seconds: float, segment_seconds: float, rate: int):
+    """Child process: write in 100 ms blocks, then die without closing."""
+    sink = SegmentedSink(path, rate, 1, fmt, segment_seconds=segment_seconds)
+    rng = np.random.default_rng(0)
+    block = rate // 10
+    for _ in range(int(seconds * 10)):
+        sink.write((rng.standard_normal((block, 1)) * 0.1).astype(np.float32))
+    os._exit(0)
+
+
+def run_format(folder: Path, ext: str, args) -> dict:
+    path = folder / f"memo.{ext}"
+    child = multiprocessing.get_context("spawn").Process(
+        target=record_and_crash,
+        args=(str(path), FORMATS[ext], args.seconds, args.segment_seconds, args.rate),
+    )
+    child.start()
+    child.join()
+
+    start = time.perf_counter()
+    recovered = recover_orphaned_segments(folder)
+    elapsed = time.perf_counter() - start
+    seconds = sf.info(str(path)).duration if path.exists() else 0.0
+    closed = int(args.seconds / args.segment_seconds) * args.segment_seconds
+    leftovers = sorted(p.name for p in folder.iterdir() if p != path)
+    return {
+        "format": ext,
+        "recovered": [Path(p).name for p in recovered],
+        "recovered_seconds": seconds,
+        "closed_seconds": closed,
+        "recovery_ms": elapsed * 1000,
+        "leftovers": leftovers,
+        "ok": closed <= seconds <= args.seconds and not leftovers,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0, help="Audio written before the crash")
+    parser.add_argument("--segment-seconds", type=float, default=2.0)
+    parser.add_argument("--rate", type=int, default=16000)
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+
+    results = []
+    for ext in FORMATS:
+        with tempfile.TemporaryDirectory() as folder:
+            results.append(run_format(Path(folder), ext, args))
+
+    print(f"{args.seconds:g} s written in {args.segment_seconds:g} s segments, then killed")
+    print(f"{'format':<7} {'recovered':>10} {'closed':>8} {'time':>9}  leftovers")
+    for r in results:
+        print(f"{r['format']:<7} {r['recovered_seconds']:>9.3f}s {r['closed_seconds']:>7g}s "
+              f"{r['recovery_ms']:>7.1f}ms  {', '.join(r['leftovers']) or '-'}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if not all(r["ok"] for r in results):
+        print("\nFAIL: a closed segment was lost or recovery left files behind")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
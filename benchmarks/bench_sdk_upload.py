@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+DeepGram SDK upload path check against a local stand-in server.
+Sends recordings through request_transcription with a real
+DeepgramClient pointed at the stand-in, and checks what arrives: a WAV
+is transcoded to 16 kHz mono FLAC (Content-Type audio/flac, chunked
+body) with the same duration, a proxy-like FLAC goes up byte for byte
+with its Content-Length, and the request options reach the query
+string. Then the stand-in answers 503 and the check confirms the SDK
+sent the one-shot body exactly once instead of retrying it. Exits
+non-zero if any of those differ.
+
+Usage: python benchmarks/bench_sdk_upload.py [--seconds 30]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import soundfile as sf
+from deepgram import DeepgramClient, DeepgramClientEnvironment
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_chunked import write_speech  # noqa: E402
+from benchmarks.fake_deepgram import FakeDeepgramHTTPServer  # noqa: E402
+from src.transcription import request_transcription  # noqa: E402
+
+OPTIONS = {"model": "nova-2", "smart_format": True, "punctuate": True, "paragraphs": True}
+
+
+def client_for(server: FakeDeepgramHTTPServer) -> DeepgramClient:
+    base = server.url.rsplit("/v1/listen", 1)[0]
+    environment = DeepgramClientEnvironment(base=base, production=base, agent=base)
+    return DeepgramClient(api_key="test", environment=environment)
+
+
+def send(server: FakeDeepgramHTTPServer, path: Path, codec: str) -> dict:
+    start = time.perf_counter()
+    response = request_transcription(client_for(server), path, OPTIONS, codec)
+    request = server.requests[-1]
+    return {
+        "file": path.name,
+        "codec": codec or "as is",
+        "bytes_sent": request["bytes"],
+        "file_bytes": path.stat().st_size,
+        "content_type": request["content_type"],
+        "chunked": request["chunked"],
+        "sent_seconds": request["duration"],
+        "file_seconds": sf.info(str(path)).duration,
+        "options_in_query": all(f"{key}=" in request["path"] for key in OPTIONS),
+        "answered": bool(response["results"]["channels"]),
+        "elapsed": time.perf_counter() - start,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=30.0, help="Length of the test recording")
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder, FakeDeepgramHTTPServer() as server:
+        wav = Path(folder) / "memo.wav"
+        write_speech(wav, args.seconds / 60, 48000, seed=0)
+        proxy = Path(folder) / "memo.proxy.flac"
+        sf.write(str(proxy), sf.read(str(wav))[0][::3], 16000, format="FLAC", subtype="PCM_16")
+
+        transcoded = send(server, wav, "flac")
+        as_is = send(server, proxy, "flac")
+
+        server.down = True
+        before = server.posts
+        try:
+            request_transcription(client_for(server), wav, OPTIONS, "flac")
+            error = ""
+        except Exception as e:
+            error = type(e).__name__
+        attempts = server.posts - before
+
+    checks = {
+        "transcoded_to_flac": transcoded["content_type"] == "audio/flac" and transcoded["chunked"],
+        "transcoded_duration": abs(transcoded["sent_seconds"] - transcoded["file_seconds"]) < 0.05,
+        "proxy_sent_as_is": as_is["bytes_sent"] == as_is["file_bytes"] and not as_is["chunked"],
+        "options_in_query": transcoded["options_in_query"] and as_is["options_in_query"],
+        "answered": transcoded["answered"] and as_is["answered"],
+        "no_sdk_retry": attempts == 1 and bool(error),
+    }
+
+    for run in (transcoded, as_is):
+        print(f"{run['file']:<16} {run['codec']:<6} {run['bytes_sent'] / 1e6:>6.2f} MB of "
+              f"{run['file_bytes'] / 1e6:.2f} MB, {run['content_type'] or '-'}, "
+              f"{'chunked' if run['chunked'] else 'Content-Length'}, "
+              f"{run['sent_seconds']:.2f}s of {run['file_seconds']:.2f}s audio")
+    print(f"503 answer      {attempts} request(s) sent, raised {error or 'nothing'}")
+    for name, ok in checks.items():
+        print(f"  {'ok  ' if ok else 'FAIL'} {name}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"transcoded": transcoded, "as_is": as_is, "attempts_on_503": attempts, **checks}, f, indent=2)
+
+    if not all(checks.values()):
+        print("\nFAIL: the SDK sent a different body, headers or options, or retried a streamed body")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
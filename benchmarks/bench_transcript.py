@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+"""
+Transcript model benchmark on a long synthetic DeepGram result.
+Builds a result with --words timed words grouped into sentences and
+paragraphs, then compares keeping it as a JSON sidecar (json.dumps /
+json.loads of the response) with the Transcript binary format: bytes on
+disk, save and load time, and memory held once loaded. Also times word
+lookup by position, phrase search and SubRip export, and checks the
+binary round trip keeps every word, timing and paragraph. Exits non-zero
+if the round trip differs or loading isn't --min-speedup times faster.
+
+Usage: python benchmarks/bench_transcript.py [--words 36000] [--min-speedup 5]
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.transcription import Transcript, to_srt  # noqa: E402
+
+VOCABULARY = (
+    "the meeting notes about budget review project timeline customer feedback "
+    "we should schedule follow up next week with design engineering and sales "
+    "team members agreed that priority is shipping release candidate by friday"
+).split()
+
+
+def synthetic_result(count: int, seed: int = 0) -> dict:
+    """A DeepGram-shaped response with words, sentences and paragraphs."""
+    rng = np.random.default_rng(seed)
+    words, sentences, paragraphs = [], [], []
+    t = 0.0
+    sentence_start = paragraph_start = 0
+    for i in range(count):
+        word = VOCABULARY[rng.integers(len(VOCABULARY))]
+        length = rng.uniform(0.15, 0.45)
+        end_sentence = i - sentence_start >= rng.integers(6, 18) or i == count - 1
+        punctuated = word.capitalize() if i == sentence_start else word
+        words.append({
+            "word": word,
+            "start": round(t, 3),
+            "end": round(t + length, 3),
+            "confidence": round(float(rng.uniform(0.7, 1.0)), 4),
+            "punctuated_word": punctuated + ("." if end_sentence else ""),
+        })
+        t += length + rng.uniform(0.02, 0.12)
+        if end_sentence:
+            span = words[sentence_start:i + 1]
+            sentences.append({
+                "text": " ".join(w["punctuated_word"] for w in span),
+                "start": span[0]["start"],
+                "end": span[-1]["end"],
+            })
+            sentence_start = i + 1
+            t += rng.uniform(0.3, 0.8)
+            if len(sentences) % 5 == 0 or i == count - 1:
+                paragraphs.append({
+                    "sentences": sentences,
+                    "start": sentences[0]["start"],
+                    "end": sentences[-1]["end"],
+                    "num_words": i + 1 - paragraph_start,
+                })
+                sentences = []
+                paragraph_start = i + 1
+    transcript = " ".join(w["punctuated_word"] for w in words)
+    return {
+        "metadata": {"duration": round(t, 3), "channels": 1},
+        "results": {"channels": [{"alternatives": [{
+            "transcript": transcript,
+            "confidence": 0.93,
+            "words": words,
+            "paragraphs": {"transcript": transcript, "paragraphs": paragraphs},
+        }]}]},
+    }
+
+
+def best_of(runs: int, fn) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def held_bytes(load) -> int:
+    """Memory still allocated by the object load() returns."""
+    tracemalloc.start()
+    obj = load()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del obj
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=36000, help="Words in the transcript")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--min-speedup", type=float, default=5.0, help="Required load speedup over JSON")
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+
+    result = synthetic_result(args.words)
+    transcript = Transcript.from_result(result)
+    json_data = json.dumps(result, separators=(",", ":")).encode()
+    binary = transcript.to_bytes()
+
+    def load_binary():
+        loaded = Transcript.from_bytes(binary)
+        loaded.channels[0].words  # Decode the words as a reader would
+        return loaded
+
+    timings = {
+        "json_save_ms": best_of(args.runs, lambda: json.dumps(result, separators=(",", ":")).encode()),
+        "json_load_ms": best_of(args.runs, lambda: json.loads(json_data)),
+        "binary_save_ms": best_of(args.runs, transcript.to_bytes),
+        "binary_load_ms": best_of(args.runs, load_binary),
+        "from_result_ms": best_of(args.runs, lambda: Transcript.from_result(result)),
+    }
+    memory = {
+        "json_loaded_bytes": held_bytes(lambda: json.loads(json_data)),
+        "binary_loaded_bytes": held_bytes(load_binary),
+    }
+
+    loaded = load_binary()
+    channel = loaded.channels[0]
+    original = transcript.channels[0]
+    duration = loaded.duration
+    positions = np.random.default_rng(1).uniform(0, duration, 10000)
+    operations = {
+        "word_at_us": best_of(args.runs, lambda: [channel.word_at(p) for p in positions]) * 1000 / len(positions),
+        "find_ms": best_of(args.runs, lambda: channel.find("release candidate")),
+        "srt_ms": best_of(args.runs, lambda: to_srt(loaded)),
+    }
+    matches = len(channel.find("release candidate"))
+    cues = to_srt(loaded).count(" --> ")
+
+    alternative = result["results"]["channels"][0]["alternatives"][0]
+    round_trip = (
+        channel.words == original.words
+        and np.array_equal(channel.starts, original.starts)
+        and np.array_equal(channel.ends, original.ends)
+        and np.array_equal(channel.confidences, original.confidences)
+        and channel.paragraphs() == original.paragraphs()
+        and loaded.text == alternative["transcript"]
+        and len(channel.paragraph_words) == len(alternative["paragraphs"]["paragraphs"])
+    )
+    speedup = timings["json_load_ms"] / timings["binary_load_ms"]
+
+    print(f"{args.words} words, {duration / 60:.0f} min, {len(channel.paragraph_words)} paragraphs, "
+          f"{len(channel.sentence_words)} sentences")
+    print(f"{'':<8} {'size':>9} {'save':>9} {'load':>9} {'in memory':>10}")
+    print(f"{'json':<8} {len(json_data) / 1e6:>7.2f}MB {timings['json_save_ms']:>7.1f}ms "
+          f"{timings['json_load_ms']:>7.1f}ms {memory['json_loaded_bytes'] / 1e6:>8.1f}MB")
+    print(f"{'binary':<8} {len(binary) / 1e6:>7.2f}MB {timings['binary_save_ms']:>7.1f}ms "
+          f"{timings['binary_load_ms']:>7.1f}ms {memory['binary_loaded_bytes'] / 1e6:>8.1f}MB")
+    print(f"load speedup {speedup:.1f}x, from_result {timings['from_result_ms']:.1f} ms")
+    print(f"word_at {operations['word_at_us']:.2f} us, find {operations['find_ms']:.1f} ms ({matches} matches), "
+          f"srt {operations['srt_ms']:.1f} ms ({cues} cues)")
+    print(f"round trip intact: {round_trip}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "words": args.words,
+                "json_bytes": len(json_data),
+                "binary_bytes": len(binary),
+                **timings,
+                **memory,
+                **operations,
+                "round_trip": round_trip,
+            }, f, indent=2)
+
+    if not round_trip or speedup < args.min_speedup:
+        print("\nFAIL: binary round trip differs or loading is not fast enough")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+"""
+Upload memory benchmark: whole-file bytes vs. a streamed request body.
+Writes a long synthetic WAV, POSTs it to a local stand-in of DeepGram's
+pre-recorded endpoint both ways, and reports the peak Python memory
+(tracemalloc) and throughput of each. Exits non-zero if the streamed
+upload's peak exceeds --max-stream-mb.
+
+Usage: python benchmarks/bench_upload.py [--minutes 30] [--rate 44100]
+           [--chunk-kb 1024] [--max-stream-mb 8]
+"""
+
+import argparse
+import http.client
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import numpy as np
+import soundfile as sf
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.fake_deepgram import FakeDeepgramHTTPServer  # noqa: E402
+from src.transcription import iter_file_chunks, upload_headers  # noqa: E402
+
+
+def write_recording(path: Path, minutes: float, rate: int):
+    """Write a 16-bit mono WAV a minute at a time."""
+    t = np.arange(rate * 60) / rate
+    minute = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    with sf.SoundFile(path, "w", samplerate=rate, channels=1, subtype="PCM_16") as f:
+        whole, part = divmod(minutes, 1)
+        for _ in range(int(whole)):
+            f.write(minute)
+        f.write(minute[:int(part * len(minute))])
+
+
+def post(url: str, body, headers: dict) -> dict:
+    """POST a body (bytes or an iterable of bytes) and decode the JSON reply."""
+    parts = urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=300)
+    try:
+        conn.request("POST", parts.path, body=body, headers=headers)
+        response = conn.getresponse()
+        return json.loads(response.read())
+    finally:
+        conn.close()
+
+
+def run(mode: str, path: Path, url: str, chunk_size: int) -> dict:
+    """Upload path once, measuring peak traced memory."""
+    headers = {"Content-Type": "audio/wav"}
+    tracemalloc.start()
+    start = time.perf_counter()
+    if mode == "read":
+        # What transcribe_file used to do
+        with open(path, "rb") as f:
+            body = f.read()
+        headers["Content-Length"] = str(len(body))
+    else:
+        body = iter_file_chunks(path, chunk_size)
+        headers.update(upload_headers(path))
+    result = post(url, body, headers)
+    del body
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    size = path.stat().st_size
+    return {
+        "mode": mode,
+        "file_mb": size / 1e6,
+        "peak_mb": peak / 1e6,
+        "seconds": seconds,
+        "mb_per_s": size / 1e6 / seconds if seconds else 0.0,
+        "audio_seconds": result["metadata"]["duration"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=30.0, help="Length of the synthetic recording")
+    parser.add_argument("--rate", type=int, default=44100)
+    parser.add_argument("--chunk-kb", type=int, default=1024)
+    parser.add_argument("--modes", nargs="+", choices=["read", "stream"], default=["read", "stream"])
+    parser.add_argument("--max-stream-mb", type=float, default=8.0)
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder, FakeDeepgramHTTPServer(latency_ms=0) as server:
+        path = Path(folder) / "long.wav"
+        write_recording(path, args.minutes, args.rate)
+        results = [run(mode, path, server.url, args.chunk_kb * 1024) for mode in args.modes]
+
+    print(f"{'mode':<7} {'file':>8} {'peak':>9} {'time':>7} {'rate':>9} {'audio':>8}")
+    failed = False
+    for r in results:
+        print(f"{r['mode']:<7} {r['file_mb']:>6.0f}MB {r['peak_mb']:>7.1f}MB {r['seconds']:>6.2f}s "
+              f"{r['mb_per_s']:>5.0f}MB/s {r['audio_seconds'] / 60:>6.1f}m")
+        if r["mode"] == "stream" and r["peak_mb"] > args.max_stream_mb:
+            failed = True
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if failed:
+        print(f"\nFAIL: streamed upload peaked above {args.max_stream_mb:g} MB")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
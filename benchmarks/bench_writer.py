@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""
+Benchmark: per-block writes vs coalesced chunk writes
+Compares SoundFile.write call counts and CPU time for each format.
+
+Usage: python benchmarks/bench_writer.py [--seconds 120] [--block 512]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.audio import ChunkedWriter, RingBuffer  # noqa: E402
+
+FORMATS = {"wav": "WAV", "flac": "FLAC", "ogg": "OGG"}
+
+
+class CountingSink:
+    """Wraps a SoundFile and counts write calls."""
+
+    def __init__(self, f: sf.SoundFile):
+        self._f = f
+        self.write_count = 0
+
+    def write(self, data):
+        self._f.write(data)
+        self.write_count += 1
+
+
+def make_blocks(seconds: float, sample_rate: int, block: int) -> list[np.ndarray]:
+    """Synthesize speech-like noise split into callback-sized blocks."""
+    rng = np.random.default_rng(0)
+    frames = int(seconds * sample_rate)
+    audio = (rng.standard_normal(frames) * 0.1).astype(np.float32).reshape(-1, 1)
+    return [audio[i:i + block] for i in range(0, frames, block)]
+
+
+def run_per_block(path: Path, fmt: str, blocks, sample_rate: int) -> tuple[int, float]:
+    """Current path: one write per callback block."""
+    start = time.process_time()
+    with sf.SoundFile(path, "w", samplerate=sample_rate, channels=1, format=fmt) as f:
+        sink = CountingSink(f)
+        for block in blocks:
+            sink.write(block)
+    return sink.write_count, time.process_time() - start
+
+
+def run_chunked(path: Path, fmt: str, blocks, sample_rate: int, chunk_seconds: float) -> tuple[int, float]:
+    """Coalesced path: ring buffer drained into large chunks."""
+    chunk_frames = int(sample_rate * chunk_seconds)
+    ring = RingBuffer(2 * chunk_frames, 1)
+    ring.set_wake_threshold(chunk_frames)
+
+    start = time.process_time()
+    with sf.SoundFile(path, "w", samplerate=sample_rate, channels=1, format=fmt) as f:
+        sink = CountingSink(f)
+        writer = ChunkedWriter(sink, chunk_frames)
+        for block in blocks:
+            ring.write(block)
+            if ring.available >= chunk_frames:
+                writer.drain(ring)
+        writer.drain(ring)
+        writer.flush()
+    return sink.write_count, time.process_time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=120.0)
+    parser.add_argument("--block", type=int, default=512)
+    parser.add_argument("--rate", type=int, default=44100)
+    parser.add_argument("--chunks", type=float, nargs="+", default=[0.5, 1.0, 2.0])
+    args = parser.parse_args()
+
+    blocks = make_blocks(args.seconds, args.rate, args.block)
+    print(f"{args.seconds:.0f}s of audio, {len(blocks)} blocks of {args.block} frames\n")
+    print(f"{'format':<6} {'mode':<14} {'writes':>8} {'cpu (s)':>9} {'speedup':>8}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for ext, fmt in FORMATS.items():
+            path = Path(tmp) / f"bench.{ext}"
+            writes, baseline = run_per_block(path, fmt, blocks, args.rate)
+            print(f"{ext:<6} {'per-block':<14} {writes:>8} {baseline:>9.3f} {'1.00x':>8}")
+            for chunk in args.chunks:
+                writes, cpu = run_chunked(path, fmt, blocks, args.rate, chunk)
+                speedup = baseline / cpu if cpu else float("inf")
+                print(f"{ext:<6} {f'chunk {chunk:g}s':<14} {writes:>8} {cpu:>9.3f} {speedup:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
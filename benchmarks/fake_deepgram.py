@@ -0,0 +1,348 @@
+"""
+Local stand-in for the DeepGram API, for benchmarks without network access.
+
+FakeDeepgramServer speaks the streaming protocol used by
+LiveTranscriptionSession: it accepts 16-bit mono PCM over a websocket,
+"recognises" one word for every word_seconds of audio above a level
+threshold, and answers with interim results as words appear and a final
+result every final_seconds of audio and on CloseStream. latency_ms delays
+each reply to model recognition time.
+
+FakeDeepgramHTTPServer answers pre-recorded POST /v1/listen requests. It
+reads the body in small pieces without keeping it, works out the audio
+duration from the WAV or FLAC header, and returns a DeepGram-shaped result
+with one timed word per word_seconds after latency_ms plus
+seconds_per_audio_second of "recognition" time. fail_every makes every
+Nth request answer 503 to exercise retries.
+
+Both run in a background thread on 127.0.0.1 with an OS-assigned port.
+"""
+
+import json
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+import numpy as np
+from websockets.exceptions import ConnectionClosed
+from websockets.sync.server import serve
+
+
+class FakeDeepgramServer:
+    """Threaded websocket server answering like DeepGram's /v1/listen."""
+
+    def __init__(
+        self,
+        word_seconds: float = 0.4,
+        final_seconds: float = 2.0,
+        latency_ms: float = 50.0,
+        threshold_db: float = -45.0,
+    ):
+        self.word_seconds = word_seconds
+        self.final_seconds = final_seconds
+        self.latency = latency_ms / 1000.0
+        self.threshold_db = threshold_db
+        self.sessions: list[dict] = []
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.socket.getsockname()[:2]
+        return f"ws://{host}:{port}/v1/listen"
+
+    def start(self) -> "FakeDeepgramServer":
+        self._server = serve(self._handle, "127.0.0.1", 0)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _handle(self, ws):
+        query = ws.request.path.partition("?")[2]
+        params = dict(part.split("=", 1) for part in query.split("&") if "=" in part)
+        rate = int(params.get("sample_rate", 16000))
+        session = {"bytes": 0, "messages": 0, "keepalives": 0, "words": 0, "finals": 0}
+        self.sessions.append(session)
+
+        words: list[str] = []      # Words in the segment not yet finalised
+        voiced = 0.0               # Seconds of voiced audio since the last word
+        segment_audio = 0.0        # Seconds of audio in the current segment
+
+        def reply(is_final: bool):
+            time.sleep(self.latency)
+            ws.send(json.dumps({
+                "type": "Results",
+                "is_final": is_final,
+                "speech_final": is_final,
+                "channel": {"alternatives": [{"transcript": " ".join(words), "confidence": 0.99}]},
+            }))
+
+        try:
+            for message in ws:
+                if isinstance(message, str):
+                    kind = json.loads(message).get("type")
+                    if kind == "KeepAlive":
+                        session["keepalives"] += 1
+                        continue
+                    if kind == "CloseStream":
+                        reply(True)
+                        session["finals"] += 1
+                        ws.send(json.dumps({"type": "Metadata", "duration": session["bytes"] / 2 / rate}))
+                        break
+                    continue
+
+                session["bytes"] += len(message)
+                session["messages"] += 1
+                samples = np.frombuffer(message, dtype="<i2").astype(np.float32) / 32768.0
+                seconds = len(samples) / rate
+                segment_audio += seconds
+                if len(samples):
+                    level = 10 * np.log10(float(np.mean(samples * samples)) + 1e-12)
+                    if level > self.threshold_db:
+                        voiced += seconds
+
+                new_word = False
+                while voiced >= self.word_seconds:
+                    voiced -= self.word_seconds
+                    session["words"] += 1
+                    words.append(f"word{session['words']}")
+                    new_word = True
+
+                if segment_audio >= self.final_seconds and words:
+                    reply(True)
+                    session["finals"] += 1
+                    words = []
+                    segment_audio = 0.0
+                elif new_word:
+                    reply(False)
+        except ConnectionClosed:
+            pass
+
+
+def audio_duration(header: bytes, total_bytes: int, tail: bytes = b"") -> float:
+    """
+    Estimate audio seconds from the first bytes of a WAV, FLAC or Ogg Opus body.
+
+    Ogg Opus needs tail, the last bytes of the body, for the final granule
+    position. Other formats are assumed to be 16 kHz 16-bit mono PCM.
+    """
+    if header[:4] == b"RIFF" and len(header) >= 44:
+        byte_rate = struct.unpack_from("<I", header, 28)[0]
+        return max(0, total_bytes - 44) / byte_rate if byte_rate else 0.0
+    if header[:4] == b"fLaC" and len(header) >= 26:
+        info = int.from_bytes(header[18:26], "big")
+        rate = info >> 44
+        return (info & ((1 << 36) - 1)) / rate if rate else 0.0
+    if header[:4] == b"OggS" and b"OpusHead" in header and b"OggS" in tail:
+        head = header.index(b"OpusHead")
+        pre_skip = struct.unpack_from("<H", header, head + 10)[0]
+        last = tail.rindex(b"OggS")
+        granule = struct.unpack_from("<q", tail, last + 6)[0]
+        return max(0, granule - pre_skip) / 48000
+    return total_bytes / 32000
+
+
+class FakeDeepgramHTTPServer:
+    """Threaded HTTP server answering like DeepGram's pre-recorded /v1/listen."""
+
+    def __init__(
+        self,
+        word_seconds: float = 0.4,
+        latency_ms: float = 50.0,
+        seconds_per_audio_second: float = 0.0,
+        fail_every: int = 0,
+        upload_mbps: float = 0.0,
+    ):
+        self.word_seconds = word_seconds
+        # Simulated uplink: request bodies are read no faster than this (0 = unlimited)
+        self.upload_mbps = upload_mbps
+        self.latency = latency_ms / 1000.0
+        self.seconds_per_audio_second = seconds_per_audio_second
+        self.fail_every = fail_every
+        self.down = False  # Answer every request with 503 while set
+        self.failures = 0
+        self.posts = 0     # Every request that arrived, even with a broken body
+        self.received = 0
+        self.arrivals: list[float] = []
+        self.requests: list[dict] = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1/listen"
+
+    def start(self) -> "FakeDeepgramHTTPServer":
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                try:
+                    fake._handle(self)
+                except (BrokenPipeError, ConnectionResetError, ValueError):
+                    pass  # Client went away mid-request or sent a malformed body
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @staticmethod
+    def _read_body(handler, on_data):
+        """Feed the request body to on_data piece by piece (plain or chunked)."""
+        if handler.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            while True:
+                size = int(handler.rfile.readline().split(b";")[0].strip(), 16)
+                if not size:
+                    handler.rfile.readline()
+                    return
+                remaining = size
+                while remaining:
+                    data = handler.rfile.read(min(remaining, 1 << 16))
+                    on_data(data)
+                    remaining -= len(data)
+                handler.rfile.readline()
+        remaining = int(handler.headers.get("Content-Length", 0))
+        while remaining:
+            data = handler.rfile.read(min(remaining, 1 << 16))
+            if not data:
+                return
+            on_data(data)
+            remaining -= len(data)
+
+    def _handle(self, handler):
+        with self._lock:
+            self.posts += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        finished = False
+
+        def finish():
+            # Before the reply goes out: a client may send its next request
+            # as soon as it has read this one's answer
+            nonlocal finished
+            if not finished:
+                finished = True
+                with self._lock:
+                    self.active -= 1
+
+        try:
+            header = bytearray()
+            tail = bytearray()
+            total = 0
+            started = time.perf_counter()
+
+            def on_data(data: bytes):
+                nonlocal total
+                if len(header) < 64:
+                    header.extend(data[:64 - len(header)])
+                tail.extend(data)
+                del tail[:-(1 << 16)]
+                total += len(data)
+                if self.upload_mbps:
+                    behind = total * 8 / (self.upload_mbps * 1e6) - (time.perf_counter() - started)
+                    if behind > 0:
+                        time.sleep(behind)
+
+            self._read_body(handler, on_data)
+            with self._lock:
+                self.received += 1
+                self.arrivals.append(time.monotonic())
+                fail = self.down or (self.fail_every and self.received % self.fail_every == 0)
+                self.failures += bool(fail)
+            if fail:
+                body = b'{"err_code": "SERVICE_UNAVAILABLE"}'
+                finish()
+                handler.send_response(503)
+                handler.send_header("Content-Type", "application/json")
+                handler.send_header("Content-Length", str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+                return
+            duration = audio_duration(bytes(header), total, bytes(tail))
+            time.sleep(self.latency + duration * self.seconds_per_audio_second)
+
+            count = int(duration / self.word_seconds)
+            words = [
+                {
+                    "word": f"word{i + 1}",
+                    "punctuated_word": f"word{i + 1}",
+                    "start": round(i * self.word_seconds, 3),
+                    "end": round((i + 0.8) * self.word_seconds, 3),
+                    "confidence": 0.99,
+                }
+                for i in range(count)
+            ]
+            transcript = " ".join(word["word"] for word in words)
+            body = json.dumps({
+                # The fields the SDK's response model requires
+                "metadata": {
+                    "request_id": f"fake-{self.received}",
+                    "sha256": "",
+                    "created": "1970-01-01T00:00:00Z",
+                    "duration": duration,
+                    "channels": 1,
+                    "models": ["fake"],
+                    "model_info": {"fake": {"name": "fake", "version": "0", "arch": "fake"}},
+                },
+                "results": {"channels": [{"alternatives": [{
+                    "transcript": transcript,
+                    "confidence": 0.99,
+                    "words": words,
+                }]}]},
+            }).encode()
+            with self._lock:
+                self.requests.append({
+                    "bytes": total,
+                    "duration": duration,
+                    "seconds": time.perf_counter() - started,
+                    "chunked": "Content-Length" not in handler.headers,
+                    "content_type": handler.headers.get("Content-Type", ""),
+                    "path": handler.path,
+                })
+
+            finish()
+            handler.send_response(200)
+            handler.send_header("Content-Type", "application/json")
+            handler.send_header("Content-Length", str(len(body)))
+            handler.end_headers()
+            handler.wfile.write(body)
+        finally:
+            finish()
@@ -0,0 +1,153 @@
+"""
+Synthetic audio device for running VoiceRecorder without hardware.
+
+FakeInputStream mimics the parts of sd.InputStream / sd.RawInputStream the
+recorder uses. A timer thread delivers blocks of a tone-plus-noise signal
+at the configured rate, with optional jitter, and logs when each block was
+delivered so capture-to-disk latency can be measured. clock_ppm makes the
+device's clock run fast or slow, and start_delay opens it late, to exercise
+multi-device alignment. report_late flags blocks delivered more than a
+period late as input overflows, the way PortAudio reports a callback that
+could not run in time (e.g. while another thread held the GIL).
+"""
+
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+
+class FakeCallbackFlags:
+    """Stand-in for sd.CallbackFlags."""
+
+    def __init__(self):
+        self.input_overflow = False
+        self.input_underflow = False
+
+    def __bool__(self):
+        return self.input_overflow or self.input_underflow
+
+
+class FakeInputStream:
+    """Delivers synthetic audio blocks to a callback from a timer thread."""
+
+    def __init__(
+        self,
+        samplerate: int,
+        channels: int,
+        callback,
+        dtype: str = "float32",
+        raw: bool = False,
+        blocksize: int = 512,
+        jitter_ms: float = 0.0,
+        speed: float = 1.0,
+        device=None,
+        delivery_log: Optional[list] = None,
+        seed: int = 0,
+        clock_ppm: float = 0.0,
+        start_delay: float = 0.0,
+        report_late: bool = False,
+    ):
+        self.samplerate = int(samplerate)
+        self.channels = int(channels)
+        self.callback = callback
+        self.raw = raw
+        self.blocksize = int(blocksize)
+        self.jitter = jitter_ms / 1000.0
+        self.speed = speed
+        self.clock_ppm = clock_ppm
+        self.start_delay = start_delay
+        self.report_late = report_late
+        self.delivery_log = delivery_log if delivery_log is not None else []
+        self.frames_delivered = 0
+        self.late_blocks = 0
+        self._rng = np.random.default_rng(seed)
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        # One second of signal, sliced cyclically so delivery never allocates
+        t = np.arange(self.samplerate) / self.samplerate
+        signal = 0.3 * np.sin(2 * np.pi * 220 * t) + 0.05 * self._rng.standard_normal(len(t))
+        signal = np.repeat(signal[:, None], self.channels, axis=1)
+        if dtype == "int16":
+            self._table = (signal * 32767).astype(np.int16)
+        else:
+            self._table = signal.astype(np.float32)
+        self._block = np.empty((self.blocksize, self.channels), dtype=self._table.dtype)
+
+    @property
+    def active(self) -> bool:
+        return self._running
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join()
+
+    def close(self):
+        self._running = False
+
+    def _fill_block(self):
+        start = self.frames_delivered % len(self._table)
+        end = start + self.blocksize
+        if end <= len(self._table):
+            self._block[:] = self._table[start:end]
+        else:
+            first = len(self._table) - start
+            self._block[:first] = self._table[start:]
+            self._block[first:] = self._table[:self.blocksize - first]
+
+    def _run(self):
+        period = self.blocksize / (self.samplerate * (1 + self.clock_ppm / 1e6)) / self.speed
+        flags = FakeCallbackFlags()
+        if self.start_delay:
+            time.sleep(self.start_delay / self.speed)
+        deadline = time.perf_counter()
+        while self._running:
+            deadline += period
+            delay = deadline - time.perf_counter()
+            if self.jitter:
+                delay += abs(self._rng.normal(0, self.jitter))
+            late = delay < -period
+            if delay > 0:
+                time.sleep(delay)
+            elif late:
+                self.late_blocks += 1
+            flags.input_overflow = late and self.report_late
+
+            self._fill_block()
+            indata = memoryview(self._block).cast("B") if self.raw else self._block
+            self.callback(indata, self.blocksize, None, flags)
+            self.frames_delivered += self.blocksize
+            self.delivery_log.append((self.frames_delivered, time.perf_counter()))
+
+
+class FakeStreamFactory:
+    """Picklable stream_factory, so it can be handed to a capture process."""
+
+    def __init__(self, device_options: Optional[dict] = None, **options):
+        self.device_options = device_options or {}
+        self.options = options
+
+    def __call__(self, raw: bool, **kwargs):
+        merged = dict(self.options)
+        merged.update(self.device_options.get(kwargs.get("device"), {}))
+        return FakeInputStream(raw=raw, **kwargs, **merged)
+
+
+def fake_stream_factory(device_options: Optional[dict] = None, **options):
+    """
+    Build a VoiceRecorder stream_factory producing FakeInputStreams.
+
+    Keyword options (blocksize, jitter_ms, speed, delivery_log, seed,
+    clock_ppm, start_delay, report_late) are applied to every stream the
+    recorder opens; device_options maps a device id to overrides for that
+    device only.
+    """
+    return FakeStreamFactory(device_options, **options)
@@ -4,7 +4,11 @@ Quick launcher for Voice Memo Recorder.
 Usage: python run.py
 """
 
+import multiprocessing
+
 from src.ui import main
 
 if __name__ == "__main__":
+    # Needed for the encoder's process pool in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     main()
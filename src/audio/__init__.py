@@ -0,0 +1,72 @@
+"""
+MacroVox Audio Pipeline
+Capture-path building blocks shared by the recorder
+"""
+
+from .ring_buffer import RingBuffer
+from .shared_ring import SharedRingBuffer
+from .devices import DEVICE_WAIT_SECONDS, DeviceRegistry, device_registry
+from .metrics import CaptureMetrics
+from .peaks import (
+    PeakSummaryBuilder,
+    backfill_peaks,
+    build_peaks_for_file,
+    peaks_path_for,
+    read_peaks,
+)
+from .writer import ChunkedWriter
+from .resample import DriftResampler, PolyphaseResampler
+from .multi import CaptureLane, DriftTracker, MultiDeviceCapture
+from .proxy import (
+    TranscriptionProxy,
+    is_proxy_path,
+    proxy_path_for,
+    remove_orphaned_proxies,
+    transcription_source,
+)
+from .live_feed import LIVE_SAMPLE_RATE, LiveAudioFeed
+from .levels import LEVEL_FLOOR_DB, LevelAnalyzer, SpectrumBands
+from .vad import SilenceMonitor, SilenceTrimmer, frame_rms_db
+from .segments import (
+    SegmentedSink,
+    recover_orphaned_segments,
+    segment_dir_for,
+    stitch_segments,
+)
+
+__all__ = [
+    "RingBuffer",
+    "SharedRingBuffer",
+    "ChunkedWriter",
+    "CaptureMetrics",
+    "DEVICE_WAIT_SECONDS",
+    "DeviceRegistry",
+    "device_registry",
+    "PeakSummaryBuilder",
+    "backfill_peaks",
+    "build_peaks_for_file",
+    "peaks_path_for",
+    "read_peaks",
+    "SegmentedSink",
+    "recover_orphaned_segments",
+    "segment_dir_for",
+    "stitch_segments",
+    "PolyphaseResampler",
+    "DriftResampler",
+    "CaptureLane",
+    "DriftTracker",
+    "MultiDeviceCapture",
+    "TranscriptionProxy",
+    "is_proxy_path",
+    "proxy_path_for",
+    "remove_orphaned_proxies",
+    "transcription_source",
+    "SilenceMonitor",
+    "SilenceTrimmer",
+    "frame_rms_db",
+    "LevelAnalyzer",
+    "SpectrumBands",
+    "LEVEL_FLOOR_DB",
+    "LiveAudioFeed",
+    "LIVE_SAMPLE_RATE",
+]
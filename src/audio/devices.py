@@ -0,0 +1,185 @@
+"""
+MacroVox Device Registry
+Cached input-device enumeration with background refresh
+"""
+
+import threading
+from typing import Callable, Optional
+
+try:
+    import sounddevice as sd
+    HAS_SOUNDDEVICE = True
+except OSError:
+    sd = None
+    HAS_SOUNDDEVICE = False
+
+# Rates probed for each device, most common first
+PROBE_SAMPLE_RATES = (44100, 48000, 16000, 22050, 32000, 88200, 96000)
+
+# How long starting a recording waits on a rescan before using the last list
+DEVICE_WAIT_SECONDS = 2.0
+
+
+class DeviceRegistry:
+    """
+    Enumerates input devices once and serves the results from a cache.
+
+    Enumeration (and probing which sample rates and channel counts each
+    device accepts) runs on a background thread. Callers only re-query
+    PortAudio after invalidate() is called on a hotplug notification or
+    refresh() is requested explicitly. The last list is kept while a
+    rescan runs, so callers that can't wait for it can fall back to it.
+
+    Rescans reinitialise PortAudio so new hardware shows up, which would
+    break an open stream; set_reinitialize_guard() lets the owner of the
+    streams veto that while one is running.
+    """
+
+    def __init__(self):
+        self._devices: Optional[list[dict]] = None
+        self._stale = False
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._scanning = False
+        # Bumped by invalidate(); a scan that started before the bump is redone
+        self._generation = 0
+        self._listeners: list[Callable[[list[dict]], None]] = []
+        self._reinitialize_guard: Callable[[], bool] = lambda: True
+        self._reinitialize = False
+
+    def set_reinitialize_guard(self, guard: Callable[[], bool]):
+        """Set a callable that returns False while PortAudio must not be reset."""
+        self._reinitialize_guard = guard
+
+    def add_listener(self, callback: Callable[[list[dict]], None]):
+        """Call back (from the scan thread) whenever a scan completes."""
+        self._listeners.append(callback)
+
+    def start(self):
+        """Begin a background scan if one is not already running or cached."""
+        with self._lock:
+            if self._devices is not None and not self._stale or self._scanning:
+                return
+            self._scanning = True
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._scan, daemon=True)
+            self._thread.start()
+
+    def invalidate(self):
+        """Mark the cache stale (e.g. on a device change) and rescan in the background."""
+        with self._lock:
+            self._stale = True
+            self._reinitialize = True
+            self._generation += 1
+            self._ready.clear()
+        self.start()
+
+    def refresh(self) -> list[dict]:
+        """Rescan now and return the fresh device list."""
+        self.invalidate()
+        return self.get_devices()
+
+    def get_devices(self, timeout: Optional[float] = None) -> list[dict]:
+        """
+        Return cached input devices, waiting for a scan in progress.
+
+        Args:
+            timeout: Stop waiting after this many seconds and return the
+                list from before the rescan (empty if there was none)
+
+        Returns:
+            List of device dicts (id, name, channels, sample_rate,
+            supported_rates, supported_channels).
+        """
+        self.start()
+        self._ready.wait(timeout)
+        return list(self._devices or [])
+
+    def get_device(self, device_id: Optional[int], timeout: Optional[float] = None) -> Optional[dict]:
+        """Return the cached entry for a device id (None = system default)."""
+        if device_id is None:
+            if not HAS_SOUNDDEVICE:
+                return None
+            try:
+                device_id = sd.default.device[0]
+            except Exception:
+                return None
+        for dev in self.get_devices(timeout):
+            if dev["id"] == device_id:
+                return dev
+        return None
+
+    def _scan(self):
+        """Enumerate devices, again if invalidate() ran meanwhile (scan thread)."""
+        while True:
+            with self._lock:
+                generation = self._generation
+            devices = self._enumerate()
+            with self._lock:
+                if generation != self._generation:
+                    continue  # A device changed mid-scan; this list may predate it
+                self._devices = devices
+                self._stale = False
+                self._scanning = False
+                self._ready.set()
+            break
+        for listener in self._listeners:
+            listener(devices)
+
+    def _enumerate(self) -> list[dict]:
+        """Query and probe the input devices PortAudio reports."""
+        # PortAudio builds its device list once, in Pa_Initialize, and
+        # sounddevice has no public call to redo that, so new hardware only
+        # appears after its private terminate/initialize pair. Those names
+        # aren't a stable API, hence the hasattr checks.
+        if (
+            self._reinitialize
+            and HAS_SOUNDDEVICE
+            and hasattr(sd, "_terminate")
+            and hasattr(sd, "_initialize")
+            and self._reinitialize_guard()
+        ):
+            self._reinitialize = False
+            try:
+                sd._terminate()
+                sd._initialize()
+            except Exception:
+                pass
+
+        devices = []
+        try:
+            if not HAS_SOUNDDEVICE:
+                raise RuntimeError("sounddevice/PortAudio not available")
+            for i, dev in enumerate(sd.query_devices()):
+                if dev["max_input_channels"] > 0:
+                    devices.append({
+                        "id": i,
+                        "name": dev["name"],
+                        "channels": dev["max_input_channels"],
+                        "sample_rate": dev["default_samplerate"],
+                        "supported_rates": self._probe_rates(i, dev),
+                        "supported_channels": list(range(1, dev["max_input_channels"] + 1)),
+                    })
+        except Exception:
+            devices = []
+        return devices
+
+    @staticmethod
+    def _probe_rates(device_id: int, dev: dict) -> list[int]:
+        """Find which common sample rates a device accepts for mono input."""
+        rates = []
+        for rate in PROBE_SAMPLE_RATES:
+            try:
+                sd.check_input_settings(device=device_id, channels=1, samplerate=rate)
+                rates.append(rate)
+            except Exception:
+                continue
+        default = int(dev["default_samplerate"])
+        if default not in rates:
+            rates.append(default)
+        return rates
+
+
+# Shared registry so the settings dialog and recorder see the same cache
+device_registry = DeviceRegistry()
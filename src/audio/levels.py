@@ -0,0 +1,153 @@
+"""
+MacroVox Level Analyzer
+Rate-limited RMS, peak and spectrum-band frames for live meters
+"""
+
+import threading
+from typing import Callable, Optional
+
+import numpy as np
+
+# Level reported for digital silence and for "no input"
+LEVEL_FLOOR_DB = -90.0
+
+
+class SpectrumBands:
+    """
+    Hann-windowed FFT folded into log-spaced bands.
+
+    The window and the bin ranges of each band are computed once per
+    sample rate, so a frame costs one rfft and one np.add.reduceat.
+    """
+
+    def __init__(self, sample_rate: int, fft_size: int = 2048, bands: int = 16, min_freq: float = 50.0):
+        self.sample_rate = int(sample_rate)
+        self.fft_size = int(fft_size)
+        self.bands = int(bands)
+        self._window = np.hanning(self.fft_size).astype(np.float32)
+        # Amplitude normalisation so a full-scale sine peaks near 0 dB
+        self._scale = 2.0 / self._window.sum()
+
+        nyquist = self.sample_rate / 2
+        edges_hz = np.geomspace(min(min_freq, nyquist / 2), nyquist, self.bands + 1)
+        bins = np.round(edges_hz * self.fft_size / self.sample_rate).astype(int)
+        bins = np.clip(bins, 1, self.fft_size // 2)
+        # Every band gets at least one bin, even the narrow low ones
+        for i in range(1, len(bins)):
+            bins[i] = max(bins[i], bins[i - 1] + 1)
+        bins = np.minimum(bins, self.fft_size // 2 + 1)
+        self._starts = bins[:-1]
+        self._widths = np.maximum(1, np.diff(bins))
+
+    def compute(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Band levels in dBFS of the newest fft_size samples.
+
+        Shorter input is zero-padded at the front.
+        """
+        frame = np.zeros(self.fft_size, dtype=np.float32)
+        tail = samples[-self.fft_size:]
+        frame[self.fft_size - len(tail):] = tail
+        magnitude = np.abs(np.fft.rfft(frame * self._window)) * self._scale
+        power = magnitude * magnitude
+        starts = np.minimum(self._starts, len(power) - 1)
+        band_power = np.add.reduceat(power, starts)[:self.bands] / self._widths
+        return np.maximum(10.0 * np.log10(band_power + 1e-12), LEVEL_FLOOR_DB).astype(np.float32)
+
+
+class LevelAnalyzer:
+    """
+    Polls a recorder for its newest audio and emits meter frames.
+
+    Runs in its own thread at a fixed frame rate, so the audio callback
+    does no extra work and the UI gets at most fps updates per second
+    however small the capture blocks are. Each frame is one float32 array:
+
+        [rms_db, peak_db, band_0_db, ..., band_{bands-1}_db]
+
+    RMS and peak cover the audio since the previous frame; the bands cover
+    the last fft_size samples. When the source stops delivering audio a
+    single all-floor frame is sent so meters fall back, then nothing until
+    audio returns.
+
+    The source needs peek_latest(frames) returning mono float32 and a
+    sample_rate attribute (VoiceRecorder and RecorderProcess both qualify).
+    on_frame is called from the analyzer thread; Qt callers should pass a
+    Signal's emit.
+    """
+
+    def __init__(
+        self,
+        source,
+        on_frame: Callable[[np.ndarray], None],
+        fps: float = 30.0,
+        bands: int = 16,
+        fft_size: int = 2048,
+        min_freq: float = 50.0,
+    ):
+        self.source = source
+        self.on_frame = on_frame
+        self.interval = 1.0 / max(1.0, fps)
+        self.bands = bands
+        self.fft_size = fft_size
+        self.min_freq = min_freq
+        self.frames_emitted = 0
+
+        self._spectrum: Optional[SpectrumBands] = None
+        self._silent = np.full(2 + bands, LEVEL_FLOOR_DB, dtype=np.float32)
+        self._idle = True
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start emitting frames."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="level-analyzer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the analyzer thread."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                frame = self.analyze()
+            except Exception:
+                # A stream being torn down mid-read; try again next frame
+                continue
+            if frame is not None:
+                self.frames_emitted += 1
+                self.on_frame(frame)
+
+    def analyze(self) -> Optional[np.ndarray]:
+        """
+        Build one frame from the source's newest audio.
+
+        Returns:
+            The frame, or None when there is nothing new to show.
+        """
+        rate = int(self.source.sample_rate or 0)
+        samples = self.source.peek_latest(self.fft_size) if rate else None
+        if samples is None or not len(samples):
+            if self._idle:
+                return None
+            self._idle = True
+            return self._silent.copy()
+        self._idle = False
+
+        if self._spectrum is None or self._spectrum.sample_rate != rate:
+            self._spectrum = SpectrumBands(rate, self.fft_size, self.bands, self.min_freq)
+
+        recent = samples[-max(1, int(rate * self.interval)):]
+        frame = np.empty(2 + self.bands, dtype=np.float32)
+        frame[0] = 10.0 * np.log10(float(np.dot(recent, recent)) / len(recent) + 1e-12)
+        frame[1] = 20.0 * np.log10(float(np.abs(recent).max()) + 1e-12)
+        np.maximum(frame[:2], LEVEL_FLOOR_DB, out=frame[:2])
+        frame[2:] = self._spectrum.compute(samples)
+        return frame
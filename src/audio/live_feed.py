@@ -0,0 +1,108 @@
+"""
+MacroVox Live Feed
+Bounded hand-off of capture blocks to a streaming transcription session
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from .resample import PolyphaseResampler
+from .ring_buffer import RingBuffer
+
+LIVE_SAMPLE_RATE = 16000
+
+
+class LiveAudioFeed:
+    """
+    Second consumer of the capture callback for live transcription.
+
+    The audio callback copies each block into this feed's own ring, the
+    same allocation-free write it does for the recording ring. A sender
+    thread calls read(), which mixes down, resamples and converts to
+    16-bit little-endian PCM off the callback.
+
+    Buffering is bounded by buffer_seconds. When the network falls behind,
+    read() hands over everything queued (up to max_send_seconds) in one
+    message so the sender can catch up; if the ring still fills, new
+    blocks are dropped and counted rather than ever blocking capture.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        channels: int = 1,
+        dtype=np.float32,
+        target_rate: int = LIVE_SAMPLE_RATE,
+        buffer_seconds: float = 30.0,
+        send_ms: float = 100.0,
+        max_send_seconds: float = 1.0,
+    ):
+        self.sample_rate = int(sample_rate)
+        self.target_rate = int(target_rate)
+        self.ring = RingBuffer(max(1, int(self.sample_rate * buffer_seconds)), channels, dtype)
+        self._send_frames = max(1, int(self.sample_rate * send_ms / 1000))
+        self.ring.set_wake_threshold(self._send_frames)
+        self._scratch = np.empty(
+            (max(1, int(self.sample_rate * max_send_seconds)), channels), dtype=dtype
+        )
+        self._resampler = PolyphaseResampler(self.sample_rate, self.target_rate)
+        self._closed = False
+        self._flushed = False
+        self.frames_read = 0
+
+    @property
+    def dropped_frames(self) -> int:
+        """Capture frames lost because the sender fell a whole buffer behind."""
+        return self.ring.dropped_frames
+
+    @property
+    def is_closed(self) -> bool:
+        return self._closed
+
+    def write(self, block) -> bool:
+        """Queue a callback block (producer side). Never blocks."""
+        if self._closed:
+            return False
+        return self.ring.write(block)
+
+    def close(self):
+        """Mark the end of the audio; read() drains the rest, then returns None."""
+        self._closed = True
+        self.ring.wake()
+
+    def read(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """
+        Take queued audio as 16-bit mono PCM at target_rate (consumer side).
+
+        Returns:
+            PCM bytes, b"" if nothing arrived within the timeout, or None
+            once the feed is closed and fully drained.
+        """
+        closed = self._closed
+        if not closed and self.ring.available < self._send_frames:
+            self.ring.wait(timeout)
+            closed = self._closed
+
+        frames = self.ring.read_into(self._scratch)
+        if frames:
+            self.frames_read += frames
+            samples = self._mono(self._scratch[:frames])
+            return self._pcm16(self._resampler.process(samples))
+        if not closed:
+            return b""
+        if self._flushed:
+            return None
+        self._flushed = True
+        return self._pcm16(self._resampler.flush())
+
+    @staticmethod
+    def _mono(block: np.ndarray) -> np.ndarray:
+        samples = block.astype(np.float32, copy=False)
+        if block.dtype == np.int16:
+            samples = samples / 32768.0
+        return samples.mean(axis=1) if samples.shape[1] > 1 else samples[:, 0]
+
+    @staticmethod
+    def _pcm16(samples: np.ndarray) -> bytes:
+        return (np.clip(samples, -1.0, 1.0) * 32767.0).astype("<i2").tobytes()
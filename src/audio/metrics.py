@@ -0,0 +1,137 @@
+"""
+MacroVox Capture Metrics
+Counters and histograms for the capture-to-disk pipeline
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from .ring_buffer import RingBuffer
+
+# Upper bucket edges for write latency, in milliseconds
+WRITE_LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class CaptureMetrics:
+    """
+    Live measurements of one recording's capture path.
+
+    Recording a sample never allocates: callback durations go into a
+    preallocated circular array and write latencies into fixed buckets, so
+    the counters are cheap enough to update from the audio callback.
+    Percentiles are only computed when a snapshot is taken.
+    """
+
+    def __init__(self, callback_window: int = 8192):
+        self._callback_times = np.zeros(callback_window, dtype=np.float64)
+        self._callback_index = 0
+        self._write_buckets = np.zeros(len(WRITE_LATENCY_BUCKETS_MS) + 1, dtype=np.int64)
+        self._bucket_edges = np.array(WRITE_LATENCY_BUCKETS_MS, dtype=np.float64) / 1000.0
+        self.ring_buffer: Optional[RingBuffer] = None
+        self.reset()
+
+    def reset(self):
+        """Clear all counters for a new recording."""
+        self._callback_times[:] = 0.0
+        self._callback_index = 0
+        self._write_buckets[:] = 0
+        self.callback_count = 0
+        self.callback_max = 0.0
+        self.input_overflow_count = 0
+        self.input_underflow_count = 0
+        self.write_count = 0
+        self.write_max = 0.0
+        self.bytes_written = 0
+        self.started_at = time.time()
+
+    def record_status(self, status):
+        """Count PortAudio overflow/underflow flags from a callback."""
+        if status.input_overflow:
+            self.input_overflow_count += 1
+        if status.input_underflow:
+            self.input_underflow_count += 1
+
+    def record_callback(self, seconds: float):
+        """Record how long one audio callback took."""
+        self._callback_times[self._callback_index % len(self._callback_times)] = seconds
+        self._callback_index += 1
+        self.callback_count += 1
+        if seconds > self.callback_max:
+            self.callback_max = seconds
+
+    def record_write(self, seconds: float, nbytes: int):
+        """Record one file write and the bytes it handed to the encoder."""
+        self._write_buckets[np.searchsorted(self._bucket_edges, seconds)] += 1
+        self.write_count += 1
+        self.bytes_written += nbytes
+        if seconds > self.write_max:
+            self.write_max = seconds
+
+    def _callback_percentiles(self) -> dict:
+        count = min(self._callback_index, len(self._callback_times))
+        if not count:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+        p50, p95, p99 = np.percentile(self._callback_times[:count], [50, 95, 99]) * 1e6
+        return {"p50": round(p50, 1), "p95": round(p95, 1), "p99": round(p99, 1)}
+
+    def snapshot(self) -> dict:
+        """Return a JSON-serializable view of the current counters."""
+        ring = self.ring_buffer.stats() if self.ring_buffer else {}
+        labels = [f"<={edge:g}ms" for edge in WRITE_LATENCY_BUCKETS_MS] + [">1000ms"]
+        return {
+            "duration_seconds": round(time.time() - self.started_at, 3),
+            "input_overflow_count": self.input_overflow_count,
+            "input_underflow_count": self.input_underflow_count,
+            "callback_count": self.callback_count,
+            "callback_us": {
+                **self._callback_percentiles(),
+                "max": round(self.callback_max * 1e6, 1),
+            },
+            "queue": {
+                "capacity_frames": ring.get("capacity_frames", 0),
+                "high_water_mark": ring.get("high_water_mark", 0),
+                "overrun_count": ring.get("overrun_count", 0),
+                "dropped_frames": ring.get("dropped_frames", 0),
+            },
+            "write_count": self.write_count,
+            "write_max_ms": round(self.write_max * 1000, 3),
+            "write_latency_histogram": dict(zip(labels, self._write_buckets.tolist())),
+            "bytes_written": self.bytes_written,
+        }
+
+    def summary(self) -> str:
+        """One-line readout for a status bar or terminal."""
+        return self.format_summary(self.snapshot())
+
+    @staticmethod
+    def format_summary(snap: dict) -> str:
+        """One-line readout of a snapshot (e.g. one sent from another process)."""
+        queue = snap["queue"]
+        fill = queue["high_water_mark"] / queue["capacity_frames"] if queue["capacity_frames"] else 0
+        xruns = snap["input_overflow_count"] + snap["input_underflow_count"]
+        return (
+            f"XRUN {xruns} · DROP {queue['overrun_count']} · "
+            f"Q {fill:.0%} · CB p99 {snap['callback_us']['p99']:.0f}µs · "
+            f"WR max {snap['write_max_ms']:.1f}ms"
+        )
+
+    def write_sidecar(self, audio_path: str | Path) -> str:
+        """
+        Dump the counters to a JSON file next to the recording.
+
+        Returns:
+            Path of the sidecar file.
+        """
+        audio_path = Path(audio_path)
+        sidecar = audio_path.with_name(f"{audio_path.stem}.metrics.json")
+        data = self.snapshot()
+        data["file"] = audio_path.name
+        if audio_path.exists():
+            data["file_bytes"] = audio_path.stat().st_size
+        with open(sidecar, "w") as f:
+            json.dump(data, f, indent=2)
+        return str(sidecar)
@@ -0,0 +1,468 @@
+"""
+MacroVox Multi-Device Capture
+Records several input devices at once, aligned to a common timeline
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+
+from .metrics import CaptureMetrics
+from .resample import DriftResampler
+from .ring_buffer import RingBuffer
+from .writer import ChunkedWriter
+
+# Drift corrections beyond this are treated as bad estimates (0.2%)
+MAX_DRIFT_RATIO = 0.002
+
+
+class DriftTracker:
+    """
+    Estimates a device's true sample rate against a shared clock.
+
+    Each callback contributes a (clock time, frames delivered) point. A
+    least-squares line through all points gives the rate (slope) and the
+    clock time of the stream's first frame (intercept). Callback jitter
+    averages out, so the estimate tightens the longer the stream runs.
+    """
+
+    def __init__(self, nominal_rate: float):
+        self.nominal_rate = float(nominal_rate)
+        self.points = 0
+        self.span = 0.0
+        self._t0: Optional[float] = None
+        # n, sum t, sum f, sum t^2, sum t*f
+        self._sums = np.zeros(5, dtype=np.float64)
+
+    def add(self, times: np.ndarray, frames: np.ndarray):
+        """Add timing points (clock seconds, cumulative frames)."""
+        if not len(times):
+            return
+        if self._t0 is None:
+            self._t0 = float(times[0])
+        t = np.asarray(times, dtype=np.float64) - self._t0
+        f = np.asarray(frames, dtype=np.float64)
+        self._sums += (len(t), t.sum(), f.sum(), t @ t, t @ f)
+        self.points += len(t)
+        self.span = max(self.span, float(t[-1]))
+
+    def _fit(self) -> Optional[tuple[float, float]]:
+        n, st, sf, stt, stf = self._sums
+        denom = n * stt - st * st
+        if self.points < 2 or denom <= 0:
+            return None
+        slope = (n * stf - st * sf) / denom
+        return slope, (sf - slope * st) / n
+
+    @property
+    def rate(self) -> float:
+        """Frames per shared-clock second (nominal until there is data)."""
+        fit = self._fit()
+        return fit[0] if fit and fit[0] > 0 else self.nominal_rate
+
+    @property
+    def origin(self) -> Optional[float]:
+        """Shared-clock time at which the first frame was captured."""
+        fit = self._fit()
+        if not fit or fit[0] <= 0:
+            return self._t0
+        return self._t0 - fit[1] / fit[0]
+
+
+class CaptureLane:
+    """
+    One device's path: stream callback, capture ring and timing log.
+
+    The callback only copies the block into the ring and logs the shared
+    clock time, so a slow or stalled device never holds up another lane.
+    """
+
+    def __init__(
+        self,
+        index: int,
+        device,
+        samplerate: int,
+        channels: int,
+        dtype,
+        capacity_frames: int,
+        clock: Callable[[], float] = time.monotonic,
+        timing_capacity: int = 4096,
+    ):
+        self.index = index
+        self.device = device
+        self.samplerate = int(samplerate)
+        self.channels = int(channels)
+        self.clock = clock
+        self.ring = RingBuffer(capacity_frames, channels, dtype)
+        self.metrics = CaptureMetrics()
+        self.metrics.ring_buffer = self.ring
+        self.tracker = DriftTracker(samplerate)
+        self.stream = None
+
+        self.frames_captured = 0
+        self.offset_frames = 0
+        self.gap_frames = 0
+        self.ratio = 1.0
+        self.started = False
+        self.finished = False
+
+        self._times = np.zeros(timing_capacity, dtype=np.float64)
+        self._frames = np.zeros(timing_capacity, dtype=np.int64)
+        self._timing_written = 0
+        self._timing_read = 0
+
+    def callback(self, indata, frames, time_info, status):
+        """Stream callback: queue the block and log when it arrived."""
+        start = time.perf_counter()
+        if status:
+            self.metrics.record_status(status)
+        self.ring.write(indata)
+        self.frames_captured += frames
+        slot = self._timing_written % len(self._times)
+        self._times[slot] = self.clock()
+        self._frames[slot] = self.frames_captured
+        self._timing_written += 1
+        self.metrics.record_callback(time.perf_counter() - start)
+
+    def collect_timing(self):
+        """Move timing points logged by the callback into the drift tracker."""
+        end = self._timing_written
+        start = max(self._timing_read, end - len(self._times))
+        if end > start:
+            slots = np.arange(start, end) % len(self._times)
+            self.tracker.add(self._times[slots], self._frames[slots])
+        self._timing_read = end
+
+    @property
+    def drift_ppm(self) -> float:
+        """Clock error relative to the reference lane, in parts per million."""
+        return (1.0 / self.ratio - 1.0) * 1e6
+
+    def snapshot(self) -> dict:
+        """Return this lane's measurements."""
+        return {
+            "device": self.device,
+            "channels": self.channels,
+            "frames_captured": self.frames_captured,
+            "measured_rate": self.tracker.rate,
+            "drift_ppm": self.drift_ppm,
+            "offset_frames": self.offset_frames,
+            "gap_frames": self.gap_frames,
+            "capture": self.metrics.snapshot(),
+        }
+
+
+class MultiDeviceCapture:
+    """
+    Records two or more input devices onto one aligned timeline.
+
+    Every device gets its own stream, capture ring and lane thread. The
+    lane thread measures the device's clock against time.monotonic with a
+    DriftTracker, trims or pads the start so all streams begin at the same
+    instant, and stretches its audio by a few ppm with a DriftResampler so
+    it keeps pace with the first device (the reference). Corrected audio
+    goes into a per-lane aligned ring.
+
+    With layout "files" each lane also writes its own file, so a device
+    that stalls holds up nobody. With layout "channels" the run() thread
+    interleaves the aligned rings into one multichannel file. A lane that
+    falls more than max_skew_seconds behind is padded with silence, and the
+    late audio is discarded on arrival so the channels stay aligned.
+    """
+
+    LAYOUTS = ("channels", "files")
+
+    def __init__(
+        self,
+        devices: list,
+        samplerate: int,
+        channels: int = 1,
+        dtype=np.float32,
+        layout: str = "channels",
+        buffer_seconds: float = 10.0,
+        chunk_frames: int = 44100,
+        max_skew_seconds: float = 0.5,
+        warmup_seconds: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if len(devices) < 2:
+            raise ValueError("Multi-device capture needs at least two devices")
+        if layout not in self.LAYOUTS:
+            raise ValueError(f"Unknown multi-device layout: {layout}")
+        self.samplerate = int(samplerate)
+        self.layout = layout
+        self.chunk_frames = max(1, int(chunk_frames))
+        self.max_skew_frames = int(max_skew_seconds * self.samplerate)
+        self.warmup_seconds = warmup_seconds
+        self.clock = clock
+        self.raw = np.dtype(dtype) == np.int16
+
+        capacity = max(int(buffer_seconds * self.samplerate), 2 * self.chunk_frames)
+        self.lanes = [
+            CaptureLane(i, device, samplerate, channels, dtype, capacity, clock)
+            for i, device in enumerate(devices)
+        ]
+        self._aligned = [
+            RingBuffer(capacity, lane.channels, np.float32) for lane in self.lanes
+        ]
+        self.metrics = CaptureMetrics()
+        self._stop_event = threading.Event()
+        self._stop_time: Optional[float] = None
+        self._run_started = 0.0
+        self._progress = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def reference(self) -> CaptureLane:
+        """The lane whose clock the others follow."""
+        return self.lanes[0]
+
+    @property
+    def output_channels(self) -> list[int]:
+        """Channel count of each output file."""
+        if self.layout == "channels":
+            return [sum(lane.channels for lane in self.lanes)]
+        return [lane.channels for lane in self.lanes]
+
+    def output_paths(self, filepath: str | Path) -> list[Path]:
+        """File(s) this capture writes for a recording path."""
+        filepath = Path(filepath)
+        if self.layout == "channels":
+            return [filepath]
+        return [filepath] + [
+            filepath.with_name(f"{filepath.stem}.mic{lane.index + 1}{filepath.suffix}")
+            for lane in self.lanes[1:]
+        ]
+
+    def open(self, stream_factory: Callable):
+        """Open and start one input stream per device."""
+        try:
+            for lane in self.lanes:
+                lane.stream = stream_factory(
+                    raw=self.raw,
+                    device=lane.device,
+                    samplerate=self.samplerate,
+                    channels=lane.channels,
+                    dtype="int16" if self.raw else "float32",
+                    callback=lane.callback,
+                )
+            for lane in self.lanes:
+                lane.stream.start()
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        """Stop and close all streams."""
+        for lane in self.lanes:
+            if lane.stream:
+                lane.stream.stop()
+                lane.stream.close()
+                lane.stream = None
+
+    def stop(self):
+        """Stop the devices and let the lanes drain (returns immediately)."""
+        # Streams stop one by one; every lane is cut at this instant instead
+        self._stop_time = self.clock()
+        self.close()
+        self._stop_event.set()
+        for lane in self.lanes:
+            lane.ring.wake()
+
+    def run(
+        self,
+        sinks: list,
+        taps: Optional[list[list]] = None,
+        on_write: Optional[Callable[[int], None]] = None,
+    ):
+        """
+        Write the aligned streams until stop() has been called and drained.
+
+        Args:
+            sinks: Open sinks, one per entry of output_paths()
+            taps: Writer taps for each sink
+            on_write: Called with the frames written after each chunk
+        """
+        taps = taps or [[] for _ in sinks]
+        writers = [
+            ChunkedWriter(sink, self.chunk_frames, channels, np.float32, self.metrics, sink_taps)
+            for sink, channels, sink_taps in zip(sinks, self.output_channels, taps)
+        ]
+        if on_write:
+            writers[0].on_write = on_write
+
+        self._run_started = self.clock()
+        self._threads = [
+            threading.Thread(
+                target=self._lane_worker,
+                args=(lane, writers[lane.index] if self.layout == "files" else None),
+                name=f"capture-lane-{lane.index}",
+            )
+            for lane in self.lanes
+        ]
+        for thread in self._threads:
+            thread.start()
+
+        if self.layout == "channels":
+            self._merge(writers[0])
+        for thread in self._threads:
+            thread.join()
+        for writer in writers:
+            writer.flush()
+
+    def _lane_worker(self, lane: CaptureLane, writer: Optional[ChunkedWriter]):
+        """Correct one lane's audio onto the shared timeline."""
+        aligned = self._aligned[lane.index]
+        resampler = DriftResampler(lane.channels)
+        scratch = np.empty((lane.ring.capacity, lane.channels), dtype=lane.ring.dtype)
+        pending: list[np.ndarray] = []
+        dropped = 0
+        consumed = 0
+        lane.ring.set_wake_threshold(min(self.chunk_frames // 4 or 1, lane.ring.capacity))
+
+        while True:
+            stopping = self._stop_event.is_set()
+            lane.ring.wait(timeout=0.25)
+            lane.collect_timing()
+
+            frames = lane.ring.read_into(scratch)
+            block = scratch[:frames].astype(np.float32)
+            if lane.ring.dtype == np.int16:
+                block /= 32768.0
+            # Frames the ring had to drop still took time; keep the gap
+            if lane.ring.dropped_frames > dropped:
+                gap = lane.ring.dropped_frames - dropped
+                dropped = lane.ring.dropped_frames
+                block = np.concatenate((np.zeros((gap, lane.channels), np.float32), block))
+            if self._stop_time is not None:
+                block = block[:max(0, self._frames_before_stop(lane) - consumed)]
+            consumed += len(block)
+
+            if pending is not None:
+                pending.append(block)
+                # Don't hold audio back forever for a device that never starts
+                waiting = (
+                    not self._warmed_up()
+                    and self.clock() - self._run_started < 5 * self.warmup_seconds
+                )
+                if waiting and not stopping:
+                    continue
+                block = self._align_start(lane, np.concatenate(pending))
+                pending = None
+
+            if lane is not self.reference:
+                ratio = self.reference.tracker.rate / lane.tracker.rate
+                lane.ratio = min(max(ratio, 1 - MAX_DRIFT_RATIO), 1 + MAX_DRIFT_RATIO)
+                block = resampler.process(block, lane.ratio)
+
+            if len(block) and not aligned.write(block):
+                lane.gap_frames += len(block)
+            lane.started = True
+            self._progress.set()
+            if writer:
+                writer.drain(aligned)
+
+            if stopping and not lane.ring.available:
+                break
+
+        lane.finished = True
+        self._progress.set()
+
+    def _warmed_up(self) -> bool:
+        """Whether every lane has enough timing data to place its start."""
+        return all(lane.tracker.span >= self.warmup_seconds for lane in self.lanes)
+
+    def _align_start(self, lane: CaptureLane, block: np.ndarray) -> np.ndarray:
+        """Pad or trim a lane's opening audio so all lanes start together."""
+        if lane is self.reference:
+            return block
+        origin, reference = lane.tracker.origin, self.reference.tracker.origin
+        if origin is None or reference is None:
+            return block
+        lane.offset_frames = int(round((origin - reference) * self.reference.tracker.rate))
+        if lane.offset_frames > 0:
+            # Started after the reference: silence until it came up
+            pad = np.zeros((lane.offset_frames, lane.channels), dtype=np.float32)
+            return np.concatenate((pad, block))
+        return block[-lane.offset_frames:]
+
+    def _frames_before_stop(self, lane: CaptureLane) -> int:
+        """How many of a lane's frames were captured before stop() was called."""
+        origin = lane.tracker.origin
+        if origin is None:
+            return lane.frames_captured
+        return int(round((self._stop_time - origin) * lane.tracker.rate))
+
+    def _merge(self, writer: ChunkedWriter):
+        """Interleave the aligned lanes into one multichannel stream."""
+        total_channels = self.output_channels[0]
+        merged = RingBuffer(4 * self.chunk_frames, total_channels, np.float32)
+        owed = [0] * len(self.lanes)
+        columns = np.cumsum([0] + [lane.channels for lane in self.lanes])
+
+        done = False
+        while True:
+            if not done:
+                self._progress.wait(timeout=0.25)
+                self._progress.clear()
+            done = all(lane.finished for lane in self.lanes)
+
+            # Discard audio that was already replaced by padding
+            for i, ring in enumerate(self._aligned):
+                if owed[i] and ring.available:
+                    skip = np.empty((min(owed[i], ring.available), ring.channels), np.float32)
+                    owed[i] -= ring.read_into(skip)
+
+            available = [
+                ring.available if not owed[i] else 0 for i, ring in enumerate(self._aligned)
+            ]
+            frames = min(available)
+            if done:
+                frames = max(available)
+            elif not all(lane.started for lane in self.lanes):
+                # Opening blocks land at different times; wait for every start
+                frames = 0
+            elif max(available) - frames > self.max_skew_frames:
+                frames = max(available) - self.max_skew_frames
+            frames = min(frames, merged.capacity)
+
+            if frames > 0:
+                block = np.zeros((frames, total_channels), dtype=np.float32)
+                for i, (lane, ring) in enumerate(zip(self.lanes, self._aligned)):
+                    part = np.empty((frames, lane.channels), dtype=np.float32)
+                    got = ring.read_into(part)
+                    block[:got, columns[i]:columns[i + 1]] = part[:got]
+                    if got < frames:
+                        owed[i] += frames - got
+                        lane.gap_frames += frames - got
+                merged.write(block)
+                writer.drain(merged)
+            elif done:
+                return
+
+    def snapshot(self) -> dict:
+        """Return per-lane drift, alignment and capture measurements."""
+        return {
+            "layout": self.layout,
+            "lanes": [lane.snapshot() for lane in self.lanes],
+            "writes": self.metrics.snapshot(),
+        }
+
+    def write_sidecar(self, audio_path: str | Path) -> str:
+        """
+        Dump the measurements to a JSON file next to the recording.
+
+        Returns:
+            Path of the sidecar file.
+        """
+        audio_path = Path(audio_path)
+        sidecar = audio_path.with_name(f"{audio_path.stem}.metrics.json")
+        data = self.snapshot()
+        data["files"] = [path.name for path in self.output_paths(audio_path)]
+        with open(sidecar, "w") as f:
+            json.dump(data, f, indent=2)
+        return str(sidecar)
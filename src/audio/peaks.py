@@ -0,0 +1,192 @@
+"""
+MacroVox Waveform Peaks
+Multi-resolution min/max/RMS summaries stored as compact binary sidecars
+"""
+
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import soundfile as sf
+
+from .proxy import is_proxy_path
+
+PEAKS_MAGIC = b"MVPK"
+PEAKS_VERSION = 1
+PEAKS_SUFFIX = ".peaks"
+AUDIO_EXTENSIONS = (".wav", ".flac", ".ogg")
+
+# magic, version, levels, sample_rate, base_bin, factor, total_frames
+_HEADER = struct.Struct("<4sHHIIIQ")
+# bin_size, bin_count
+_LEVEL = struct.Struct("<II")
+
+
+def peaks_path_for(audio_path: str | Path) -> Path:
+    """Return the sidecar path for a recording."""
+    audio_path = Path(audio_path)
+    return audio_path.with_name(audio_path.stem + PEAKS_SUFFIX)
+
+
+class PeakSummaryBuilder:
+    """
+    Builds a waveform summary incrementally from captured blocks.
+
+    The finest level stores min, max and RMS for every base_bin samples of
+    the mono mixdown. Each coarser level merges factor bins of the level
+    below, so a view can pick the level closest to its pixels-per-second
+    without decoding any audio. Blocks are reduced with NumPy reshapes;
+    a partial bin is carried over to the next block.
+    """
+
+    def __init__(self, sample_rate: int, base_bin: int = 1024, levels: int = 4, factor: int = 4):
+        self.sample_rate = int(sample_rate)
+        self.base_bin = int(base_bin)
+        self.levels = int(levels)
+        self.factor = int(factor)
+        self.total_frames = 0
+        self._carry = np.empty(0, dtype=np.float32)
+        self._bins: list[np.ndarray] = []
+
+    def process(self, block: np.ndarray):
+        """Add a block of frames (any channel count, float or int16)."""
+        if not len(block):
+            return
+        samples = block.astype(np.float32, copy=False)
+        if block.dtype == np.int16:
+            samples = samples / 32768.0
+        if samples.ndim == 2:
+            samples = samples.mean(axis=1) if samples.shape[1] > 1 else samples[:, 0]
+        self.total_frames += len(samples)
+
+        if len(self._carry):
+            samples = np.concatenate((self._carry, samples))
+        whole = len(samples) - len(samples) % self.base_bin
+        if whole:
+            self._bins.append(self._reduce(samples[:whole].reshape(-1, self.base_bin)))
+        self._carry = samples[whole:].copy()
+
+    @staticmethod
+    def _reduce(frames: np.ndarray) -> np.ndarray:
+        """Reduce rows of samples to (min, max, rms) triples."""
+        out = np.empty((len(frames), 3), dtype=np.float32)
+        out[:, 0] = frames.min(axis=1)
+        out[:, 1] = frames.max(axis=1)
+        out[:, 2] = np.sqrt(np.mean(np.square(frames), axis=1))
+        return out
+
+    def finish(self) -> list[tuple[int, np.ndarray]]:
+        """
+        Flush the partial bin and build every level.
+
+        Returns:
+            List of (bin size in samples, array of shape (bins, 3)) per level.
+        """
+        bins = list(self._bins)
+        if len(self._carry):
+            bins.append(self._reduce(self._carry.reshape(1, -1)))
+            self._carry = np.empty(0, dtype=np.float32)
+        level = np.concatenate(bins) if bins else np.zeros((0, 3), dtype=np.float32)
+
+        result = [(self.base_bin, level)]
+        bin_size = self.base_bin
+        for _ in range(1, self.levels):
+            count = len(level)
+            pad = -count % self.factor
+            if pad:
+                # Repeat the last bin so padding doesn't change min/max/RMS
+                level = np.concatenate((level, np.repeat(level[-1:], pad, axis=0)))
+            grouped = level.reshape(-1, self.factor, 3)
+            merged = np.empty((len(grouped), 3), dtype=np.float32)
+            merged[:, 0] = grouped[:, :, 0].min(axis=1)
+            merged[:, 1] = grouped[:, :, 1].max(axis=1)
+            merged[:, 2] = np.sqrt(np.mean(np.square(grouped[:, :, 2]), axis=1))
+            bin_size *= self.factor
+            level = merged
+            result.append((bin_size, level))
+        return result
+
+    def write(self, path: str | Path) -> str:
+        """Finish the summary and write it as a binary sidecar."""
+        levels = self.finish()
+        path = Path(path)
+        partial = path.with_name(path.name + ".partial")
+        with open(partial, "wb") as f:
+            f.write(_HEADER.pack(
+                PEAKS_MAGIC, PEAKS_VERSION, len(levels), self.sample_rate,
+                self.base_bin, self.factor, self.total_frames,
+            ))
+            for bin_size, data in levels:
+                f.write(_LEVEL.pack(bin_size, len(data)))
+                scaled = np.clip(np.round(data * 32767), -32768, 32767).astype("<i2")
+                f.write(scaled.tobytes())
+        os.replace(partial, path)
+        return str(path)
+
+
+def read_peaks(path: str | Path) -> dict:
+    """
+    Load a peaks sidecar.
+
+    Returns:
+        Dict with sample_rate, total_frames and levels, a list of
+        (bin size, float32 array of shape (bins, 3) holding min/max/rms).
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    magic, version, count, sample_rate, base_bin, factor, total_frames = _HEADER.unpack_from(data)
+    if magic != PEAKS_MAGIC or version != PEAKS_VERSION:
+        raise ValueError(f"Not a peaks file: {path}")
+
+    offset = _HEADER.size
+    levels = []
+    for _ in range(count):
+        bin_size, bins = _LEVEL.unpack_from(data, offset)
+        offset += _LEVEL.size
+        values = np.frombuffer(data, dtype="<i2", count=bins * 3, offset=offset)
+        offset += values.nbytes
+        levels.append((bin_size, values.reshape(-1, 3).astype(np.float32) / 32767))
+
+    return {"sample_rate": sample_rate, "total_frames": total_frames, "levels": levels}
+
+
+def build_peaks_for_file(audio_path: str | Path, blocksize: int = 262144) -> Optional[str]:
+    """
+    Decode a recording once and write its peaks sidecar.
+
+    Returns:
+        Sidecar path, or None if the file could not be read.
+    """
+    try:
+        with sf.SoundFile(audio_path) as f:
+            builder = PeakSummaryBuilder(f.samplerate)
+            for block in f.blocks(blocksize=blocksize, dtype="float32", always_2d=True):
+                builder.process(block)
+    except RuntimeError:
+        return None
+    return builder.write(peaks_path_for(audio_path))
+
+
+def backfill_peaks(folder: str | Path, max_workers: Optional[int] = None, overwrite: bool = False) -> list[str]:
+    """
+    Generate sidecars for existing recordings in parallel worker processes.
+
+    Returns:
+        Paths of the sidecars written.
+    """
+    files = [
+        p for p in sorted(Path(folder).rglob("*"))
+        if p.suffix.lower() in AUDIO_EXTENSIONS
+        and not is_proxy_path(p)
+        and (overwrite or not peaks_path_for(p).exists())
+    ]
+    if not files:
+        return []
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        results = pool.map(build_peaks_for_file, files, chunksize=4)
+        return [path for path in results if path]
@@ -0,0 +1,115 @@
+"""
+MacroVox Transcription Proxy
+Low-rate mono copy of a recording written alongside the master
+"""
+
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from .resample import PolyphaseResampler
+
+PROXY_SUFFIX = ".proxy.flac"
+PROXY_PARTIAL_SUFFIX = ".proxy.partial.flac"
+PROXY_SAMPLE_RATE = 16000
+
+
+def proxy_path_for(audio_path: str | Path) -> Path:
+    """Return the transcription proxy path for a recording."""
+    audio_path = Path(audio_path)
+    return audio_path.with_name(audio_path.stem + PROXY_SUFFIX)
+
+
+def is_proxy_path(path: str | Path) -> bool:
+    """Whether a file is a transcription proxy rather than a recording."""
+    return Path(path).name.endswith(PROXY_SUFFIX)
+
+
+def transcription_source(audio_path: str | Path) -> Path:
+    """
+    Pick the file to upload for transcription.
+
+    Returns:
+        The recording's proxy if one was written, otherwise the recording.
+    """
+    proxy = proxy_path_for(audio_path)
+    return proxy if proxy.exists() else Path(audio_path)
+
+
+def remove_orphaned_proxies(folder: str | Path) -> list[Path]:
+    """
+    Delete proxies left half-written by a crash (call before recording starts).
+
+    The recording itself is recovered from its segments; without a proxy it
+    is simply transcoded when uploaded.
+
+    Returns:
+        Paths of the removed files.
+    """
+    removed = []
+    for path in Path(folder).glob(f"*{PROXY_PARTIAL_SUFFIX}"):
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        removed.append(path)
+    return removed
+
+
+class TranscriptionProxy:
+    """
+    Writes a 16 kHz mono 16-bit FLAC copy of a recording as it is captured.
+
+    Speech recognition gains nothing from 44.1 kHz stereo, so uploading this
+    copy instead of the master cuts the upload to roughly a sixth. Blocks
+    are mixed down and resampled incrementally, so it runs as a writer tap
+    without buffering the recording. The file is written under a .partial
+    name and moved into place on close, so a proxy that exists is complete.
+    """
+
+    def __init__(self, audio_path: str | Path, sample_rate: int, target_rate: int = PROXY_SAMPLE_RATE):
+        self.path = proxy_path_for(audio_path)
+        self._partial = self.path.with_name(Path(audio_path).stem + PROXY_PARTIAL_SUFFIX)
+        self.sample_rate = int(sample_rate)
+        self.target_rate = int(target_rate)
+        self._resampler = PolyphaseResampler(self.sample_rate, self.target_rate)
+        self._file = sf.SoundFile(
+            self._partial,
+            mode="w",
+            samplerate=self.target_rate,
+            channels=1,
+            format="FLAC",
+            subtype="PCM_16",
+        )
+        self.frames_written = 0
+
+    def process(self, block: np.ndarray):
+        """Add a block of frames (any channel count, float or int16)."""
+        if not len(block):
+            return
+        samples = block.astype(np.float32, copy=False)
+        if block.dtype == np.int16:
+            samples = samples / 32768.0
+        if samples.ndim == 2:
+            samples = samples.mean(axis=1) if samples.shape[1] > 1 else samples[:, 0]
+        self._write(self._resampler.process(samples))
+
+    def _write(self, samples: np.ndarray):
+        if len(samples):
+            self._file.write(np.clip(samples, -1.0, 1.0))
+            self.frames_written += len(samples)
+
+    def close(self) -> Path:
+        """Flush the resampler and move the finished proxy into place."""
+        if not self._file.closed:
+            self._write(self._resampler.flush())
+            self._file.close()
+            self._partial.replace(self.path)
+        return self.path
+
+    def discard(self):
+        """Abandon the proxy, e.g. when the recording failed."""
+        if not self._file.closed:
+            self._file.close()
+        self._partial.unlink(missing_ok=True)
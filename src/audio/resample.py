@@ -0,0 +1,141 @@
+"""
+MacroVox Resampler
+Streaming polyphase sample-rate conversion for captured blocks
+"""
+
+from math import gcd
+
+import numpy as np
+
+
+class PolyphaseResampler:
+    """
+    Converts a mono float stream between rates by a rational factor.
+
+    The rate ratio is reduced to up/down (44100 -> 16000 is 160/441). A
+    Kaiser-windowed sinc lowpass is designed at the upsampled rate and split
+    into up phases of taps_per_phase coefficients, so each output sample
+    costs one short dot product instead of upsampling, filtering and
+    decimating. The last taps_per_phase input samples are carried between
+    blocks, making the output identical however the input is chunked, and
+    the filter's group delay is compensated so output stays time-aligned
+    with the input.
+    """
+
+    def __init__(
+        self,
+        in_rate: int,
+        out_rate: int,
+        taps_per_phase: int = 32,
+        rolloff: float = 0.92,
+        beta: float = 8.0,
+    ):
+        self.in_rate = int(in_rate)
+        self.out_rate = int(out_rate)
+        common = gcd(self.in_rate, self.out_rate)
+        self.up = self.out_rate // common
+        self.down = self.in_rate // common
+        self.taps = int(taps_per_phase)
+
+        # Prototype lowpass at in_rate * up, cut below the lower Nyquist
+        length = self.up * self.taps
+        cutoff = rolloff * 0.5 / max(self.up, self.down)
+        n = np.arange(length) - (length - 1) / 2
+        prototype = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(length, beta)
+        prototype *= self.up / prototype.sum()
+        # bank[p, k] weights input sample (base - k) for output phase p
+        self._bank = prototype.reshape(self.taps, self.up).T.astype(np.float32)
+
+        # Centre of the prototype, in upsampled samples
+        self._offset = length // 2
+        self._history = np.zeros(self.taps, dtype=np.float32)
+        self._frames_in = 0
+        self._frames_out = 0
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Resample the next block of a stream.
+
+        Args:
+            samples: 1-D float samples at in_rate
+
+        Returns:
+            The output samples that the input seen so far fully determines.
+        """
+        samples = np.asarray(samples, dtype=np.float32)
+        if self.up == self.down:
+            return samples.copy()
+
+        start = self._frames_in - self.taps
+        ext = np.concatenate((self._history, samples))
+        self._frames_in += len(samples)
+        self._history = ext[-self.taps:].copy()
+
+        # Output n reads input up to base = (n * down + offset) // up
+        last = (self._frames_in * self.up - 1 - self._offset) // self.down
+        n = np.arange(self._frames_out, last + 1, dtype=np.int64)
+        if not len(n):
+            return np.empty(0, dtype=np.float32)
+        self._frames_out = last + 1
+
+        pos = n * self.down + self._offset
+        base = pos // self.up - start
+        phase = pos % self.up
+        window = ext[base[:, None] - np.arange(self.taps)[None, :]]
+        return np.einsum("nk,nk->n", window, self._bank[phase]).astype(np.float32)
+
+    def flush(self) -> np.ndarray:
+        """Push out the samples still held back by the filter delay."""
+        if self.up == self.down:
+            return np.empty(0, dtype=np.float32)
+        expected = -(-self._frames_in * self.up // self.down)
+        emitted = self._frames_out
+        tail = self.process(np.zeros(self._offset // self.up + 1, dtype=np.float32))
+        return tail[: max(0, expected - emitted)]
+
+
+class DriftResampler:
+    """
+    Stretches a multichannel stream by a ratio that may change every block.
+
+    Clock drift between devices is tens of ppm, far too fine for a rational
+    polyphase ratio, so this steps a fractional read position through the
+    input and interpolates with a 4-point Catmull-Rom cubic. At ratio 1.0
+    it reproduces the input exactly. The last three input frames are
+    carried between blocks.
+    """
+
+    def __init__(self, channels: int = 1):
+        self.channels = int(channels)
+        self._history = np.zeros((3, self.channels), dtype=np.float32)
+        # Read position in the extended block (history + input)
+        self._pos = 3.0
+
+    def process(self, block: np.ndarray, ratio: float = 1.0) -> np.ndarray:
+        """
+        Resample the next block.
+
+        Args:
+            block: (frames, channels) float samples
+            ratio: Output frames per input frame (e.g. 1.00004)
+
+        Returns:
+            The resampled frames.
+        """
+        ext = np.concatenate((self._history, np.asarray(block, dtype=np.float32)))
+        step = 1.0 / ratio
+        # Interpolating at p needs frames floor(p) - 1 .. floor(p) + 2
+        count = max(0, int(np.ceil((len(ext) - 2 - self._pos) / step)))
+        pos = self._pos + step * np.arange(count)
+        self._pos += step * count - (len(ext) - 3)
+        self._history = ext[-3:].copy()
+        if not count:
+            return np.empty((0, self.channels), dtype=np.float32)
+
+        i = pos.astype(np.int64)
+        t = (pos - i)[:, None].astype(np.float32)
+        p0, p1, p2, p3 = ext[i - 1], ext[i], ext[i + 1], ext[i + 2]
+        return p1 + 0.5 * t * (
+            (p2 - p0)
+            + t * ((2 * p0 - 5 * p1 + 4 * p2 - p3) + t * (3 * (p1 - p2) + p3 - p0))
+        )
@@ -0,0 +1,227 @@
+"""
+MacroVox Ring Buffer
+Preallocated single-producer/single-consumer audio frame ring
+"""
+
+import threading
+from typing import Optional
+
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Fixed-size ring of audio frames shared by one producer and one consumer.
+
+    The producer (the PortAudio callback) copies blocks into a preallocated
+    array and never allocates or takes a lock on the hot path. The consumer
+    (the writer thread) drains frames into its own buffer. Positions are
+    monotonic frame counters; each side only ever assigns its own counter,
+    so the handoff is safe under the GIL without a mutex.
+
+    If the consumer falls behind and a block does not fit, the whole block
+    is dropped and counted as an overrun rather than overwriting unread audio.
+
+    Blocks may be NumPy arrays or raw interleaved sample bytes in the ring's
+    dtype (e.g. a RawInputStream buffer), which are copied as bytes with no
+    conversion.
+    """
+
+    def __init__(self, capacity_frames: int, channels: int = 1, dtype=np.float32):
+        self.capacity = int(capacity_frames)
+        self.channels = int(channels)
+        self._buffer = np.zeros((self.capacity, self.channels), dtype=dtype)
+        self._bytes = memoryview(self._buffer.reshape(-1)).cast("B")
+        self._frame_bytes = self.channels * self._buffer.itemsize
+        self._write_pos = 0
+        self._read_pos = 0
+        self._wake_threshold = 1
+        self._data_ready = threading.Event()
+
+        self.high_water_mark = 0   # Most frames ever waiting to be read
+        self.overrun_count = 0     # Blocks dropped because the ring was full
+        self.dropped_frames = 0
+
+    @property
+    def dtype(self):
+        """Sample type of the underlying buffer."""
+        return self._buffer.dtype
+
+    @property
+    def available(self) -> int:
+        """Number of frames waiting to be read."""
+        return self._write_pos - self._read_pos
+
+    @property
+    def free(self) -> int:
+        """Number of frames that can be written without an overrun."""
+        return self.capacity - self.available
+
+    def set_wake_threshold(self, frames: int):
+        """Only wake the consumer once at least this many frames are queued."""
+        self._wake_threshold = max(1, min(int(frames), self.capacity))
+
+    def _frames_in(self, block) -> int:
+        """Number of frames in an array or raw byte buffer."""
+        if isinstance(block, np.ndarray):
+            return len(block)
+        return memoryview(block).nbytes // self._frame_bytes
+
+    def write(self, block) -> bool:
+        """
+        Copy a block of frames into the ring (producer side).
+
+        Returns:
+            True if the block was stored, False if it was dropped.
+        """
+        frames = self._frames_in(block)
+        write_pos = self._write_pos
+        if frames > self.capacity - (write_pos - self._read_pos):
+            self.overrun_count += 1
+            self.dropped_frames += frames
+            return False
+
+        start = write_pos % self.capacity
+        first = min(frames, self.capacity - start)
+        if isinstance(block, np.ndarray):
+            self._buffer[start:start + first] = block[:first]
+            if first < frames:
+                self._buffer[:frames - first] = block[first:]
+        else:
+            raw = memoryview(block).cast("B")
+            fb = self._frame_bytes
+            self._bytes[start * fb:(start + first) * fb] = raw[:first * fb]
+            if first < frames:
+                self._bytes[:(frames - first) * fb] = raw[first * fb:frames * fb]
+
+        # Publish only after the data is in place
+        self._write_pos = write_pos + frames
+
+        filled = self._write_pos - self._read_pos
+        if filled > self.high_water_mark:
+            self.high_water_mark = filled
+        if filled >= self._wake_threshold and not self._data_ready.is_set():
+            self._data_ready.set()
+        return True
+
+    def write_latest(self, block):
+        """
+        Store a block, discarding the oldest frames if the ring is full.
+
+        Only valid when one thread both writes and reads, as with a pre-roll
+        ring owned by the audio callback.
+        """
+        frames = self._frames_in(block)
+        if frames > self.capacity:
+            if isinstance(block, np.ndarray):
+                block = block[-self.capacity:]
+            else:
+                block = memoryview(block).cast("B")[-self.capacity * self._frame_bytes:]
+            frames = self.capacity
+        excess = frames - self.free
+        if excess > 0:
+            self._read_pos += excess
+        self.write(block)
+
+    def transfer_to(self, *others: "RingBuffer") -> int:
+        """
+        Move every queued frame into other rings (each gets a copy), oldest first.
+
+        Returns:
+            Number of frames moved.
+        """
+        read_pos = self._read_pos
+        frames = self._write_pos - read_pos
+        if frames <= 0:
+            return 0
+
+        start = read_pos % self.capacity
+        first = min(frames, self.capacity - start)
+        for other in others:
+            other.write(self._buffer[start:start + first])
+            if first < frames:
+                other.write(self._buffer[:frames - first])
+
+        self._read_pos = read_pos + frames
+        return frames
+
+    def read_into(self, out: np.ndarray) -> int:
+        """
+        Move up to len(out) frames into a caller-owned array (consumer side).
+
+        Returns:
+            Number of frames copied into the front of out.
+        """
+        read_pos = self._read_pos
+        frames = min(len(out), self._write_pos - read_pos)
+        if frames <= 0:
+            return 0
+
+        start = read_pos % self.capacity
+        first = min(frames, self.capacity - start)
+        out[:first] = self._buffer[start:start + first]
+        if first < frames:
+            out[first:frames] = self._buffer[:frames - first]
+
+        # Release the space only after the copy is done
+        self._read_pos = read_pos + frames
+        return frames
+
+    def peek_latest(self, frames: int) -> np.ndarray:
+        """
+        Copy the newest frames without consuming anything (any thread).
+
+        Frames the producer overwrote during the copy are dropped, so the
+        result may be shorter than requested.
+        """
+        end = self._write_pos
+        begin = max(0, end - min(int(frames), self.capacity))
+        count = end - begin
+        out = np.empty((count, self.channels), dtype=self._buffer.dtype)
+        if count <= 0:
+            return out
+        start = begin % self.capacity
+        first = min(count, self.capacity - start)
+        out[:first] = self._buffer[start:start + first]
+        if first < count:
+            out[first:] = self._buffer[:count - first]
+        stale = self._write_pos - self.capacity - begin
+        if stale > 0:
+            out = out[stale:]
+        return out
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the wake threshold is reached (consumer side).
+
+        Callers should drain everything available after each wake.
+
+        Returns:
+            True if woken by data, False on timeout.
+        """
+        woken = self._data_ready.wait(timeout)
+        # Clear before the caller drains so a concurrent write re-arms the event
+        self._data_ready.clear()
+        return woken
+
+    def wake(self):
+        """Wake a waiting consumer regardless of fill level (e.g. on stop)."""
+        self._data_ready.set()
+
+    def reset(self):
+        """Discard queued frames and clear statistics."""
+        self._read_pos = self._write_pos = 0
+        self._data_ready.clear()
+        self.high_water_mark = 0
+        self.overrun_count = 0
+        self.dropped_frames = 0
+
+    def stats(self) -> dict:
+        """Return buffer statistics."""
+        return {
+            "capacity_frames": self.capacity,
+            "available_frames": self.available,
+            "high_water_mark": self.high_water_mark,
+            "overrun_count": self.overrun_count,
+            "dropped_frames": self.dropped_frames,
+        }
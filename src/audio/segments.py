@@ -0,0 +1,265 @@
+"""
+MacroVox Segmented Recording
+Rolling segment files that stay valid if the process dies mid-recording
+"""
+
+import json
+import os
+import shutil
+import struct
+from pathlib import Path
+from typing import Callable, Optional
+
+import soundfile as sf
+
+MANIFEST_NAME = "segments.json"
+SEGMENT_DIR_SUFFIX = ".segments"
+
+# Length libsndfile reports for a FLAC file whose header was never finalized
+_UNKNOWN_FRAMES = 2**63 - 1
+
+
+def segment_dir_for(target_path: str | Path) -> Path:
+    """Return the folder that holds the segments of a recording."""
+    target_path = Path(target_path)
+    return target_path.with_name(target_path.name + SEGMENT_DIR_SUFFIX)
+
+
+class SegmentedSink:
+    """
+    File sink that rolls over to a new segment every N seconds or N MB.
+
+    Each finished segment is closed immediately, so its header is valid and
+    at most one segment is lost if the process dies. A manifest next to the
+    segments records where and how they should be stitched back together.
+    """
+
+    def __init__(
+        self,
+        target_path: str | Path,
+        samplerate: int,
+        channels: int,
+        format: str,
+        segment_seconds: float = 0,
+        segment_mb: float = 0,
+        on_segment_finished: Optional[Callable[[str], None]] = None,
+    ):
+        self.target_path = Path(target_path)
+        self.directory = segment_dir_for(self.target_path)
+        self.samplerate = samplerate
+        self.channels = channels
+        self.format = format
+        self.on_segment_finished = on_segment_finished
+        self.finished_segments: list[str] = []
+
+        self._segment_frames = int(segment_seconds * samplerate) if segment_seconds else 0
+        self._segment_bytes = int(segment_mb * 1024 * 1024) if segment_mb else 0
+        self._extension = self.target_path.suffix
+        self._file: Optional[sf.SoundFile] = None
+        self._path: Optional[Path] = None
+        self._frames_in_segment = 0
+        self._index = 0
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            "target": self.target_path.name,
+            "samplerate": samplerate,
+            "channels": channels,
+            "format": format,
+        }
+        with open(self.directory / MANIFEST_NAME, "w") as f:
+            json.dump(manifest, f, indent=2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, data):
+        """Write frames, splitting them across segment boundaries as needed."""
+        offset = 0
+        total = len(data)
+        while offset < total:
+            if self._file is None:
+                self._open_next()
+
+            frames = total - offset
+            if self._segment_frames:
+                frames = min(frames, self._segment_frames - self._frames_in_segment)
+            self._file.write(data[offset:offset + frames])
+            self._frames_in_segment += frames
+            offset += frames
+
+            if self._segment_full():
+                self._close_current()
+
+    def close(self):
+        """Close the open segment, if any."""
+        self._close_current()
+
+    def _segment_full(self) -> bool:
+        if self._segment_frames and self._frames_in_segment >= self._segment_frames:
+            return True
+        if self._segment_bytes and os.path.getsize(self._path) >= self._segment_bytes:
+            return True
+        return False
+
+    def _open_next(self):
+        self._index += 1
+        self._path = self.directory / f"part_{self._index:05d}{self._extension}"
+        self._file = sf.SoundFile(
+            self._path,
+            mode="w",
+            samplerate=self.samplerate,
+            channels=self.channels,
+            format=self.format,
+        )
+        self._frames_in_segment = 0
+
+    def _close_current(self):
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        finished = str(self._path)
+        self.finished_segments.append(finished)
+        if self.on_segment_finished:
+            self.on_segment_finished(finished)
+
+
+def _repair_wav_header(path: Path) -> bool:
+    """
+    Patch the RIFF and data chunk sizes of a WAV that was never closed.
+
+    Returns:
+        True if the header was rewritten.
+    """
+    size = path.stat().st_size
+    with open(path, "r+b") as f:
+        header = f.read(4096)
+        if header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            return False
+        pos = 12
+        while pos + 8 <= len(header):
+            chunk_id = header[pos:pos + 4]
+            if chunk_id == b"data":
+                f.seek(4)
+                f.write(struct.pack("<I", size - 8))
+                f.seek(pos + 4)
+                f.write(struct.pack("<I", size - pos - 8))
+                return True
+            (chunk_size,) = struct.unpack("<I", header[pos + 4:pos + 8])
+            pos += 8 + chunk_size + (chunk_size & 1)
+    return False
+
+
+def _readable_segment(path: Path) -> bool:
+    """
+    Check that a segment can be opened, repairing WAV headers if needed.
+
+    A FLAC segment that was still open reports an unknown length; it is
+    accepted here and copied only as far as it decodes.
+    """
+    try:
+        with sf.SoundFile(path) as f:
+            if f.frames > 0:
+                return True
+    except RuntimeError:
+        pass
+    if path.suffix.lower() == ".wav" and _repair_wav_header(path):
+        try:
+            with sf.SoundFile(path) as f:
+                return f.frames > 0
+        except RuntimeError:
+            return False
+    return False
+
+
+def _copy_segment(path: Path, out: sf.SoundFile, blocksize: int) -> int:
+    """
+    Append a segment's audio to out, stopping at the first decode error.
+
+    The segment open at a crash ends in a partly written frame (and FLAC
+    can't seek in it); everything decoded before that point is kept.
+
+    Returns:
+        Frames copied.
+    """
+    copied = 0
+    try:
+        with sf.SoundFile(path) as f:
+            if f.frames >= _UNKNOWN_FRAMES:
+                # A failing read returns nothing, so lose as little as possible
+                blocksize = min(blocksize, 1024)
+            while True:
+                block = f.read(blocksize, always_2d=True)
+                if not len(block):
+                    break
+                out.write(block)
+                copied += len(block)
+    except RuntimeError:
+        pass
+    return copied
+
+
+def stitch_segments(directory: str | Path, blocksize: int = 65536) -> Optional[str]:
+    """
+    Concatenate a segment folder into its target file and remove the folder.
+
+    Returns:
+        Path of the stitched recording, or None if there was nothing to stitch.
+    """
+    directory = Path(directory)
+    manifest_path = directory / MANIFEST_NAME
+    if not manifest_path.exists():
+        return None
+
+    with open(manifest_path, "r") as f:
+        manifest = json.load(f)
+
+    target = directory.parent / manifest["target"]
+    parts = [p for p in sorted(directory.glob("part_*")) if _readable_segment(p)]
+    if not parts:
+        shutil.rmtree(directory, ignore_errors=True)
+        return None
+
+    # Stitch under a temporary name so a crash here leaves the segments intact
+    partial = target.with_name(f"{target.stem}.partial{target.suffix}")
+    try:
+        with sf.SoundFile(
+            partial,
+            mode="w",
+            samplerate=manifest["samplerate"],
+            channels=manifest["channels"],
+            format=manifest["format"],
+        ) as out:
+            copied = sum(_copy_segment(part, out, blocksize) for part in parts)
+        if not copied:
+            raise ValueError(f"No audio could be decoded from {directory.name}")
+        os.replace(partial, target)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    shutil.rmtree(directory, ignore_errors=True)
+    return str(target)
+
+
+def recover_orphaned_segments(folder: str | Path) -> list[str]:
+    """
+    Stitch any segment folders left behind by a recording that never stopped.
+
+    Returns:
+        Paths of the recovered recordings.
+    """
+    recovered = []
+    for directory in sorted(Path(folder).glob(f"*{SEGMENT_DIR_SUFFIX}")):
+        if not directory.is_dir():
+            continue
+        try:
+            path = stitch_segments(directory)
+        except (RuntimeError, OSError, ValueError, KeyError):
+            continue
+        if path:
+            recovered.append(path)
+    return recovered
@@ -0,0 +1,134 @@
+"""
+MacroVox Shared Monitor Ring
+Cross-process ring of recent mono audio for levels and previews
+"""
+
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+
+# write_pos, capacity, sample_rate, reserved
+_HEADER_FIELDS = 4
+_HEADER_BYTES = _HEADER_FIELDS * 8
+
+
+class SharedRingBuffer:
+    """
+    Single-writer ring of float32 mono samples in shared memory.
+
+    The capture process mixes every callback block down to mono and writes
+    it here; any number of readers in other processes take non-destructive
+    copies of the newest audio. The writer never waits for readers: a
+    monotonic write position in the header lets a reader detect when the
+    region it copied was overwritten meanwhile and drop the stale part.
+
+    Create it in the owning process, pass name and capacity to the other
+    side, and call attach() there.
+    """
+
+    def __init__(self, capacity_frames: int, name: Optional[str] = None, create: bool = True):
+        self.capacity = int(capacity_frames)
+        size = _HEADER_BYTES + self.capacity * 4
+        self._shm = shared_memory.SharedMemory(name=name, create=create, size=size if create else 0)
+        self._owner = create
+        self._header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=self._shm.buf)
+        self._data = np.ndarray(
+            (self.capacity,), dtype=np.float32, buffer=self._shm.buf, offset=_HEADER_BYTES
+        )
+        if create:
+            self._header[:] = 0
+            self._header[1] = self.capacity
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedRingBuffer":
+        """Open a ring created by another process."""
+        shm = shared_memory.SharedMemory(name=name)
+        capacity = int(np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)[1])
+        shm.close()
+        return cls(capacity, name=name, create=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def write_pos(self) -> int:
+        """Total frames ever written."""
+        return int(self._header[0])
+
+    @property
+    def sample_rate(self) -> int:
+        return int(self._header[2])
+
+    @sample_rate.setter
+    def sample_rate(self, rate: int):
+        self._header[2] = int(rate)
+
+    def write(self, block: np.ndarray):
+        """
+        Store a block (writer side), overwriting the oldest audio.
+
+        Args:
+            block: (frames,) or (frames, channels) float32 or int16 samples
+        """
+        if block.ndim == 2:
+            block = block.mean(axis=1) if block.shape[1] > 1 else block[:, 0]
+        if block.dtype == np.int16:
+            block = block * (1.0 / 32768.0)
+        if len(block) > self.capacity:
+            block = block[-self.capacity:]
+        frames = len(block)
+        write_pos = int(self._header[0])
+        start = write_pos % self.capacity
+        first = min(frames, self.capacity - start)
+        self._data[start:start + first] = block[:first]
+        if first < frames:
+            self._data[:frames - first] = block[first:]
+        # Publish only after the samples are in place
+        self._header[0] = write_pos + frames
+
+    def read_since(self, pos: int, max_frames: Optional[int] = None) -> tuple[np.ndarray, int]:
+        """
+        Copy audio written after position pos (reader side).
+
+        If the reader fell more than a ring behind, the oldest audio is
+        skipped. Pass the returned position to the next call.
+
+        Returns:
+            (samples, new position)
+        """
+        end = self.write_pos
+        begin = max(pos, end - self.capacity)
+        if max_frames is not None:
+            begin = max(begin, end - max_frames)
+        out = self._copy(begin, end)
+        # Frames the writer lapped while we were copying are stale
+        stale = self.write_pos - self.capacity - begin
+        if stale > 0:
+            out = out[stale:]
+        return out, end
+
+    def peek_latest(self, frames: int) -> np.ndarray:
+        """Copy the newest frames without consuming anything."""
+        samples, _ = self.read_since(0, max_frames=min(int(frames), self.capacity))
+        return samples
+
+    def _copy(self, begin: int, end: int) -> np.ndarray:
+        frames = end - begin
+        out = np.empty(frames, dtype=np.float32)
+        if frames <= 0:
+            return out[:0]
+        start = begin % self.capacity
+        first = min(frames, self.capacity - start)
+        out[:first] = self._data[start:start + first]
+        if first < frames:
+            out[first:] = self._data[:frames - first]
+        return out
+
+    def close(self):
+        """Detach; the creating process also frees the segment."""
+        self._header = self._data = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
@@ -0,0 +1,78 @@
+"""
+MacroVox Transcoding
+Off-the-hot-path conversion of captured PCM to compressed formats
+"""
+
+import os
+from pathlib import Path
+from typing import Optional
+
+import soundfile as sf
+
+# Set in each pool worker by init_worker(); receives (source, percent) tuples
+_progress_queue = None
+
+
+def init_worker(progress_queue):
+    """ProcessPoolExecutor initializer that wires up progress reporting."""
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def _report(source: str, percent: int):
+    if _progress_queue is not None:
+        _progress_queue.put((source, percent))
+
+
+def transcode_file(
+    source: str,
+    target: str,
+    format: str,
+    subtype: Optional[str] = None,
+    delete_source: bool = True,
+    blocksize: int = 262144,
+) -> str:
+    """
+    Convert an audio file to another format in blocks.
+
+    The result is written under a temporary name and moved into place when
+    complete, so a half-encoded file never appears under the final name.
+
+    Args:
+        source: Path to the captured (usually WAV) file
+        target: Path of the encoded file to create
+        format: libsndfile major format, e.g. "FLAC" or "OGG"
+        subtype: libsndfile subtype, e.g. "PCM_16" or "VORBIS"
+        delete_source: Remove the source once the target is in place
+
+    Returns:
+        The target path.
+    """
+    target_path = Path(target)
+    partial = target_path.with_name(f"{target_path.stem}.partial{target_path.suffix}")
+    last_percent = -1
+
+    with sf.SoundFile(source) as src:
+        total = max(src.frames, 1)
+        done = 0
+        with sf.SoundFile(
+            partial,
+            mode="w",
+            samplerate=src.samplerate,
+            channels=src.channels,
+            format=format,
+            subtype=subtype,
+        ) as dst:
+            for block in src.blocks(blocksize=blocksize, always_2d=True):
+                dst.write(block)
+                done += len(block)
+                percent = done * 100 // total
+                if percent >= last_percent + 5:
+                    last_percent = percent
+                    _report(source, percent)
+
+    os.replace(partial, target_path)
+    if delete_source and Path(source) != target_path:
+        os.remove(source)
+    _report(source, 100)
+    return str(target_path)
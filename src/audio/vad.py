@@ -0,0 +1,318 @@
+"""
+MacroVox Voice Activity
+Energy-based silence detection and write-time silence trimming
+"""
+
+import json
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+
+
+def frame_rms_db(samples: np.ndarray, frame_len: int) -> np.ndarray:
+    """
+    RMS level in dBFS of each whole frame of a block.
+
+    Args:
+        samples: Array of shape (frames,) or (frames, channels), float or int16
+        frame_len: Samples per analysis frame
+
+    Returns:
+        Array with one level per complete frame (a trailing partial frame is
+        ignored).
+    """
+    count = len(samples) // frame_len
+    if not count:
+        return np.zeros(0, dtype=np.float32)
+    x = samples[:count * frame_len].reshape(count, -1).astype(np.float32, copy=False)
+    if samples.dtype == np.int16:
+        x = x / 32768.0
+    power = np.einsum("ij,ij->i", x, x) / x.shape[1]
+    return 10.0 * np.log10(power + 1e-12)
+
+
+class SilenceMonitor:
+    """
+    Fires a callback once the input has been silent for long enough.
+
+    Levels are taken over 100 ms windows of the blocks the writer already
+    holds (one dot product per window), so watching for silence adds no
+    work to the audio callback. A partial window at the end of a block is
+    carried into the next one, so short blocks are measured like any other.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        timeout: float,
+        on_timeout: Callable[[], None],
+        threshold_db: float = -45.0,
+        window_ms: float = 100.0,
+    ):
+        self.threshold_db = threshold_db
+        self.on_timeout = on_timeout
+        self._window = max(1, int(sample_rate * window_ms / 1000))
+        self._timeout_frames = int(timeout * sample_rate)
+        self._silent_frames = 0
+        self._carry: Optional[np.ndarray] = None
+        self.fired = False
+
+    @property
+    def silent_frames(self) -> int:
+        """Frames of continuous silence at the end of the input measured so far."""
+        return self._silent_frames
+
+    def process(self, block: np.ndarray):
+        """Update the trailing-silence count with a block of frames."""
+        if self.fired:
+            return
+        if self._carry is not None:
+            block = np.concatenate((self._carry, block))
+            self._carry = None
+        whole = len(block) - len(block) % self._window
+        if whole < len(block):
+            self._carry = block[whole:].copy()
+        if not whole:
+            return
+        levels = frame_rms_db(block[:whole], self._window)
+        loud = np.flatnonzero(levels > self.threshold_db)
+        if len(loud):
+            self._silent_frames = whole - (int(loud[-1]) + 1) * self._window
+        else:
+            self._silent_frames += whole
+
+        if self._silent_frames >= self._timeout_frames:
+            self.fired = True
+            self.on_timeout()
+
+
+class SilenceTrimmer:
+    """
+    Sink wrapper that drops (or just marks) long silent stretches.
+
+    Audio is classified in short frames by RMS level. Silences shorter than
+    min_silence pass through untouched. Longer ones are cut down to
+    `hangover` seconds on each side, so word onsets and tails are not
+    clipped. Only the trailing hangover window is held in memory during a
+    long pause. The mapping from output frames back to the original timeline
+    is kept for a sidecar so transcripts can be placed on the real clock.
+
+    In "mark" mode nothing is removed; the silences are only recorded.
+    """
+
+    def __init__(
+        self,
+        sink,
+        sample_rate: int,
+        threshold_db: float = -45.0,
+        min_silence: float = 1.0,
+        hangover: float = 0.3,
+        frame_ms: float = 20.0,
+        drop: bool = True,
+        listeners: Optional[list[Callable[[np.ndarray], None]]] = None,
+    ):
+        self.sink = sink
+        self.sample_rate = int(sample_rate)
+        self.threshold_db = threshold_db
+        self.drop = drop
+        self.listeners = list(listeners or [])  # See every block actually written
+
+        self._frame = max(1, int(sample_rate * frame_ms / 1000))
+        self._min_silence = int(min_silence * sample_rate)
+        self._hangover = int(hangover * sample_rate)
+
+        self._carry: Optional[np.ndarray] = None
+        self._pending: list[tuple[int, np.ndarray]] = []  # (original offset, frames)
+        self._pending_frames = 0
+        self._silence_start: Optional[int] = None
+        self._cutting = False
+        self._original_pos = 0
+        self._output_pos = 0
+
+        self.segments: list[list[int]] = []  # [output start, original start, frames]
+        self.silences: list[tuple[int, int]] = []  # [original start, original end)
+
+    def __enter__(self):
+        self.sink.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finish()
+        return self.sink.__exit__(exc_type, exc, tb)
+
+    @property
+    def original_frames(self) -> int:
+        return self._original_pos
+
+    @property
+    def output_frames(self) -> int:
+        return self._output_pos
+
+    def write(self, data: np.ndarray):
+        """Classify and forward a block; a partial analysis frame is carried."""
+        if self._carry is not None:
+            data = np.concatenate((self._carry, data))
+            self._carry = None
+        whole = len(data) - len(data) % self._frame
+        if whole < len(data):
+            self._carry = data[whole:].copy()
+        if whole:
+            self._process(data[:whole], frame_rms_db(data[:whole], self._frame) > self.threshold_db)
+
+    def finish(self):
+        """Flush the tail. A trailing long silence is dropped beyond its hangover."""
+        if self._carry is not None:
+            tail, self._carry = self._carry, None
+            level = frame_rms_db(tail, len(tail))
+            self._process(tail, level > self.threshold_db, frame=len(tail))
+
+        if self._silence_start is not None:
+            if self._cutting:
+                self._record_silence(self._silence_start + self._hangover, self._original_pos)
+                self._pending.clear()
+                self._pending_frames = 0
+            else:
+                if not self.drop and self._original_pos - self._silence_start >= self._min_silence:
+                    self._record_silence(self._silence_start, self._original_pos)
+                self._flush_pending()
+            self._silence_start = None
+            self._cutting = False
+
+    def _process(self, data: np.ndarray, speech: np.ndarray, frame: Optional[int] = None):
+        """Walk runs of speech/silence frames through the state machine."""
+        frame = frame or self._frame
+        edges = np.flatnonzero(np.diff(speech.astype(np.int8))) + 1
+        starts = np.concatenate(([0], edges))
+        ends = np.concatenate((edges, [len(speech)]))
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            block = data[start * frame:end * frame]
+            origin = self._original_pos + start * frame
+            if speech[start]:
+                self._on_speech(origin, block)
+            else:
+                self._on_silence(origin, block)
+        self._original_pos += len(data)
+
+    def _on_speech(self, origin: int, block: np.ndarray):
+        if self._silence_start is not None:
+            if self._cutting:
+                resume = self._pending[0][0] if self._pending else origin
+                self._record_silence(self._silence_start + self._hangover, resume)
+            elif not self.drop and origin - self._silence_start >= self._min_silence:
+                self._record_silence(self._silence_start, origin)
+            self._flush_pending()
+            self._silence_start = None
+            self._cutting = False
+        self._emit(origin, block)
+
+    def _on_silence(self, origin: int, block: np.ndarray):
+        if self._silence_start is None:
+            self._silence_start = origin
+        if not self.drop:
+            self._emit(origin, block)
+            return
+
+        self._pending.append((origin, block.copy()))
+        self._pending_frames += len(block)
+
+        if not self._cutting and self._pending_frames >= self._min_silence:
+            # Long enough to cut: keep the leading hangover, then only a
+            # rolling window for the hangover before speech resumes
+            self._cutting = True
+            self._emit_leading(self._hangover)
+        if self._cutting:
+            self._trim_pending(self._hangover)
+
+    def _emit_leading(self, frames: int):
+        """Emit the first `frames` frames of held silence."""
+        while frames > 0 and self._pending:
+            origin, block = self._pending[0]
+            take = min(frames, len(block))
+            self._emit(origin, block[:take])
+            frames -= take
+            self._pending_frames -= take
+            if take == len(block):
+                self._pending.pop(0)
+            else:
+                self._pending[0] = (origin + take, block[take:])
+
+    def _trim_pending(self, keep: int):
+        """Discard held silence older than the last `keep` frames."""
+        excess = self._pending_frames - keep
+        while excess > 0 and self._pending:
+            origin, block = self._pending[0]
+            if len(block) <= excess:
+                self._pending.pop(0)
+                self._pending_frames -= len(block)
+                excess -= len(block)
+            else:
+                self._pending[0] = (origin + excess, block[excess:])
+                self._pending_frames -= excess
+                excess = 0
+
+    def _flush_pending(self):
+        for origin, block in self._pending:
+            self._emit(origin, block)
+        self._pending.clear()
+        self._pending_frames = 0
+
+    def _emit(self, origin: int, block: np.ndarray):
+        """Write frames and extend the output-to-original mapping."""
+        if not len(block):
+            return
+        self.sink.write(block)
+        for listener in self.listeners:
+            listener(block)
+
+        last = self.segments[-1] if self.segments else None
+        if last and last[0] + last[2] == self._output_pos and last[1] + last[2] == origin:
+            last[2] += len(block)
+        else:
+            self.segments.append([self._output_pos, origin, len(block)])
+        self._output_pos += len(block)
+
+    def _record_silence(self, start: int, end: int):
+        if end > start:
+            self.silences.append((start, end))
+
+    def original_time(self, output_seconds: float) -> float:
+        """Map a time in the written file back to the original recording."""
+        frame = int(output_seconds * self.sample_rate)
+        for out_start, orig_start, frames in self.segments:
+            if frame < out_start + frames:
+                return (orig_start + max(0, frame - out_start)) / self.sample_rate
+        return self._original_pos / self.sample_rate
+
+    def write_timeline(self, audio_path: str | Path) -> str:
+        """
+        Write the output-to-original mapping next to the recording.
+
+        Returns:
+            Path of the <name>.timeline.json sidecar.
+        """
+        audio_path = Path(audio_path)
+        sidecar = audio_path.with_name(f"{audio_path.stem}.timeline.json")
+        rate = self.sample_rate
+        data = {
+            "file": audio_path.name,
+            "mode": "drop" if self.drop else "mark",
+            "sample_rate": rate,
+            "original_seconds": round(self._original_pos / rate, 3),
+            "output_seconds": round(self._output_pos / rate, 3),
+            "segments": [
+                {
+                    "output_start": round(out_start / rate, 4),
+                    "original_start": round(orig_start / rate, 4),
+                    "duration": round(frames / rate, 4),
+                }
+                for out_start, orig_start, frames in self.segments
+            ],
+            "silences": [
+                {"start": round(start / rate, 4), "end": round(end / rate, 4)}
+                for start, end in self.silences
+            ],
+        }
+        with open(sidecar, "w") as f:
+            json.dump(data, f, indent=2)
+        return str(sidecar)
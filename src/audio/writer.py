@@ -0,0 +1,92 @@
+"""
+MacroVox Chunked Writer
+Coalesces captured frames into large writes
+"""
+
+import time
+from typing import Callable, Optional
+
+import numpy as np
+
+from .metrics import CaptureMetrics
+from .ring_buffer import RingBuffer
+
+
+class ChunkedWriter:
+    """
+    Gathers frames from a RingBuffer into one large chunk per write.
+
+    Encoders (FLAC/OGG) and synced folders pay a fixed cost per write call,
+    so draining a whole chunk (typically 0.5-2 s of audio) at once is much
+    cheaper than writing every callback block. The ring is drained straight
+    into the chunk buffer, so no extra copy is made.
+
+    Taps are callables that see every freshly drained run of frames (a view
+    into the chunk buffer) before it is written, for analysis that should
+    ride along with the writer instead of touching the audio callback.
+    """
+
+    def __init__(
+        self,
+        sink,
+        chunk_frames: int,
+        channels: int = 1,
+        dtype=np.float32,
+        metrics: Optional[CaptureMetrics] = None,
+        taps: Optional[list[Callable[[np.ndarray], None]]] = None,
+        on_write: Optional[Callable[[int], None]] = None,
+    ):
+        self.sink = sink
+        self.metrics = metrics
+        self.taps = list(taps or [])
+        self.on_write = on_write
+        self.chunk_frames = max(1, int(chunk_frames))
+        self._chunk = np.empty((self.chunk_frames, channels), dtype=dtype)
+        self._fill = 0
+
+        self.write_count = 0
+        self.frames_written = 0
+
+    @property
+    def pending_frames(self) -> int:
+        """Frames gathered but not yet written."""
+        return self._fill
+
+    def drain(self, ring: RingBuffer) -> int:
+        """
+        Move everything queued in the ring into the chunk, writing full chunks.
+
+        Returns:
+            Number of frames taken from the ring.
+        """
+        total = 0
+        while True:
+            frames = ring.read_into(self._chunk[self._fill:])
+            if not frames:
+                return total
+            total += frames
+            if self.taps:
+                fresh = self._chunk[self._fill:self._fill + frames]
+                for tap in self.taps:
+                    tap(fresh)
+            self._fill += frames
+            if self._fill == self.chunk_frames:
+                self._write()
+
+    def flush(self):
+        """Write any partially filled chunk (call on stop so the tail is kept)."""
+        if self._fill:
+            self._write()
+
+    def _write(self):
+        """Hand the gathered frames to the sink in a single call."""
+        chunk = self._chunk[:self._fill]
+        start = time.perf_counter()
+        self.sink.write(chunk)
+        if self.metrics:
+            self.metrics.record_write(time.perf_counter() - start, chunk.nbytes)
+        self.write_count += 1
+        self.frames_written += self._fill
+        self._fill = 0
+        if self.on_write:
+            self.on_write(self.frames_written)
@@ -6,5 +6,6 @@ IDE-style panel components for the main interface
 from .file_browser import FileBrowserPanel
 from .terminal import TerminalPanel
 from .output_panel import OutputPanel
+from .level_meter import LevelMeter
 
-__all__ = ["FileBrowserPanel", "TerminalPanel", "OutputPanel"]
+__all__ = ["FileBrowserPanel", "TerminalPanel", "OutputPanel", "LevelMeter"]
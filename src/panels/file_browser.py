@@ -9,6 +9,7 @@ from pathlib import Path
 
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtWidgets import (
+    QAbstractItemView,
     QFrame,
     QHBoxLayout,
     QLabel,
@@ -25,6 +26,7 @@ class FileBrowserPanel(QFrame):
     """File browser panel for navigating recordings."""
     
     file_selected = Signal(str)  # Emits file path when selected
+    transcribe_requested = Signal(list)  # Emits file paths to batch transcribe
     
     def __init__(self, recordings_folder: str = "", parent=None):
         super().__init__(parent)
@@ -56,15 +58,24 @@ class FileBrowserPanel(QFrame):
         self.tree.setHeaderHidden(True)
         self.tree.setRootIsDecorated(True)
         self.tree.setAnimated(True)
+        self.tree.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.tree.itemClicked.connect(self._on_item_clicked)
         self.tree.itemDoubleClicked.connect(self._on_item_double_clicked)
         layout.addWidget(self.tree, 1)
         
-        # Refresh button
+        # Refresh and batch transcribe buttons
+        button_layout = QHBoxLayout()
         refresh_btn = QPushButton("↻ REFRESH")
         refresh_btn.setObjectName("refreshBtn")
         refresh_btn.clicked.connect(self.refresh)
-        layout.addWidget(refresh_btn)
+        button_layout.addWidget(refresh_btn)
+        
+        batch_btn = QPushButton("TRANSCRIBE")
+        batch_btn.setObjectName("batchBtn")
+        batch_btn.setToolTip("Transcribe the selected recordings, or the whole folder if none are selected")
+        batch_btn.clicked.connect(self._on_transcribe_clicked)
+        button_layout.addWidget(batch_btn)
+        layout.addLayout(button_layout)
         
     def set_folder(self, folder: str):
         """Set the recordings folder and refresh the tree."""
@@ -116,6 +127,29 @@ class FileBrowserPanel(QFrame):
             placeholder = QTreeWidgetItem(self.tree, ["No recordings yet"])
             placeholder.setFlags(Qt.NoItemFlags)
     
+    def selected_files(self) -> list[str]:
+        """Paths of the selected recordings; a selected date includes all of its files."""
+        paths: list[str] = []
+        for item in self.tree.selectedItems():
+            file_path = item.data(0, Qt.UserRole)
+            if file_path:
+                paths.append(file_path)
+            else:
+                paths.extend(
+                    item.child(i).data(0, Qt.UserRole)
+                    for i in range(item.childCount())
+                    if item.child(i).data(0, Qt.UserRole)
+                )
+        return list(dict.fromkeys(paths))
+    
+    def _on_transcribe_clicked(self):
+        """Request a batch transcription of the selection or the folder."""
+        paths = self.selected_files()
+        if not paths and self.recordings_folder and os.path.isdir(self.recordings_folder):
+            paths = [self.recordings_folder]
+        if paths:
+            self.transcribe_requested.emit(paths)
+    
     def _filter_tree(self, text: str):
         """Filter tree items based on search text."""
         search_lower = text.lower()
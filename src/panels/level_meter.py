@@ -0,0 +1,87 @@
+"""
+MacroVox Level Meter
+Live input level bar and spectrum bands for the recorder panel
+"""
+
+from typing import Optional
+
+import numpy as np
+from PySide6.QtCore import QRectF, Qt
+from PySide6.QtGui import QColor, QPainter, QPalette
+from PySide6.QtWidgets import QSizePolicy, QWidget
+
+from ..audio import LEVEL_FLOOR_DB
+
+# Peaks above this are drawn in the warning colour
+CLIP_WARNING_DB = -3.0
+WARNING_COLOR = QColor("#ff6b35")
+
+
+class LevelMeter(QWidget):
+    """
+    Paints the frames produced by LevelAnalyzer.
+
+    set_frame only stores the array and schedules a repaint, so frames
+    arriving faster than the screen refreshes are coalesced by Qt. The
+    accent colour comes from the theme (QWidget#levelMeter { color: ... }).
+    """
+
+    def __init__(self, parent=None, floor_db: float = -60.0):
+        super().__init__(parent)
+        self.setObjectName("levelMeter")
+        self.floor_db = floor_db
+        self._frame: Optional[np.ndarray] = None
+        self.setMinimumHeight(48)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+
+    def set_frame(self, frame: np.ndarray):
+        """Show a [rms_db, peak_db, band dB...] frame."""
+        self._frame = frame
+        self.update()
+
+    def clear(self):
+        """Drop back to silence."""
+        self._frame = None
+        self.update()
+
+    def _fraction(self, db) -> np.ndarray:
+        """Map dBFS onto 0..1 of the meter height/width."""
+        return np.clip((np.asarray(db) - self.floor_db) / -self.floor_db, 0.0, 1.0)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing, False)
+        painter.setPen(Qt.NoPen)
+
+        accent = self.palette().color(QPalette.WindowText)
+        track = QColor(accent)
+        track.setAlpha(40)
+
+        width = self.width()
+        height = self.height()
+        bar_height = 6
+        spectrum_height = height - bar_height - 4
+
+        frame = self._frame
+        if frame is None or len(frame) < 2:
+            frame = np.full(2, LEVEL_FLOOR_DB, dtype=np.float32)
+
+        # Spectrum: one column per band
+        bands = frame[2:]
+        if len(bands):
+            slot = width / len(bands)
+            fractions = self._fraction(bands)
+            for i, fraction in enumerate(fractions):
+                x = i * slot + 1
+                painter.fillRect(QRectF(x, 0, slot - 2, spectrum_height), track)
+                h = fraction * spectrum_height
+                painter.fillRect(QRectF(x, spectrum_height - h, slot - 2, h), accent)
+
+        # Level: RMS bar with a peak tick
+        y = height - bar_height
+        rms, peak = self._fraction(frame[:2])
+        painter.fillRect(QRectF(0, y, width, bar_height), track)
+        painter.fillRect(QRectF(0, y, rms * width, bar_height), accent)
+        peak_color = WARNING_COLOR if frame[1] > CLIP_WARNING_DB else accent
+        painter.fillRect(QRectF(max(0.0, peak * width - 2), y, 2, bar_height), peak_color)
+        painter.end()
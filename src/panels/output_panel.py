@@ -26,6 +26,7 @@ class OutputPanel(QFrame):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setObjectName("outputPanel")
+        self._partial_chars = 0  # Length of the interim text at the end, if any
         self._setup_ui()
         
     def _setup_ui(self):
@@ -96,16 +97,25 @@ class OutputPanel(QFrame):
         # Emit signal
         self.text_changed.emit(text)
         
-    def append_text(self, text: str):
-        """Append text to the output (for streaming transcription)."""
+    def append_text(self, text: str, partial: bool = False):
+        """
+        Append text to the output (for streaming transcription).
+        
+        Partial (interim) text is replaced by whatever is appended next, so
+        a live segment can be revised in place until its final text lands.
+        """
         cursor = self.text_edit.textCursor()
         cursor.movePosition(QTextCursor.End)
+        if self._partial_chars:
+            cursor.movePosition(QTextCursor.Left, QTextCursor.KeepAnchor, self._partial_chars)
         cursor.insertText(text)
+        self._partial_chars = len(text) if partial else 0
         self.text_edit.setTextCursor(cursor)
         self.text_edit.ensureCursorVisible()
         
     def set_text(self, text: str):
         """Replace all text in the output."""
+        self._partial_chars = 0
         self.text_edit.setPlainText(text)
         
     def get_text(self) -> str:
@@ -114,6 +124,7 @@ class OutputPanel(QFrame):
         
     def clear(self):
         """Clear all text."""
+        self._partial_chars = 0
         self.text_edit.clear()
         
     def copy_all(self):
@@ -4,16 +4,44 @@ Voice Memo Recorder - Core recording logic
 
 import json
 import os
-import queue
 import threading
+import time
+from contextlib import ExitStack
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 import numpy as np
-import sounddevice as sd
 import soundfile as sf
 
+try:
+    import sounddevice as sd
+    HAS_SOUNDDEVICE = True
+except OSError:
+    # PortAudio missing (e.g. headless CI); only injected streams will work
+    sd = None
+    HAS_SOUNDDEVICE = False
+
+from .audio import (
+    CaptureMetrics,
+    ChunkedWriter,
+    DEVICE_WAIT_SECONDS,
+    PeakSummaryBuilder,
+    device_registry,
+    LiveAudioFeed,
+    MultiDeviceCapture,
+    RingBuffer,
+    SegmentedSink,
+    SharedRingBuffer,
+    SilenceMonitor,
+    SilenceTrimmer,
+    TranscriptionProxy,
+    recover_orphaned_segments,
+    remove_orphaned_proxies,
+    peaks_path_for,
+    stitch_segments,
+)
+
 
 class VoiceRecorder:
     """Handles audio recording from a selected microphone."""
@@ -25,14 +53,34 @@ class VoiceRecorder:
         "ogg": {"subtype": "VORBIS", "extension": "ogg"},
     }
 
-    def __init__(self, config: dict = None):
+    def __init__(self, config: dict = None, stream_factory=None):
         self.config = config or self._default_config()
+        # Builds input streams; swap in a fake device to run without hardware
+        self.stream_factory = stream_factory or self._default_stream_factory
+        self.on_chunk_written = None  # Called with total frames on disk after each write
+        self.on_auto_stop = None  # Called from the writer thread when silence runs long
+        self.on_finalized = None  # Called from the writer thread once a file is complete
+        self.on_error = None  # Called with a message if writing a recording fails
         self.is_recording = False
-        self.audio_queue: queue.Queue = queue.Queue()
+        self.ring_buffer: Optional[RingBuffer] = None
+        self.write_count = 0
+        self.metrics = CaptureMetrics()
+        self.on_segment_finished = None  # Called with each finished segment path
         self.recording_thread: Optional[threading.Thread] = None
         self.current_file: Optional[str] = None
         self._stop_event = threading.Event()
+        self._finalizing: dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
         self.stream = None
+        self._multi_capture: Optional[MultiDeviceCapture] = None
+        # Optional mono copy of the input for levels in another process
+        self.monitor: Optional[SharedRingBuffer] = None
+        # Second consumer of capture blocks for live transcription
+        self._live_feed: Optional[LiveAudioFeed] = None
+        self.is_armed = False
+        self._preroll: Optional[RingBuffer] = None
+        self._capturing = False
+        self._preroll_pending = False
 
     def _default_config(self) -> dict:
         return {
@@ -43,25 +91,72 @@ class VoiceRecorder:
             "device": None,  # None = default device
             "filename_template": "{timestamp}_{label}",
             "timestamp_format": "%Y%m%d_%H%M%S",
+            "buffer_seconds": 10,
+            "write_chunk_seconds": 1.0,
+            "segment_seconds": 0,  # 0 = single file
+            "segment_mb": 0,
+            "armed": False,  # Keep a warm input stream between recordings
+            "pre_roll_seconds": 3.0,
+            "deferred_encode": False,  # Capture WAV, encode flac/ogg after stop
+            "encode_workers": 0,  # 0 = half the CPU cores
+            "capture_dtype": "float32",  # "int16" = raw PCM, no float conversion
+            "metrics_sidecar": True,  # Write <name>.metrics.json per recording
+            "peaks_sidecar": True,  # Write <name>.peaks waveform summary
+            "silence_trim": "off",  # "mark" or "drop" long pauses
+            "silence_threshold_db": -45.0,
+            "silence_min_seconds": 1.0,
+            "silence_hangover_seconds": 0.3,
+            "auto_stop_seconds": 0,  # Stop after this much silence; 0 = never
+            "transcription_proxy": True,  # Write <name>.proxy.flac for upload
+            "proxy_sample_rate": 16000,
+            "multi_devices": [],  # Two or more device ids recorded together
+            "multi_layout": "channels",  # or "files": one file per device
+            "multi_max_skew_seconds": 0.5,  # Pad a lagging device after this
+            "capture_process": False,  # Run capture in a child process (RecorderProcess)
+            "live_transcription": False,  # Stream audio for transcription while recording
+            "live_transcription_url": "",  # "" = DeepGram; ws:// URL of a compatible server
+            "live_buffer_seconds": 30.0,  # Audio held while the connection lags
         }
 
     def update_config(self, **kwargs):
         """Update configuration settings."""
         self.config.update(kwargs)
+        # Reopen a warm stream so it picks up the new device and rate
+        if self.is_armed and not self.is_recording:
+            self.disarm()
+            self.arm()
 
     @staticmethod
     def get_input_devices() -> list[dict]:
-        """Get list of available input devices."""
-        devices = []
-        for i, dev in enumerate(sd.query_devices()):
-            if dev["max_input_channels"] > 0:
-                devices.append({
-                    "id": i,
-                    "name": dev["name"],
-                    "channels": dev["max_input_channels"],
-                    "sample_rate": dev["default_samplerate"],
-                })
-        return devices
+        """Get list of available input devices (served from the device cache)."""
+        return device_registry.get_devices()
+
+    def _resolve_stream_settings(self):
+        """
+        Fit rate and channels to what the device(s) support, using the cache.
+
+        A hotplug rescan can take a while (or hang in PortAudio), so this
+        waits at most DEVICE_WAIT_SECONDS and then uses the last device list.
+        """
+        if self.stream_factory is not self._default_stream_factory:
+            return
+        ids = self.config["multi_devices"] if self.is_multi_device else [self.config.get("device")]
+        devices = [dev for dev in (device_registry.get_device(i, DEVICE_WAIT_SECONDS) for i in ids) if dev]
+        if not devices:
+            return
+        self.config["channels"] = min([self.config["channels"]] + [dev["channels"] for dev in devices])
+        if any(self.config["sample_rate"] not in dev["supported_rates"] for dev in devices):
+            self.config["sample_rate"] = int(devices[0]["sample_rate"])
+
+    @property
+    def is_stream_open(self) -> bool:
+        """Whether any input stream (warm, recording or multi-device) is open."""
+        return self.stream is not None or self._multi_capture is not None
+
+    @property
+    def is_multi_device(self) -> bool:
+        """Whether recordings capture several devices at once."""
+        return len(self.config.get("multi_devices") or []) >= 2
 
     @staticmethod
     def get_supported_formats() -> list[str]:
@@ -80,7 +175,7 @@ class VoiceRecorder:
         label = label.strip() if label else "memo"
         label = "".join(c if c.isalnum() or c in "-_" else "_" for c in label)
         
-        fmt = self.config.get("format", "wav")
+        fmt = "wav" if self.is_deferred_encode else self.config.get("format", "wav")
         filename = self.config["filename_template"].format(
             timestamp=timestamp, label=label
         )
@@ -88,76 +183,456 @@ class VoiceRecorder:
 
     def _audio_callback(self, indata, frames, time_info, status):
         """Callback for sounddevice to capture audio."""
+        if self.monitor is not None:
+            self._write_monitor(indata)
+        if not self._capturing:
+            self._preroll.write_latest(indata)
+            return
+        start = time.perf_counter()
         if status:
-            print(f"Audio status: {status}")
-        self.audio_queue.put(indata.copy())
+            self.metrics.record_status(status)
+        live_feed = self._live_feed
+        if self._preroll_pending:
+            # First block after REC: the seconds before the click go first,
+            # to the live transcription as well as the file
+            if live_feed is None:
+                self._preroll.transfer_to(self.ring_buffer)
+            else:
+                self._preroll.transfer_to(self.ring_buffer, live_feed.ring)
+            self._preroll_pending = False
+        self.ring_buffer.write(indata)
+        if live_feed is not None:
+            live_feed.write(indata)
+        self.metrics.record_callback(time.perf_counter() - start)
+
+    def _write_monitor(self, indata):
+        """Copy a callback block to the shared monitor ring."""
+        if not isinstance(indata, np.ndarray):
+            indata = np.frombuffer(indata, dtype=np.int16).reshape(-1, self.config["channels"])
+        self.monitor.write(indata)
 
-    def _recording_worker(self, filepath: str):
-        """Worker thread that writes audio data to file."""
-        fmt = self.config.get("format", "wav").upper()
+    @staticmethod
+    def _soundfile_format(fmt: str) -> str:
+        """Map a format setting to a libsndfile major format."""
+        fmt = fmt.upper()
         if fmt == "OGG":
-            fmt = "OGG"
+            return "OGG"
         elif fmt == "FLAC":
-            fmt = "FLAC"
+            return "FLAC"
+        return "WAV"
+
+    @property
+    def is_deferred_encode(self) -> bool:
+        """Whether flac/ogg are encoded after stop instead of while capturing."""
+        return bool(self.config.get("deferred_encode")) and self.config.get("format", "wav") != "wav"
+
+    def encode_job(self, capture_path: str) -> tuple[str, str, Optional[str]]:
+        """
+        Describe how a deferred capture should be encoded.
+
+        Returns:
+            (target path, libsndfile format, libsndfile subtype)
+        """
+        fmt = self.config.get("format", "wav")
+        target = Path(capture_path).with_suffix(f".{fmt}")
+        subtype = self.SUPPORTED_FORMATS.get(fmt, {}).get("subtype")
+        return str(target), self._soundfile_format(fmt), subtype
+
+    def _recording_worker(self, filepath: str, write: Callable, *args):
+        """
+        Worker thread that writes audio data to file, then finalizes it.
+
+        write(filepath, *args) does the work. Everything it needs is passed
+        in, so a new recording can start while this one is still flushing,
+        stitching or writing sidecars.
+        """
+        try:
+            write(filepath, *args)
+        except Exception as e:
+            with self._lock:
+                self._finalizing.pop(filepath, None)
+            if self.on_error:
+                self.on_error(f"Recording failed for {Path(filepath).name}: {e}")
+            return
+
+        with self._lock:
+            self._finalizing.pop(filepath, None)
+        if self.on_finalized:
+            self.on_finalized(filepath)
+
+    def _write_recording(
+        self,
+        filepath: str,
+        ring: RingBuffer,
+        stop_event: threading.Event,
+        metrics: CaptureMetrics,
+        config: dict,
+    ):
+        """Drain the ring into the file until stopped, then write sidecars."""
+        fmt = self._soundfile_format(Path(filepath).suffix.lstrip("."))
+
+        segments = None
+        if config.get("segment_seconds") or config.get("segment_mb"):
+            sink = segments = SegmentedSink(
+                filepath,
+                samplerate=config["sample_rate"],
+                channels=config["channels"],
+                format=fmt,
+                segment_seconds=config.get("segment_seconds", 0),
+                segment_mb=config.get("segment_mb", 0),
+                on_segment_finished=self.on_segment_finished,
+            )
         else:
-            fmt = "WAV"
+            sink = sf.SoundFile(
+                filepath,
+                mode="w",
+                samplerate=config["sample_rate"],
+                channels=config["channels"],
+                format=fmt,
+            )
+
+        taps = []
+        peaks = None
+        if config.get("peaks_sidecar", True):
+            peaks = PeakSummaryBuilder(config["sample_rate"])
+
+        trimmer = None
+        trim_mode = config.get("silence_trim", "off")
+        if trim_mode in ("mark", "drop"):
+            sink = trimmer = SilenceTrimmer(
+                sink,
+                config["sample_rate"],
+                threshold_db=config.get("silence_threshold_db", -45.0),
+                min_silence=config.get("silence_min_seconds", 1.0),
+                hangover=config.get("silence_hangover_seconds", 0.3),
+                drop=trim_mode == "drop",
+            )
+
+        auto_stop = config.get("auto_stop_seconds", 0)
+        if auto_stop and self.on_auto_stop:
+            monitor = SilenceMonitor(
+                config["sample_rate"],
+                auto_stop,
+                self.on_auto_stop,
+                threshold_db=config.get("silence_threshold_db", -45.0),
+            )
+            taps.append(monitor.process)
 
-        with sf.SoundFile(
-            filepath,
-            mode="w",
+        proxy = None
+        if config.get("transcription_proxy", True):
+            proxy = TranscriptionProxy(
+                filepath, config["sample_rate"], config.get("proxy_sample_rate", 16000)
+            )
+
+        # Peaks and proxy must describe what lands on disk, which trimming shortens
+        for tap in (peaks, proxy):
+            if tap is None:
+                continue
+            if trimmer and trimmer.drop:
+                trimmer.listeners.append(tap.process)
+            else:
+                taps.append(tap.process)
+
+        try:
+            self._drain_until_stopped(sink, ring, stop_event, metrics, config, taps)
+        except BaseException:
+            if proxy:
+                proxy.discard()
+            raise
+        if proxy:
+            proxy.close()
+
+        if segments:
+            stitch_segments(segments.directory)
+
+        if config.get("metrics_sidecar", True):
+            metrics.write_sidecar(filepath)
+        if peaks:
+            peaks.write(peaks_path_for(filepath))
+        if trimmer:
+            trimmer.write_timeline(filepath)
+
+    def _drain_until_stopped(
+        self,
+        sink,
+        ring: RingBuffer,
+        stop_event: threading.Event,
+        metrics: CaptureMetrics,
+        config: dict,
+        taps: list,
+    ):
+        """Write chunks from the ring into the sink until stop is requested."""
+        with sink as f:
+            writer = ChunkedWriter(
+                f, self._chunk_frames(config), ring.channels, ring.dtype, metrics, taps,
+                on_write=self.on_chunk_written,
+            )
+            # Sleep until a full chunk is queued; stop_recording wakes us early
+            ring.set_wake_threshold(writer.chunk_frames)
+            while not stop_event.is_set():
+                ring.wait()
+                writer.drain(ring)
+            writer.drain(ring)
+            writer.flush()
+            self.write_count = writer.write_count
+
+    def _write_multi_device(self, filepath: str, capture: MultiDeviceCapture, config: dict):
+        """Write a multi-device capture until stopped, then write sidecars."""
+        fmt = self._soundfile_format(Path(filepath).suffix.lstrip("."))
+        paths = capture.output_paths(filepath)
+
+        peaks = []
+        proxies = []
+        if config.get("peaks_sidecar", True):
+            peaks = [PeakSummaryBuilder(config["sample_rate"]) for _ in paths]
+        if config.get("transcription_proxy", True):
+            proxies = [
+                TranscriptionProxy(path, config["sample_rate"], config.get("proxy_sample_rate", 16000))
+                for path in paths
+            ]
+        taps = [[] for _ in paths]
+        for builders in (peaks, proxies):
+            for file_taps, builder in zip(taps, builders):
+                file_taps.append(builder.process)
+
+        try:
+            with ExitStack() as stack:
+                sinks = [
+                    stack.enter_context(sf.SoundFile(
+                        path,
+                        mode="w",
+                        samplerate=config["sample_rate"],
+                        channels=channels,
+                        format=fmt,
+                    ))
+                    for path, channels in zip(paths, capture.output_channels)
+                ]
+                capture.run(sinks, taps, on_write=self.on_chunk_written)
+        except BaseException:
+            for proxy in proxies:
+                proxy.discard()
+            raise
+        finally:
+            capture.close()
+        for proxy in proxies:
+            proxy.close()
+
+        if config.get("metrics_sidecar", True):
+            capture.write_sidecar(filepath)
+        for builder, path in zip(peaks, paths):
+            builder.write(peaks_path_for(path))
+
+    @property
+    def is_segmented(self) -> bool:
+        """Whether recordings roll over into segment files."""
+        return bool(self.config.get("segment_seconds") or self.config.get("segment_mb"))
+
+    def _chunk_frames(self, config: Optional[dict] = None) -> int:
+        """Number of frames gathered before each file write."""
+        config = config or self.config
+        seconds = config.get("write_chunk_seconds", 1.0)
+        return max(1, int(config["sample_rate"] * seconds))
+
+    @property
+    def is_raw_capture(self) -> bool:
+        """Whether capture uses a RawInputStream delivering int16 bytes."""
+        return self.config.get("capture_dtype", "float32") == "int16"
+
+    def _sample_dtype(self):
+        """NumPy dtype of captured samples."""
+        return np.int16 if self.is_raw_capture else np.float32
+
+    @staticmethod
+    def _default_stream_factory(raw: bool, **kwargs):
+        """Create a sounddevice stream; raw streams deliver bytes, not arrays."""
+        if not HAS_SOUNDDEVICE:
+            raise RuntimeError("sounddevice/PortAudio not available")
+        stream_class = sd.RawInputStream if raw else sd.InputStream
+        return stream_class(**kwargs)
+
+    def _open_stream(self):
+        """Open and start the input stream for the selected device."""
+        # Raw int16 bytes go straight into the ring and on to libsndfile
+        self.stream = self.stream_factory(
+            raw=self.is_raw_capture,
+            device=self.config.get("device"),
             samplerate=self.config["sample_rate"],
             channels=self.config["channels"],
-            format=fmt,
-        ) as f:
-            while not self._stop_event.is_set() or not self.audio_queue.empty():
-                try:
-                    data = self.audio_queue.get(timeout=0.1)
-                    f.write(data)
-                except queue.Empty:
-                    continue
+            dtype="int16" if self.is_raw_capture else "float32",
+            callback=self._audio_callback,
+        )
+        self.stream.start()
+
+    def _close_stream(self):
+        """Stop and close the input stream."""
+        if self.stream:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+
+    def arm(self):
+        """
+        Keep a warm input stream feeding a bounded pre-roll ring.
+
+        While armed, REC starts without waiting for the device to open and
+        the last pre_roll_seconds of audio are prepended to the recording.
+        """
+        if self.is_armed or self.is_multi_device or self.is_recording:
+            # The warm stream only covers single-device capture, and a take
+            # in progress already owns the stream
+            return
+
+        self._resolve_stream_settings()
+        preroll_frames = int(self.config["sample_rate"] * self.config.get("pre_roll_seconds", 3.0))
+        self._preroll = RingBuffer(
+            max(1, preroll_frames), self.config["channels"], self._sample_dtype()
+        )
+        self._preroll_pending = False
+        self._capturing = False
+        self._open_stream()
+        self.is_armed = True
+
+    def disarm(self):
+        """Close the warm input stream (stops any recording in progress)."""
+        if not self.is_armed:
+            return
+        if self.is_recording:
+            self.stop_recording()
+        self._close_stream()
+        self.is_armed = False
+        self._preroll = None
 
     def start_recording(self, label: str = "") -> str:
         """Start recording audio. Returns the filepath."""
         if self.is_recording:
             return self.current_file
 
-        self._stop_event.clear()
-        self.audio_queue = queue.Queue()
+        if not self.is_armed:
+            self._resolve_stream_settings()
+        # Fresh per-recording state; the previous writer may still be finalizing
+        self._stop_event = threading.Event()
+        # Leave room for the writer to be a full chunk behind the callback,
+        # plus the pre-roll that is dumped in all at once
+        preroll = self._preroll.capacity if self.is_armed else 0
+        capacity = max(
+            int(self.config["sample_rate"] * self.config.get("buffer_seconds", 10)),
+            2 * self._chunk_frames() + preroll,
+        )
+        self.ring_buffer = RingBuffer(capacity, self.config["channels"], self._sample_dtype())
+        self.metrics = CaptureMetrics()
+        self.metrics.ring_buffer = self.ring_buffer
 
         output_folder = self._get_output_folder()
         filename = self._generate_filename(label)
         self.current_file = str(output_folder / filename)
 
+        if self.is_multi_device:
+            return self._start_multi_device()
+
         # Start recording thread
         self.recording_thread = threading.Thread(
-            target=self._recording_worker, args=(self.current_file,)
+            target=self._recording_worker,
+            args=(
+                self.current_file,
+                self._write_recording,
+                self.ring_buffer,
+                self._stop_event,
+                self.metrics,
+                dict(self.config),
+            ),
         )
+        with self._lock:
+            self._finalizing[self.current_file] = self.recording_thread
         self.recording_thread.start()
 
-        # Start audio stream with selected device
-        device = self.config.get("device")
-        self.stream = sd.InputStream(
-            device=device,
-            samplerate=self.config["sample_rate"],
-            channels=self.config["channels"],
-            callback=self._audio_callback,
+        if self.is_armed:
+            # The warm stream is already running; hand over on its next block
+            self._preroll_pending = True
+            self._capturing = True
+        else:
+            self._capturing = True
+            self._open_stream()
+        self.is_recording = True
+
+        return self.current_file
+
+    def _start_multi_device(self) -> str:
+        """Open every configured device and start the aligned writer."""
+        config = dict(self.config)
+        capture = MultiDeviceCapture(
+            config["multi_devices"],
+            config["sample_rate"],
+            config["channels"],
+            self._sample_dtype(),
+            layout=config.get("multi_layout", "channels"),
+            buffer_seconds=config.get("buffer_seconds", 10),
+            chunk_frames=self._chunk_frames(config),
+            max_skew_seconds=config.get("multi_max_skew_seconds", 0.5),
         )
-        self.stream.start()
+        capture.open(self.stream_factory)
+        # The UI reads the reference device's counters
+        self.metrics = capture.reference.metrics
+        self.ring_buffer = capture.reference.ring
+        self._multi_capture = capture
+
+        self.recording_thread = threading.Thread(
+            target=self._recording_worker,
+            args=(self.current_file, self._write_multi_device, capture, config),
+        )
+        with self._lock:
+            self._finalizing[self.current_file] = self.recording_thread
+        self.recording_thread.start()
         self.is_recording = True
 
         return self.current_file
 
+    def create_live_feed(self) -> LiveAudioFeed:
+        """
+        Tap the next recording for live transcription.
+
+        Call before start_recording. The feed receives every capture block
+        until stop_recording, which closes it.
+        """
+        if self.is_multi_device:
+            raise RuntimeError("Live transcription needs a single input device")
+        if not self.is_armed:
+            self._resolve_stream_settings()
+        self._live_feed = LiveAudioFeed(
+            self.config["sample_rate"],
+            self.config["channels"],
+            self._sample_dtype(),
+            buffer_seconds=self.config.get("live_buffer_seconds", 30.0),
+        )
+        return self._live_feed
+
     def stop_recording(self) -> Optional[str]:
-        """Stop recording and return the filepath."""
+        """
+        Stop capturing and return the filepath without waiting for the file.
+
+        The writer thread flushes the tail, stitches segments and writes
+        sidecars in the background, then calls on_finalized with the path.
+        Do not read the file before that.
+        """
         if not self.is_recording:
             return None
 
-        self.stream.stop()
-        self.stream.close()
+        if self._multi_capture:
+            self._multi_capture.stop()
+            self._multi_capture = None
+        else:
+            if self.is_armed:
+                # Keep the stream warm; the callback goes back to filling pre-roll
+                self._capturing = False
+            else:
+                self._close_stream()
+                self._capturing = False
+
+            self._stop_event.set()
+            self.ring_buffer.wake()
 
-        self._stop_event.set()
-        if self.recording_thread:
-            self.recording_thread.join(timeout=2.0)
+        if self._live_feed is not None:
+            self._live_feed.close()
+            self._live_feed = None
 
         self.is_recording = False
         filepath = self.current_file
@@ -165,6 +640,73 @@ class VoiceRecorder:
 
         return filepath
 
+    @property
+    def is_finalizing(self) -> bool:
+        """Whether any stopped recording is still being written out."""
+        with self._lock:
+            return bool(self._finalizing)
+
+    def wait_finalized(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every stopped recording is complete (e.g. on shutdown).
+
+        Returns:
+            True if all writers finished within the timeout.
+        """
+        with self._lock:
+            threads = list(self._finalizing.values())
+        for thread in threads:
+            thread.join(timeout)
+        return not self.is_finalizing
+
+    def close(self):
+        """Stop any recording and release the input stream."""
+        if self.is_recording:
+            self.stop_recording()
+        self.disarm()
+
+    @property
+    def sample_rate(self) -> int:
+        """Rate of the audio returned by peek_latest."""
+        return int(self.config["sample_rate"])
+
+    def peek_latest(self, frames: int) -> np.ndarray:
+        """
+        Copy the newest captured audio as mono float32 for levels/previews.
+
+        Reads the recording ring, or the pre-roll ring while only armed,
+        without consuming anything. Empty when no stream is capturing.
+        """
+        if self.is_recording:
+            ring = self.ring_buffer
+        elif self.is_armed:
+            ring = self._preroll
+        else:
+            ring = None
+        if ring is None:
+            return np.zeros(0, dtype=np.float32)
+        block = ring.peek_latest(frames)
+        samples = block.mean(axis=1) if block.shape[1] > 1 else block[:, 0]
+        if samples.dtype == np.int16:
+            return samples * np.float32(1.0 / 32768.0)
+        return samples.astype(np.float32, copy=False)
+
+    @property
+    def high_water_mark(self) -> int:
+        """Most frames ever queued between the callback and the writer."""
+        return self.ring_buffer.high_water_mark if self.ring_buffer else 0
+
+    @property
+    def overrun_count(self) -> int:
+        """Number of capture blocks dropped because the writer fell behind."""
+        return self.ring_buffer.overrun_count if self.ring_buffer else 0
+
+    def recover_segments(self) -> list[str]:
+        """Stitch segments orphaned by a crash. Returns recovered file paths."""
+        folder = self._get_output_folder()
+        remove_orphaned_proxies(folder)
+        return recover_orphaned_segments(folder)
+
     def get_output_folder(self) -> str:
         """Return the output folder path."""
         return str(self._get_output_folder())
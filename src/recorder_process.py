@@ -0,0 +1,338 @@
+"""
+MacroVox Recorder Process
+Runs VoiceRecorder capture and writing in a separate process
+"""
+
+import multiprocessing
+import queue
+import threading
+import time
+from typing import Optional
+
+from .audio import CaptureMetrics, LiveAudioFeed, SharedRingBuffer, device_registry
+from .recorder import VoiceRecorder
+
+# How often the capture process reports metrics while recording
+METRICS_INTERVAL = 0.5
+# How often a live feed is topped up from the monitor ring
+LIVE_PUMP_INTERVAL = 0.02
+
+
+def _serve(conn, config: dict, monitor_name: str, stream_factory=None):
+    """
+    Capture process main loop.
+
+    Commands arrive as (seq, name, args) tuples and each gets a ("reply",
+    seq, (ok, value)) answer. Recorder callbacks and metrics go back unprompted as
+    ("event", name, value). Writer threads send too, so sends are locked.
+    """
+    recorder = VoiceRecorder(config, stream_factory)
+    monitor = SharedRingBuffer.attach(monitor_name)
+    monitor.sample_rate = recorder.config["sample_rate"]
+    recorder.monitor = monitor
+    device_registry.set_reinitialize_guard(lambda: not recorder.is_stream_open)
+
+    send_lock = threading.Lock()
+
+    def send(*message):
+        with send_lock:
+            conn.send(message)
+
+    recorder.on_finalized = lambda path: send("event", "finalized", path)
+    recorder.on_error = lambda message: send("event", "error", message)
+    recorder.on_auto_stop = lambda: send("event", "auto_stop", None)
+
+    def start(label):
+        path = recorder.start_recording(label)
+        monitor.sample_rate = recorder.config["sample_rate"]
+        return path
+
+    def arm():
+        recorder.arm()
+        monitor.sample_rate = recorder.config["sample_rate"]
+        return recorder.is_armed
+
+    commands = {
+        "start": start,
+        "stop": recorder.stop_recording,
+        "config": lambda changes: recorder.update_config(**changes),
+        "arm": arm,
+        "disarm": recorder.disarm,
+        "rescan": device_registry.invalidate,
+        "wait_finalized": recorder.wait_finalized,
+        "metrics": lambda: recorder.metrics.snapshot(),
+    }
+
+    try:
+        while True:
+            if conn.poll(METRICS_INTERVAL):
+                try:
+                    seq, name, args = conn.recv()
+                except EOFError:
+                    break
+                if name == "shutdown":
+                    break
+                if name not in commands:
+                    send("reply", seq, (False, f"Unknown command: {name}"))
+                    continue
+                try:
+                    send("reply", seq, (True, commands[name](*args)))
+                except Exception as e:
+                    send("reply", seq, (False, str(e)))
+            if recorder.is_recording:
+                send("event", "metrics", recorder.metrics.snapshot())
+    finally:
+        recorder.close()
+        recorder.wait_finalized()
+        monitor.close()
+        conn.close()
+
+
+class RemoteMetrics:
+    """Latest CaptureMetrics snapshot received from the capture process."""
+
+    def __init__(self):
+        self._snapshot = CaptureMetrics().snapshot()
+
+    def update(self, snapshot: dict):
+        self._snapshot = snapshot
+
+    def snapshot(self) -> dict:
+        return self._snapshot
+
+    def summary(self) -> str:
+        return CaptureMetrics.format_summary(self._snapshot)
+
+
+class RecorderProcess:
+    """
+    Drop-in stand-in for VoiceRecorder that captures in a child process.
+
+    stream_factory, if given, must be picklable (it is sent to the child).
+
+    The audio callback and the writer thread run in their own interpreter,
+    so the Qt loop, the terminal's PTY reader and API threads in this one
+    can't hold the GIL against them. A Pipe carries start/stop/config
+    commands and brings back finalization, error, auto-stop and metrics
+    events, which fire the same on_* callbacks as VoiceRecorder (from a
+    listener thread). A mono copy of the input is published in a
+    SharedRingBuffer, exposed as monitor, for levels and previews.
+
+    Config-only helpers (output folder, encode jobs, segment recovery) are
+    answered locally.
+    """
+
+    def __init__(
+        self,
+        config: Optional[dict] = None,
+        stream_factory=None,
+        monitor_frames: int = 1 << 18,
+        command_timeout: float = 10.0,
+    ):
+        # Config-only helper; it never opens a stream in this process
+        self._local = VoiceRecorder(config)
+        self.config = self._local.config
+        self.command_timeout = command_timeout
+        self.metrics = RemoteMetrics()
+        self.monitor = SharedRingBuffer(monitor_frames)
+
+        self.on_finalized = None
+        self.on_error = None
+        self.on_auto_stop = None
+
+        self.is_recording = False
+        self.is_armed = False
+        self.current_file: Optional[str] = None
+
+        self._live_feed: Optional[LiveAudioFeed] = None
+        self._replies: queue.Queue = queue.Queue()
+        self._command_lock = threading.Lock()
+        self._seq = 0
+
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(
+            target=_serve,
+            args=(child_conn, dict(self.config), self.monitor.name, stream_factory),
+            name="macrovox-capture",
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+
+        self._listener = threading.Thread(target=self._listen, daemon=True)
+        self._listener.start()
+
+    def _listen(self):
+        """Route replies to the waiting command and events to callbacks."""
+        while True:
+            try:
+                kind, name, value = self._conn.recv()
+            except (EOFError, OSError):
+                self._replies.put((None, (False, "Capture process exited")))
+                if self.is_recording and self.on_error:
+                    self.on_error("Capture process exited during a recording")
+                self.is_recording = False
+                return
+
+            if kind == "reply":
+                self._replies.put((name, value))  # (seq, (ok, value))
+            elif name == "metrics":
+                self.metrics.update(value)
+            elif name == "finalized" and self.on_finalized:
+                self.on_finalized(value)
+            elif name == "error" and self.on_error:
+                self.on_error(value)
+            elif name == "auto_stop" and self.on_auto_stop:
+                self.on_auto_stop()
+
+    def _call(self, name: str, *args, timeout: Optional[float] = None):
+        """Run a command in the capture process and return its result."""
+        with self._command_lock:
+            if not self._process.is_alive():
+                raise RuntimeError("Capture process is not running")
+            self._seq += 1
+            self._conn.send((self._seq, name, args))
+            deadline = time.monotonic() + (timeout or self.command_timeout)
+            while True:
+                try:
+                    seq, (ok, value) = self._replies.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    raise RuntimeError(f"Capture process did not answer '{name}'")
+                # Late answers to commands that already timed out are dropped
+                if seq is None or seq == self._seq:
+                    break
+        if not ok:
+            raise RuntimeError(value)
+        return value
+
+    @staticmethod
+    def get_input_devices() -> list[dict]:
+        return VoiceRecorder.get_input_devices()
+
+    @staticmethod
+    def get_supported_formats() -> list[str]:
+        return VoiceRecorder.get_supported_formats()
+
+    def refresh_metrics(self) -> dict:
+        """Fetch the current metrics now instead of waiting for the next report."""
+        snapshot = self._call("metrics")
+        self.metrics.update(snapshot)
+        return snapshot
+
+    def update_config(self, **kwargs):
+        """Update configuration here and in the capture process."""
+        self.config.update(kwargs)
+        self._call("config", kwargs)
+
+    def start_recording(self, label: str = "") -> str:
+        """Start recording in the capture process. Returns the filepath."""
+        if self.is_recording:
+            return self.current_file
+        self.current_file = self._call("start", label)
+        self.is_recording = True
+        return self.current_file
+
+    def stop_recording(self) -> Optional[str]:
+        """Stop recording; on_finalized follows once the file is written."""
+        if not self.is_recording:
+            return None
+        self.is_recording = False
+        filepath = self._call("stop")
+        self.current_file = None
+        # A live pump copies what is left in the monitor, then closes its feed
+        self._live_feed = None
+        return filepath
+
+    def create_live_feed(self) -> LiveAudioFeed:
+        """
+        Tap the next recording for live transcription.
+
+        Capture blocks don't leave the child process, so the feed is filled
+        from the shared monitor ring by a pump thread here. It starts at the
+        monitor's current position and is closed by stop_recording.
+        """
+        feed = LiveAudioFeed(
+            self.sample_rate,
+            buffer_seconds=self.config.get("live_buffer_seconds", 30.0),
+        )
+        self._live_feed = feed
+        threading.Thread(target=self._pump_live_feed, args=(feed,), daemon=True).start()
+        return feed
+
+    def _pump_live_feed(self, feed: LiveAudioFeed):
+        """Copy new monitor audio into feed until its recording stops."""
+        pos = self.monitor.write_pos
+        while True:
+            finished = self._live_feed is not feed
+            samples, pos = self.monitor.read_since(pos, max_frames=feed.ring.capacity)
+            if len(samples):
+                feed.write(samples[:, None])
+            if finished:
+                break
+            time.sleep(LIVE_PUMP_INTERVAL)
+        feed.close()
+
+    def arm(self):
+        self.is_armed = self._call("arm")
+
+    def disarm(self):
+        self._call("disarm")
+        self.is_armed = False
+
+    def invalidate_devices(self):
+        """Make the capture process rescan devices (e.g. after a hotplug)."""
+        self._call("rescan")
+
+    def wait_finalized(self, timeout: Optional[float] = None) -> bool:
+        """Block until the capture process has finished writing its files."""
+        return self._call("wait_finalized", timeout, timeout=(timeout or 60.0) + 5.0)
+
+    @property
+    def is_stream_open(self) -> bool:
+        # Streams live in the capture process's own PortAudio instance
+        return False
+
+    @property
+    def is_deferred_encode(self) -> bool:
+        return self._local.is_deferred_encode
+
+    def encode_job(self, capture_path: str) -> tuple[str, str, Optional[str]]:
+        return self._local.encode_job(capture_path)
+
+    def recover_segments(self) -> list[str]:
+        return self._local.recover_segments()
+
+    def get_output_folder(self) -> str:
+        return self._local.get_output_folder()
+
+    @property
+    def sample_rate(self) -> int:
+        """Rate of the audio returned by peek_latest."""
+        return self.monitor.sample_rate or int(self.config["sample_rate"])
+
+    def peek_latest(self, frames: int):
+        """Copy the newest audio from the monitor ring; empty when idle."""
+        if not (self.is_recording or self.is_armed):
+            return self.monitor.peek_latest(0)
+        return self.monitor.peek_latest(frames)
+
+    @property
+    def high_water_mark(self) -> int:
+        return self.metrics.snapshot()["queue"]["high_water_mark"]
+
+    @property
+    def overrun_count(self) -> int:
+        return self.metrics.snapshot()["queue"]["overrun_count"]
+
+    def close(self, timeout: float = 30.0):
+        """Finish any recording, stop the capture process and free the ring."""
+        if self._process.is_alive():
+            with self._command_lock:
+                self._conn.send((0, "shutdown", ()))
+            self._process.join(timeout)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join()
+        self._conn.close()
+        self.monitor.close()
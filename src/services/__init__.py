@@ -6,6 +6,8 @@ Backend services for terminal execution, speech-to-text, and LLM integration
 from .command_executor import CommandExecutor
 from .deepgram_service import DeepgramService
 from .claude_service import ClaudeService
+from .encoder_service import EncoderService
+from .job_service import JobService
 from .api_keys import (
     get_api_key,
     set_api_key,
@@ -19,6 +21,8 @@ __all__ = [
     "CommandExecutor",
     "DeepgramService",
     "ClaudeService",
+    "EncoderService",
+    "JobService",
     "get_api_key",
     "set_api_key",
     "delete_api_key",
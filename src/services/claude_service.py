@@ -11,6 +11,7 @@ from PySide6.QtCore import QObject, Signal
 
 import anthropic
 
+from ..transcription import PermanentJobError
 from .api_keys import get_api_key, ANTHROPIC_KEY
 
 
@@ -176,6 +177,27 @@ class ClaudeService(QObject):
         if not client:
             return
         
+        try:
+            self._interpret(client, transcript, working_dir, recent_commands)
+        except Exception as e:
+            self.error_occurred.emit(f"Claude API error: {e}")
+    
+    def run_interpret_job(self, payload: dict):
+        """
+        Job queue handler: interpret payload["transcript"], raising on failure.
+        
+        Errors propagate so the queue can retry later; a missing API key
+        is permanent.
+        """
+        client = self._get_client()
+        if not client:
+            raise PermanentJobError("Anthropic API key not configured")
+        self._interpret(client, payload["transcript"], payload.get("working_dir"), payload.get("recent_commands"))
+    
+    def _interpret(
+        self, client: anthropic.Anthropic, transcript: str, working_dir: str = None, recent_commands: list = None
+    ):
+        """Send a transcript to Claude and emit the outcome; API errors are raised."""
         # Build context message
         context_parts = []
         if working_dir:
@@ -187,21 +209,17 @@ class ClaudeService(QObject):
         
         user_message = f"{context}\n\nUser voice command: {transcript}" if context else f"User voice command: {transcript}"
         
-        try:
-            response = client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=1024,
-                system=SYSTEM_PROMPT,
-                tools=TOOLS,
-                messages=[
-                    {"role": "user", "content": user_message}
-                ]
-            )
-            
-            self._handle_response(response)
-            
-        except Exception as e:
-            self.error_occurred.emit(f"Claude API error: {e}")
+        response = client.messages.create(
+            model="claude-sonnet-4-20250514",
+            max_tokens=1024,
+            system=SYSTEM_PROMPT,
+            tools=TOOLS,
+            messages=[
+                {"role": "user", "content": user_message}
+            ]
+        )
+        
+        self._handle_response(response)
     
     def _handle_response(self, response):
         """Handle Claude's response and emit appropriate signals."""
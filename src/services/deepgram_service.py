@@ -11,23 +11,62 @@ from PySide6.QtCore import QObject, Signal
 
 from deepgram import DeepgramClient
 
+from ..audio.live_feed import LiveAudioFeed
+from ..audio.proxy import transcription_source
+from ..transcription import (
+    DEEPGRAM_LISTEN_URL,
+    BatchTranscriber,
+    ChunkedTranscriber,
+    LiveTranscriptionSession,
+    UPLOAD_SAMPLE_RATE,
+    PermanentJobError,
+    Transcript,
+    TranscriptCache,
+    is_transcribed,
+    read_transcript,
+    request_transcription,
+    write_transcript,
+)
 from .api_keys import get_api_key, DEEPGRAM_KEY
 
+# Request options for file transcription; part of every cache key
+TRANSCRIBE_OPTIONS = {
+    "model": "nova-2",
+    "smart_format": True,
+    "punctuate": True,
+    "paragraphs": True,
+}
+
 
 class DeepgramService(QObject):
     """
-    DeepGram transcription service supporting file transcription.
+    DeepGram transcription service supporting file and live transcription.
     
     Signals:
         transcript_received: Emits final transcript text
+        transcript_ready: Emits the Transcript (word timings, paragraphs) of a file
         partial_transcript: Emits interim/partial transcript (live mode)
+        final_segment: Emits settled text of one live segment (may be empty)
+        live_finished: Emits (feed, Transcript) when a live session ends; the
+            Transcript is None unless it completed cleanly with text
+        chunk_progress: Emits (done, total) as chunks of a long file finish
+        batch_progress: Emits a progress snapshot as each file of a batch finishes
+        batch_file_done: Emits (path, error) per batch file; error is "" on success
+        batch_finished: Emits the final progress snapshot of a batch
         transcription_started: Emits when transcription begins
         transcription_finished: Emits when transcription completes
         error_occurred: Emits error messages
     """
     
     transcript_received = Signal(str)      # Final transcript
+    transcript_ready = Signal(object)      # Structured Transcript of a file
     partial_transcript = Signal(str)       # Interim results (live)
+    final_segment = Signal(str)            # Settled live segment
+    live_finished = Signal(object, object) # Live feed, Transcript or None
+    chunk_progress = Signal(int, int)      # Chunked long-file progress
+    batch_progress = Signal(dict)          # Batch counts and throughput
+    batch_file_done = Signal(str, str)     # Batch file path, error
+    batch_finished = Signal(dict)
     transcription_started = Signal()
     transcription_finished = Signal()
     error_occurred = Signal(str)
@@ -36,6 +75,17 @@ class DeepgramService(QObject):
         super().__init__(parent)
         self._client: Optional[DeepgramClient] = None
         self._is_streaming = False
+        self._session: Optional[LiveTranscriptionSession] = None
+        # Files longer than chunk_seconds are cut at pauses and sent in parallel
+        self.chunk_seconds = 300.0
+        self.chunk_workers = 8
+        # Results of earlier uploads, keyed by audio content and options
+        self.cache: Optional[TranscriptCache] = None
+        # Concurrent uploads when transcribing existing files in bulk
+        self.batch_workers = 4
+        # Uncompressed or high-rate files are transcoded before upload ("" = send as is)
+        self.upload_codec = "flac"
+        self._batch: Optional[BatchTranscriber] = None
         
     @property
     def is_configured(self) -> bool:
@@ -63,50 +113,80 @@ class DeepgramService(QObject):
                 
         return self._client
     
-    def transcribe_file(self, file_path: str | Path) -> Optional[str]:
+    def configure_chunking(self, chunk_seconds: float, max_workers: int):
+        """Set the chunk length (0 = never split) and parallel request limit."""
+        self.chunk_seconds = float(chunk_seconds)
+        self.chunk_workers = max(1, int(max_workers))
+    
+    def configure_batch(self, max_workers: int):
+        """Set how many files a batch transcribes at once."""
+        self.batch_workers = max(1, int(max_workers))
+    
+    def configure_upload(self, codec: str):
+        """Transcode uploads to "flac" or "opus" 16 kHz mono, or "" to send files as they are."""
+        self.upload_codec = codec
+    
+    def configure_cache(self, path: Optional[str | Path], max_mb: float):
+        """Use a transcript cache at path (None disables caching)."""
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+        if path:
+            try:
+                self.cache = TranscriptCache(path, int(max_mb * 1024 * 1024))
+            except Exception as e:
+                self.error_occurred.emit(f"Transcript cache unavailable: {e}")
+    
+    def _request(self, client: DeepgramClient, file_path: Path) -> dict:
+        """Upload one file, streaming the body from disk or a transcoder."""
+        # Memory stays flat however long the recording
+        return request_transcription(client, file_path, TRANSCRIBE_OPTIONS, self.upload_codec, UPLOAD_SAMPLE_RATE)
+    
+    def _transcribe(self, client: DeepgramClient, file_path: Path, chunked: bool = True) -> Transcript:
+        """Transcript of a whole file, sent in chunks if it is long."""
+        if not chunked:
+            return Transcript.from_result(self._request(client, file_path))
+        chunker = ChunkedTranscriber(
+            lambda chunk: self._request(client, chunk),
+            chunk_seconds=self.chunk_seconds,
+            max_workers=self.chunk_workers,
+            on_progress=self.chunk_progress.emit,
+        )
+        if chunker.should_split(file_path):
+            # Long recordings go up as parallel chunks cut at pauses
+            return chunker.transcribe(file_path)
+        return Transcript.from_result(self._request(client, file_path))
+    
+    def transcribe_file(self, file_path: str | Path, prefer_proxy: bool = True) -> Optional[str]:
         """
         Transcribe an audio file.
         
+        A file whose content was transcribed before with the same options
+        is answered from the transcript cache without contacting DeepGram.
+        
         Args:
             file_path: Path to the audio file (wav, mp3, flac, ogg, etc.)
+            prefer_proxy: Upload the recording's 16 kHz mono proxy if it has one
             
         Returns:
             Transcript text, or None if failed.
         """
-        client = self._get_client()
-        if not client:
-            return None
-            
-        file_path = Path(file_path)
-        if not file_path.exists():
-            self.error_occurred.emit(f"File not found: {file_path}")
+        source = transcription_source(file_path) if prefer_proxy else Path(file_path)
+        if not source.exists():
+            self.error_occurred.emit(f"File not found: {source}")
             return None
             
         self.transcription_started.emit()
         
         try:
-            with open(file_path, "rb") as audio_file:
-                buffer_data = audio_file.read()
-            
-            response = client.listen.v1.media.transcribe_file(
-                request=buffer_data,
-                model="nova-2",
-                smart_format=True,
-                punctuate=True,
-                paragraphs=True,
-            )
-            
-            # Extract transcript from response
-            transcript = ""
-            if hasattr(response, 'results') and response.results:
-                if hasattr(response.results, 'channels') and response.results.channels:
-                    for channel in response.results.channels:
-                        if hasattr(channel, 'alternatives') and channel.alternatives:
-                            for alternative in channel.alternatives:
-                                if hasattr(alternative, 'transcript'):
-                                    transcript += alternative.transcript + "\n"
-            
-            transcript = transcript.strip()
+            if self.cache is None and self._get_client() is None:
+                self.transcription_finished.emit()
+                return None
+            result = self._cached_transcript(source)
+            # The sidecar keeps word timings and marks the recording as done for batch runs
+            write_transcript(file_path, result)
+            self.transcript_ready.emit(result)
+            transcript = result.text
             
             if transcript:
                 self.transcript_received.emit(transcript)
@@ -121,7 +201,66 @@ class DeepgramService(QObject):
             self.transcription_finished.emit()
             return None
     
-    def transcribe_file_async(self, file_path: str | Path):
+    def run_transcription_job(self, payload: dict) -> str:
+        """
+        Job queue handler: transcribe payload["path"], raising on failure.
+        
+        Unlike transcribe_file, errors propagate so the queue can retry
+        later; a missing file is permanent. The transcript is emitted
+        through transcript_received as usual.
+        """
+        file_path = Path(payload["path"])
+        source = transcription_source(file_path) if payload.get("prefer_proxy", True) else file_path
+        if not source.exists():
+            raise PermanentJobError(f"File not found: {source}")
+        if is_transcribed(file_path):
+            # Already has an up-to-date sidecar, e.g. from live transcription
+            existing = read_transcript(file_path)
+            if existing is not None:
+                return existing.text
+        
+        self.transcription_started.emit()
+        try:
+            result = self._cached_transcript(source)
+        finally:
+            self.transcription_finished.emit()
+        write_transcript(file_path, result)
+        self.transcript_ready.emit(result)
+        transcript = result.text
+        if transcript:
+            self.transcript_received.emit(transcript)
+        return transcript
+    
+    def _cache_options(self) -> dict:
+        """Request options plus how the audio is transcoded for upload."""
+        # A lossy Opus upload can transcribe differently from a lossless one
+        return {
+            **TRANSCRIBE_OPTIONS,
+            "upload_codec": self.upload_codec,
+            "upload_rate": UPLOAD_SAMPLE_RATE if self.upload_codec else None,
+        }
+    
+    def _cached_transcript(self, source: Path, chunked: bool = True) -> Transcript:
+        """
+        Transcript of an upload source, from the cache if possible.
+        
+        Raises:
+            RuntimeError if the file must be uploaded and there is no client.
+        """
+        key = result = None
+        if self.cache is not None:
+            key = self.cache.key_for(source, self._cache_options())
+            result = self.cache.get(key)
+        if result is None:
+            client = self._get_client()
+            if not client:
+                raise RuntimeError("DeepGram API key not configured")
+            result = self._transcribe(client, source, chunked)
+            if key is not None:
+                self.cache.put(key, result)
+        return result
+    
+    def transcribe_file_async(self, file_path: str | Path, prefer_proxy: bool = True):
         """
         Transcribe an audio file asynchronously (non-blocking).
         
@@ -129,19 +268,133 @@ class DeepgramService(QObject):
         
         Args:
             file_path: Path to the audio file
+            prefer_proxy: Upload the recording's 16 kHz mono proxy if it has one
         """
         thread = threading.Thread(
             target=self.transcribe_file,
-            args=(file_path,),
+            args=(file_path, prefer_proxy),
             daemon=True
         )
         thread.start()
     
+    @property
+    def is_batch_running(self) -> bool:
+        """Check if a batch transcription is in progress."""
+        return self._batch is not None
+    
+    def transcribe_batch_async(self, paths: list[str | Path], prefer_proxy: bool = True) -> bool:
+        """
+        Transcribe many recordings in the background, batch_workers at a time.
+        
+        Folders expand to the recordings in them. Recordings that already
+        have an up-to-date transcript sidecar are skipped. Each result is
+        saved as a sidecar next to its recording; text is not emitted
+        through transcript_received. Long files are sent whole, so
+        batch_workers bounds the requests in flight.
+        
+        Args:
+            paths: Recordings and/or folders
+            prefer_proxy: Upload each recording's 16 kHz mono proxy if it has one
+            
+        Returns:
+            True if the batch was started (False if one is already running).
+        """
+        if self._batch is not None:
+            self.error_occurred.emit("A batch transcription is already running")
+            return False
+        if self._get_client() is None:
+            return False
+        
+        def transcribe(path: Path) -> Transcript:
+            source = transcription_source(path) if prefer_proxy else path
+            return self._cached_transcript(source, chunked=False)
+        
+        batch = BatchTranscriber(
+            transcribe,
+            max_workers=self.batch_workers,
+            on_progress=self.batch_progress.emit,
+            on_result=lambda path, result: self.batch_file_done.emit(str(path), ""),
+            on_error=lambda path, error: self.batch_file_done.emit(str(path), error),
+        )
+        self._batch = batch
+        
+        def run():
+            try:
+                report = batch.run(paths)
+            except Exception as e:
+                self.error_occurred.emit(f"Batch transcription failed: {e}")
+                report = batch.progress()
+            self._batch = None
+            self.batch_finished.emit(report)
+        
+        threading.Thread(target=run, daemon=True).start()
+        return True
+    
+    def cancel_batch(self):
+        """Stop a running batch after the files already in flight."""
+        if self._batch is not None:
+            self._batch.cancel()
+    
+    def start_live_transcription(self, feed: LiveAudioFeed, url: Optional[str] = None) -> bool:
+        """
+        Stream a recording's live feed for transcription while it records.
+        
+        Interim text arrives via partial_transcript and settled segments via
+        final_segment. When the recording stops (closing the feed) the last
+        results are collected and the whole text is emitted through
+        transcript_received.
+        
+        Args:
+            feed: Feed from recorder.create_live_feed()
+            url: ws(s):// endpoint of a DeepGram-compatible server, or None
+            
+        Returns:
+            True if the session was started.
+        """
+        api_key = get_api_key(DEEPGRAM_KEY)
+        if not api_key and not url:
+            self.error_occurred.emit("DeepGram API key not configured")
+            return False
+        if self._session is not None:
+            self._session.stop()
+            
+        session = LiveTranscriptionSession(
+            feed,
+            api_key=api_key,
+            url=url or DEEPGRAM_LISTEN_URL,
+            on_partial=self.partial_transcript.emit,
+            on_final=self.final_segment.emit,
+            on_error=self.error_occurred.emit,
+            on_closed=lambda transcript: self._on_live_closed(session, transcript),
+        )
+        self._session = session
+        self._is_streaming = True
+        session.start()
+        return True
+    
+    def _on_live_closed(self, session: LiveTranscriptionSession, transcript: str):
+        """Publish a finished live session's text."""
+        if session is self._session:
+            self._session = None
+            self._is_streaming = False
+        if transcript:
+            self.transcript_received.emit(transcript)
+        ok = session.completed and bool(transcript)
+        self.live_finished.emit(session.feed, session.to_transcript() if ok else None)
+        self.transcription_finished.emit()
+    
     def stop_live_transcription(self):
-        """Stop live streaming transcription."""
+        """Abandon live streaming transcription without waiting for results."""
+        if self._session is not None:
+            self._session.stop()
+            self._session = None
         self._is_streaming = False
     
     def close(self):
         """Clean up resources."""
         self.stop_live_transcription()
+        self.cancel_batch()
         self._client = None
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
@@ -0,0 +1,109 @@
+"""
+MacroVox Encoder Service
+Background process pool that transcodes finished recordings
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from PySide6.QtCore import QObject, Signal
+
+from ..audio.transcode import init_worker, transcode_file
+
+
+class EncoderService(QObject):
+    """
+    Transcodes raw captures to their configured format across CPU cores.
+
+    Encoding runs in worker processes, so it never competes with the
+    capture thread, and several finished memos are encoded in parallel.
+
+    Signals:
+        encode_started: Emits source path when a job is queued
+        encode_progress: Emits (source path, percent complete)
+        encode_finished: Emits (source path, encoded path)
+        error_occurred: Emits error messages
+    """
+
+    encode_started = Signal(str)
+    encode_progress = Signal(str, int)
+    encode_finished = Signal(str, str)
+    error_occurred = Signal(str)
+
+    def __init__(self, max_workers: Optional[int] = None, parent=None):
+        super().__init__(parent)
+        self._max_workers = max_workers or max(1, (os.cpu_count() or 2) // 2)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._progress_queue = None
+        self._listener: Optional[threading.Thread] = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs queued or running."""
+        return self._pending
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Start the worker pool and progress listener on first use."""
+        if self._pool is None:
+            self._progress_queue = multiprocessing.Queue()
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                initializer=init_worker,
+                initargs=(self._progress_queue,),
+            )
+            self._listener = threading.Thread(target=self._listen_progress, daemon=True)
+            self._listener.start()
+        return self._pool
+
+    def _listen_progress(self):
+        """Forward progress reports from worker processes as signals."""
+        while True:
+            item = self._progress_queue.get()
+            if item is None:
+                break
+            source, percent = item
+            self.encode_progress.emit(source, percent)
+
+    def submit(self, source: str | Path, target: str | Path, format: str, subtype: Optional[str] = None):
+        """
+        Queue a capture file for encoding.
+
+        Args:
+            source: Raw capture file (removed after a successful encode)
+            target: Encoded file to produce
+            format: libsndfile major format ("FLAC", "OGG")
+            subtype: libsndfile subtype ("PCM_16", "VORBIS")
+        """
+        source, target = str(source), str(target)
+        try:
+            future = self._get_pool().submit(transcode_file, source, target, format, subtype)
+        except Exception as e:
+            self.error_occurred.emit(f"Failed to queue encode: {e}")
+            return
+
+        self._pending += 1
+        self.encode_started.emit(source)
+        future.add_done_callback(lambda f: self._on_done(source, f))
+
+    def _on_done(self, source: str, future: Future):
+        """Emit completion (runs on the executor's management thread)."""
+        self._pending -= 1
+        try:
+            target = future.result()
+        except Exception as e:
+            self.error_occurred.emit(f"Encoding failed for {Path(source).name}: {e}")
+            return
+        self.encode_finished.emit(source, target)
+
+    def shutdown(self, wait: bool = True):
+        """Stop the pool, letting queued encodes finish if wait is True."""
+        if self._pool is None:
+            return
+        self._pool.shutdown(wait=wait)
+        self._progress_queue.put(None)
+        self._pool = None
@@ -0,0 +1,104 @@
+"""
+MacroVox Job Service
+Durable background queue for transcription and interpretation work
+"""
+
+from pathlib import Path
+from typing import Callable, Optional
+
+from PySide6.QtCore import QObject, Signal
+
+from ..transcription import DEFAULT_QUEUE_PATH, JobQueue, JobRunner
+
+
+class JobService(QObject):
+    """
+    Runs queued work that must survive restarts and outages.
+
+    Jobs are stored in SQLite before they run, so closing the app or a
+    crash doesn't lose them; they resume on the next launch. Failures are
+    retried with jittered exponential backoff for as long as they take
+    (only a PermanentJobError marks a job failed), and the queue is drained
+    at a limited rate so a backlog from an offline spell doesn't hit the
+    API all at once. Jobs submitted with a priority skip that backlog and
+    the rate limit, on a worker of their own.
+
+    Signals:
+        job_finished: Emits (kind, payload, result) when a job succeeds
+        job_failed: Emits (kind, payload, error, seconds until retry or None)
+        error_occurred: Emits error messages
+    """
+
+    job_finished = Signal(str, object, object)
+    job_failed = Signal(str, object, str, object)
+    error_occurred = Signal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.queue: Optional[JobQueue] = None
+        self._runner: Optional[JobRunner] = None
+        self._handlers: dict[str, Callable[[dict], object]] = {}
+
+    def register(self, kind: str, handler: Callable[[dict], object]):
+        """Run jobs of this kind with handler(payload) -> result (raise to retry)."""
+        self._handlers[kind] = handler
+
+    def start(self, path: Optional[str | Path] = None, per_minute: float = 30.0, max_workers: int = 2):
+        """Open the queue (default ~/.macrovox/jobs.sqlite) and start draining it."""
+        if self.queue is not None:
+            return
+        try:
+            self.queue = JobQueue(path or DEFAULT_QUEUE_PATH)
+        except Exception as e:
+            self.error_occurred.emit(f"Job queue unavailable: {e}")
+            return
+        self._runner = JobRunner(
+            self.queue,
+            self._handlers,
+            per_minute=per_minute,
+            max_workers=max_workers,
+            on_done=lambda job, result: self.job_finished.emit(job["kind"], job["payload"], result),
+            on_failed=lambda job, error, retry_in: self.job_failed.emit(
+                job["kind"], job["payload"], error, retry_in
+            ),
+        )
+        self._runner.start()
+
+    def submit(
+        self, kind: str, key: str, payload: dict, ttl: Optional[float] = None, priority: int = 0
+    ) -> bool:
+        """
+        Queue a job unless the same one is already waiting.
+
+        Returns:
+            True if a new job was queued.
+        """
+        if self.queue is None:
+            self.error_occurred.emit("Job queue is not running")
+            return False
+        queued = self.queue.enqueue(kind, key, payload, ttl, priority) is not None
+        if queued:
+            self._runner.wake()
+        return queued
+
+    def counts(self) -> dict:
+        """Number of jobs in each state."""
+        return self.queue.counts() if self.queue is not None else {}
+
+    def retry_failed(self) -> int:
+        """Requeue jobs that failed permanently."""
+        if self.queue is None:
+            return 0
+        count = self.queue.retry_failed()
+        if count:
+            self._runner.wake()
+        return count
+
+    def close(self, timeout: float = 2.0):
+        """Stop the workers; jobs still running resume on the next launch."""
+        if self._runner is not None:
+            self._runner.stop(timeout)
+            self._runner = None
+        if self.queue is not None:
+            self.queue.close()
+            self.queue = None
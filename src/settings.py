@@ -22,6 +22,42 @@ class Settings:
         "theme": "dark",
         "filename_template": "{timestamp}_{label}",
         "timestamp_format": "%Y%m%d_%H%M%S",
+        "buffer_seconds": 10,
+        "write_chunk_seconds": 1.0,
+        "segment_seconds": 0,
+        "segment_mb": 0,
+        "armed": False,
+        "pre_roll_seconds": 3.0,
+        "deferred_encode": False,
+        "encode_workers": 0,
+        "capture_dtype": "float32",
+        "metrics_sidecar": True,
+        "peaks_sidecar": True,
+        "silence_trim": "off",
+        "silence_threshold_db": -45.0,
+        "silence_min_seconds": 1.0,
+        "silence_hangover_seconds": 0.3,
+        "auto_stop_seconds": 0,
+        "transcription_proxy": True,
+        "proxy_sample_rate": 16000,
+        "multi_devices": [],
+        "multi_layout": "channels",
+        "multi_max_skew_seconds": 0.5,
+        "capture_process": False,
+        "live_transcription": False,
+        "live_transcription_url": "",
+        "live_buffer_seconds": 30.0,
+        "transcribe_chunk_seconds": 300,
+        "transcribe_workers": 8,
+        "batch_workers": 4,
+        "upload_codec": "flac",
+        "job_queue_path": "",
+        "job_rate_per_minute": 30,
+        "job_workers": 2,
+        "interpret_job_ttl": 120,
+        "transcript_cache": True,
+        "transcript_cache_path": "",
+        "transcript_cache_mb": 256,
         "tags": DEFAULT_TAGS.copy(),
     }
 
@@ -52,6 +52,10 @@ QLabel#deviceLabel {
     letter-spacing: 1px;
 }
 
+QWidget#levelMeter {
+    color: #00d4aa;
+}
+
 QLineEdit, QComboBox {
     padding: 10px 14px;
     border: 1px solid #1a2633;
@@ -310,7 +314,8 @@ QTreeWidget#fileTree::branch {
     background-color: transparent;
 }
 
-QPushButton#refreshBtn {
+QPushButton#refreshBtn,
+QPushButton#batchBtn {
     background-color: transparent;
     border: 1px solid #263340;
     color: #546e7a;
@@ -318,7 +323,8 @@ QPushButton#refreshBtn {
     font-size: 10px;
 }
 
-QPushButton#refreshBtn:hover {
+QPushButton#refreshBtn:hover,
+QPushButton#batchBtn:hover {
     border-color: #00d4aa;
     color: #00d4aa;
 }
@@ -486,6 +492,10 @@ QLabel#deviceLabel {
     letter-spacing: 1px;
 }
 
+QWidget#levelMeter {
+    color: #00a080;
+}
+
 QLineEdit, QComboBox {
     padding: 10px 14px;
     border: 1px solid #dde3ea;
@@ -0,0 +1,73 @@
+"""
+MacroVox Transcription Pipeline
+Transcription-path building blocks shared by DeepgramService
+"""
+
+from .batch import (
+    BATCH_EXTENSIONS,
+    TRANSCRIPT_SUFFIX,
+    BatchTranscriber,
+    find_audio_files,
+    is_transcribed,
+    read_transcript,
+    transcript_path_for,
+    write_transcript,
+)
+from .cache import DEFAULT_CACHE_PATH, TranscriptCache, content_digest
+from .chunked import ChunkedTranscriber, plan_chunks, silence_levels, write_chunk
+from .jobs import (
+    DEFAULT_QUEUE_PATH,
+    JobQueue,
+    JobRunner,
+    PermanentJobError,
+    RateLimiter,
+    backoff_delay,
+)
+from .live import DEEPGRAM_LISTEN_URL, LiveTranscriptionSession, listen_url
+from .prepare import (
+    UPLOAD_CODECS,
+    UPLOAD_SAMPLE_RATE,
+    PreparedUpload,
+    needs_preparation,
+    request_transcription,
+)
+from .transcript import Transcript, TranscriptChannel, to_srt
+from .upload import UPLOAD_CHUNK_SIZE, iter_file_chunks, upload_headers
+
+__all__ = [
+    "BATCH_EXTENSIONS",
+    "TRANSCRIPT_SUFFIX",
+    "BatchTranscriber",
+    "find_audio_files",
+    "is_transcribed",
+    "read_transcript",
+    "transcript_path_for",
+    "write_transcript",
+    "DEFAULT_CACHE_PATH",
+    "TranscriptCache",
+    "content_digest",
+    "ChunkedTranscriber",
+    "plan_chunks",
+    "silence_levels",
+    "write_chunk",
+    "DEFAULT_QUEUE_PATH",
+    "JobQueue",
+    "JobRunner",
+    "PermanentJobError",
+    "RateLimiter",
+    "backoff_delay",
+    "DEEPGRAM_LISTEN_URL",
+    "LiveTranscriptionSession",
+    "listen_url",
+    "UPLOAD_CODECS",
+    "UPLOAD_SAMPLE_RATE",
+    "PreparedUpload",
+    "needs_preparation",
+    "request_transcription",
+    "Transcript",
+    "TranscriptChannel",
+    "to_srt",
+    "UPLOAD_CHUNK_SIZE",
+    "iter_file_chunks",
+    "upload_headers",
+]
@@ -0,0 +1,190 @@
+"""
+MacroVox Batch Transcription
+Bounded-concurrency transcription of existing recordings with progress
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+import soundfile as sf
+
+from ..audio.peaks import AUDIO_EXTENSIONS
+from ..audio.proxy import is_proxy_path
+from .transcript import Transcript
+
+TRANSCRIPT_SUFFIX = ".transcript"
+BATCH_EXTENSIONS = AUDIO_EXTENSIONS + (".mp3",)
+
+
+def transcript_path_for(audio_path: str | Path) -> Path:
+    """Return the transcript sidecar path for a recording."""
+    audio_path = Path(audio_path)
+    return audio_path.with_name(audio_path.stem + TRANSCRIPT_SUFFIX)
+
+
+def write_transcript(audio_path: str | Path, transcript: Transcript) -> Path:
+    """Store a transcript next to its recording (atomically)."""
+    path = transcript_path_for(audio_path)
+    partial = path.with_name(path.name + ".partial")
+    partial.write_bytes(transcript.to_bytes())
+    partial.replace(path)
+    return path
+
+
+def read_transcript(audio_path: str | Path) -> Optional[Transcript]:
+    """Load a recording's stored transcript, if it has one."""
+    path = transcript_path_for(audio_path)
+    try:
+        return Transcript.from_bytes(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def is_transcribed(audio_path: str | Path) -> bool:
+    """Whether a recording has a transcript at least as new as its audio."""
+    path = transcript_path_for(audio_path)
+    try:
+        return path.stat().st_mtime >= Path(audio_path).stat().st_mtime
+    except OSError:
+        return False
+
+
+def find_audio_files(folder: str | Path) -> list[Path]:
+    """Recordings directly in folder, oldest first, without proxies or partials."""
+    return sorted(
+        (
+            path for path in Path(folder).iterdir()
+            if path.suffix.lower() in BATCH_EXTENSIONS
+            and not is_proxy_path(path)
+            and ".partial" not in path.name
+        ),
+        key=lambda path: path.stat().st_mtime,
+    )
+
+
+def _audio_seconds(path: Path, transcript: Optional[Transcript]) -> float:
+    """Duration from the transcript, else from the file header."""
+    if transcript is not None and transcript.duration:
+        return transcript.duration
+    try:
+        return sf.info(str(path)).duration
+    except RuntimeError:
+        return 0.0
+
+
+class BatchTranscriber:
+    """
+    Transcribes many recordings with at most max_workers requests at once.
+
+    transcribe(path) -> Transcript does one file; each result is written
+    as a transcript sidecar. Files that already have an up-to-date sidecar
+    are skipped without a request. Progress snapshots (counts, elapsed
+    time, files per minute and audio hours per minute) go to on_progress
+    after every file, from the worker that finished it.
+    """
+
+    def __init__(
+        self,
+        transcribe: Callable[[Path], Transcript],
+        max_workers: int = 4,
+        skip_existing: bool = True,
+        on_progress: Optional[Callable[[dict], None]] = None,
+        on_result: Optional[Callable[[Path, Transcript], None]] = None,
+        on_error: Optional[Callable[[Path, str], None]] = None,
+    ):
+        self.transcribe = transcribe
+        self.max_workers = max(1, int(max_workers))
+        self.skip_existing = skip_existing
+        self.on_progress = on_progress
+        self.on_result = on_result
+        self.on_error = on_error
+
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._reset(0)
+
+    def _reset(self, total: int):
+        self._total = total
+        self._done = 0
+        self._skipped = 0
+        self._failed = 0
+        self._cancelled_count = 0
+        self._audio_seconds = 0.0
+        self._started = time.perf_counter()
+
+    def cancel(self):
+        """Stop starting new files; those in flight still finish."""
+        self._cancelled.set()
+
+    def progress(self) -> dict:
+        """Snapshot of the batch so far."""
+        with self._lock:
+            elapsed = time.perf_counter() - self._started
+            minutes = elapsed / 60
+            return {
+                "total": self._total,
+                "done": self._done,
+                "skipped": self._skipped,
+                "failed": self._failed,
+                "cancelled": self._cancelled_count,
+                "remaining": self._total - self._done - self._skipped - self._failed - self._cancelled_count,
+                "elapsed": elapsed,
+                "audio_seconds": self._audio_seconds,
+                "files_per_minute": self._done / minutes if minutes else 0.0,
+                "audio_hours_per_minute": self._audio_seconds / 3600 / minutes if minutes else 0.0,
+            }
+
+    def run(self, paths: Iterable[str | Path]) -> dict:
+        """
+        Transcribe every path (a folder expands to its recordings).
+
+        Blocks until the batch is finished or cancelled.
+
+        Returns:
+            The final progress snapshot.
+        """
+        files: list[Path] = []
+        for path in map(Path, paths):
+            files.extend(find_audio_files(path) if path.is_dir() else [path])
+
+        self._cancelled.clear()
+        with self._lock:
+            self._reset(len(files))
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="batch") as pool:
+            for _ in pool.map(self._run_one, files):
+                pass
+        return self.progress()
+
+    def _run_one(self, path: Path):
+        if self._cancelled.is_set():
+            outcome, result, error = "cancelled", None, None
+        elif self.skip_existing and is_transcribed(path):
+            outcome, result, error = "skipped", None, None
+        else:
+            try:
+                result = self.transcribe(path)
+                write_transcript(path, result)
+                outcome, error = "done", None
+            except Exception as e:
+                outcome, result, error = "failed", None, str(e)
+
+        with self._lock:
+            if outcome == "done":
+                self._done += 1
+                self._audio_seconds += _audio_seconds(path, result)
+            elif outcome == "skipped":
+                self._skipped += 1
+            elif outcome == "failed":
+                self._failed += 1
+            else:
+                self._cancelled_count += 1
+
+        if outcome == "done" and self.on_result:
+            self.on_result(path, result)
+        elif outcome == "failed" and self.on_error:
+            self.on_error(path, error)
+        if self.on_progress:
+            self.on_progress(self.progress())
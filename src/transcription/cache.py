@@ -0,0 +1,167 @@
+"""
+MacroVox Transcript Cache
+Content-addressed, size-bounded store of transcription results
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Optional
+
+from .transcript import Transcript
+
+DEFAULT_CACHE_PATH = Path.home() / ".macrovox" / "transcripts.sqlite"
+
+_HASH_CHUNK = 1 << 20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+CREATE TABLE IF NOT EXISTS digests (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+"""
+
+
+def content_digest(path: str | Path) -> str:
+    """BLAKE2b digest of a file's bytes, read in 1 MiB pieces."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb", buffering=0) as f:
+        while chunk := f.read(_HASH_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TranscriptCache:
+    """
+    Persistent transcript cache keyed by audio content and request options.
+
+    The key is a BLAKE2b hash of the uploaded file's bytes plus the model
+    and options, so a renamed, copied or re-synced file is still a hit and
+    a different model is not. File digests are remembered by path, size
+    and mtime, so asking again for an unchanged file costs one stat.
+
+    Transcripts are stored in their binary form, zlib-compressed, in
+    SQLite. Once the stored bytes exceed max_bytes the least recently used
+    entries are evicted. Safe to use from several transcription threads.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_CACHE_PATH, max_bytes: int = 256 * 1024 * 1024):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        # A lost last_used update after a crash only makes eviction slightly less exact
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def digest(self, audio_path: str | Path) -> str:
+        """Content digest of a file, reusing the stored one if it is unchanged."""
+        audio_path = Path(audio_path).resolve()
+        stat = audio_path.stat()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT digest FROM digests WHERE path = ? AND size = ? AND mtime_ns = ?",
+                (str(audio_path), stat.st_size, stat.st_mtime_ns),
+            ).fetchone()
+        if row:
+            return row[0]
+        digest = content_digest(audio_path)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?)",
+                (str(audio_path), stat.st_size, stat.st_mtime_ns, digest),
+            )
+        return digest
+
+    def key_for(self, audio_path: str | Path, options: dict) -> str:
+        """Cache key for transcribing audio_path with the given options."""
+        key = hashlib.blake2b(digest_size=20)
+        key.update(self.digest(audio_path).encode())
+        key.update(json.dumps(options, sort_keys=True).encode())
+        return key.hexdigest()
+
+    def get(self, key: str) -> Optional[Transcript]:
+        """Return the cached transcript for key, or None (counted as a miss)."""
+        with self._lock:
+            row = self._db.execute("SELECT data FROM results WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                try:
+                    transcript = Transcript.from_bytes(zlib.decompress(row[0]))
+                except (zlib.error, ValueError):
+                    # Written by an older version in another format
+                    with self._db:
+                        self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+                    row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            with self._db:
+                self._db.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        return transcript
+
+    def put(self, key: str, transcript: Transcript):
+        """Store a transcript, then evict least recently used entries over the limit."""
+        data = zlib.compress(transcript.to_bytes(), 6)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                (key, data, len(data), time.time()),
+            )
+            self._evict()
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        doomed = []
+        for key, size in self._db.execute("SELECT key, size FROM results ORDER BY last_used"):
+            doomed.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._db.executemany("DELETE FROM results WHERE key = ?", doomed)
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this session and the cache's current size."""
+        with self._lock:
+            entries, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+        }
+
+    def clear(self):
+        """Drop every cached result and remembered digest."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM results")
+            self._db.execute("DELETE FROM digests")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,176 @@
+"""
+MacroVox Chunked Transcription
+Split long recordings at pauses and transcribe the pieces in parallel
+"""
+
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+import soundfile as sf
+
+from ..audio.vad import frame_rms_db
+from .transcript import Transcript
+
+# Level window used to find pauses
+_WINDOW_SECONDS = 0.1
+
+
+def silence_levels(path: str | Path, window_seconds: float = _WINDOW_SECONDS) -> tuple[np.ndarray, int]:
+    """
+    RMS level in dBFS of every window of a file, read in blocks.
+
+    Returns:
+        (levels, frames per window)
+    """
+    info = sf.info(str(path))
+    window = max(1, int(info.samplerate * window_seconds))
+    levels = []
+    for block in sf.blocks(str(path), blocksize=window * 600, dtype="float32", always_2d=True):
+        mono = block.mean(axis=1) if block.shape[1] > 1 else block[:, 0]
+        levels.append(frame_rms_db(mono, window))
+    return (np.concatenate(levels) if levels else np.zeros(0, dtype=np.float32)), window
+
+
+def plan_chunks(
+    path: str | Path,
+    max_seconds: float = 300.0,
+    search_seconds: float = 30.0,
+) -> list[tuple[int, int]]:
+    """
+    Choose cut points so no chunk is longer than max_seconds.
+
+    Each cut goes in the quietest 100 ms window of the last search_seconds
+    before the limit, so words are not split between chunks.
+
+    Returns:
+        (start_frame, end_frame) pairs covering the whole file in order.
+    """
+    info = sf.info(str(path))
+    total = info.frames
+    limit = int(max_seconds * info.samplerate)
+    if total <= limit:
+        return [(0, total)]
+
+    levels, window = silence_levels(path)
+    search = max(1, int(search_seconds * info.samplerate) // window)
+    chunks = []
+    start = 0
+    while total - start > limit:
+        last = (start + limit) // window  # Last window that fits in this chunk
+        first = max(start // window + 1, last - search)
+        quietest = first + int(np.argmin(levels[first:last])) if last > first else last
+        # Cut in the middle of the quiet window
+        cut = min(start + limit, quietest * window + window // 2)
+        chunks.append((start, cut))
+        start = cut
+    chunks.append((start, total))
+    return chunks
+
+
+def write_chunk(source: str | Path, start: int, end: int, target: str | Path, blocksize: int = 65536):
+    """Copy frames start..end of a recording to a 16-bit FLAC file."""
+    info = sf.info(str(source))
+    with sf.SoundFile(
+        str(target), "w", samplerate=info.samplerate, channels=info.channels, format="FLAC", subtype="PCM_16"
+    ) as out:
+        for block in sf.blocks(str(source), blocksize=blocksize, start=start, stop=end, dtype="int16"):
+            out.write(block)
+
+
+class ChunkedTranscriber:
+    """
+    Transcribes a long recording as parallel chunks and stitches the result.
+
+    The recording is cut at pauses into pieces of at most chunk_seconds.
+    Each piece is written to a temporary FLAC and passed to
+    transcribe_chunk(path) -> DeepGram result dict, with at most
+    max_workers requests in flight. Each result is kept as a compact
+    Transcript as soon as it arrives. A failing chunk is retried on its own
+    with exponential backoff; the others are unaffected. Wall time is
+    roughly one chunk's latency times ceil(chunks / max_workers).
+    """
+
+    def __init__(
+        self,
+        transcribe_chunk: Callable[[Path], dict],
+        chunk_seconds: float = 300.0,
+        max_workers: int = 8,
+        retries: int = 3,
+        retry_delay: float = 1.0,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ):
+        self.transcribe_chunk = transcribe_chunk
+        self.chunk_seconds = chunk_seconds
+        self.max_workers = max(1, int(max_workers))
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.on_progress = on_progress
+        self.attempts = 0
+
+    def should_split(self, path: str | Path) -> bool:
+        """Whether a file is long enough (and readable) to be chunked."""
+        if self.chunk_seconds <= 0:
+            return False
+        try:
+            return sf.info(str(path)).duration > self.chunk_seconds
+        except RuntimeError:
+            return False
+
+    def transcribe(self, path: str | Path) -> Transcript:
+        """
+        Transcribe path chunk by chunk.
+
+        Returns:
+            One Transcript covering the whole recording.
+
+        Raises:
+            RuntimeError if any chunk still fails after its retries.
+        """
+        path = Path(path)
+        info = sf.info(str(path))
+        chunks = plan_chunks(path, self.chunk_seconds)
+        offsets = [start / info.samplerate for start, _ in chunks]
+        done = 0
+
+        with tempfile.TemporaryDirectory(prefix="macrovox-chunks-") as folder:
+            def run(index: int) -> Transcript:
+                start, end = chunks[index]
+                target = Path(folder) / f"{path.stem}.{index:04d}.flac"
+                write_chunk(path, start, end, target)
+                try:
+                    return Transcript.from_result(self._transcribe_with_retries(target))
+                finally:
+                    target.unlink(missing_ok=True)
+
+            results: list[Optional[Transcript]] = [None] * len(chunks)
+            errors: list[str] = []
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as pool:
+                futures = {pool.submit(run, index): index for index in range(len(chunks))}
+                for future in as_completed(futures):
+                    index = futures[future]
+                    try:
+                        results[index] = future.result()
+                    except Exception as e:
+                        errors.append(f"chunk {index + 1}: {e}")
+                        continue
+                    done += 1
+                    if self.on_progress:
+                        self.on_progress(done, len(chunks))
+
+        if errors:
+            raise RuntimeError(f"{len(errors)} of {len(chunks)} chunks failed ({errors[0]})")
+        return Transcript.concatenate(results, offsets, info.duration)
+
+    def _transcribe_with_retries(self, chunk: Path) -> dict:
+        for attempt in range(self.retries + 1):
+            self.attempts += 1
+            try:
+                return self.transcribe_chunk(chunk)
+            except Exception:
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.retry_delay * (2 ** attempt))
@@ -0,0 +1,344 @@
+"""
+MacroVox Job Queue
+Durable, deduplicated work queue with jittered retries and a drain rate
+"""
+
+import json
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+DEFAULT_QUEUE_PATH = Path.home() / ".macrovox" / "jobs.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL,
+    expires REAL,
+    last_error TEXT,
+    created REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS jobs_active_key ON jobs (kind, key) WHERE state IN ('pending', 'running');
+CREATE INDEX IF NOT EXISTS jobs_due ON jobs (state, next_attempt);
+"""
+
+
+class PermanentJobError(Exception):
+    """Raised by a job handler when retrying cannot help."""
+
+
+def backoff_delay(attempt: int, base: float, cap: float, rng: random.Random = random) -> float:
+    """
+    Delay before retry number attempt (1 = first retry).
+
+    Exponential up to cap, with "equal jitter": half the delay is fixed and
+    half random, so jobs that failed together don't retry together.
+    """
+    delay = min(cap, base * 2 ** (attempt - 1))
+    return delay / 2 + rng.uniform(0, delay / 2)
+
+
+class JobQueue:
+    """
+    Persistent queue of transcription and interpretation jobs in SQLite.
+
+    A job is (kind, key, payload). Enqueuing a key that is already pending
+    or running for the same kind is a no-op, so re-requesting a recording
+    doesn't transcribe it twice. A failed job goes back to pending with an
+    exponential, jittered delay capped at max_delay, so an outage of any
+    length only postpones it; it stays as failed only after a permanent
+    error (or max_attempts, if given). Jobs with a ttl are dropped instead
+    of run once they expire, and jobs with a higher priority are claimed
+    before older ones with a lower priority. Jobs left running by a session that ended are
+    pending again when the queue is reopened. Safe to use from several
+    worker threads.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = DEFAULT_QUEUE_PATH,
+        max_attempts: Optional[int] = None,
+        base_delay: float = 30.0,
+        max_delay: float = 3600.0,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max(1, int(max_attempts)) if max_attempts else None
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._migrate()
+        self.resumed = self._recover()
+
+    def _migrate(self):
+        """Add columns introduced since the queue file was created."""
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+        if "priority" not in columns:
+            with self._db:
+                self._db.execute("ALTER TABLE jobs ADD COLUMN priority INTEGER NOT NULL DEFAULT 0")
+
+    def _recover(self) -> int:
+        """Return jobs interrupted by the last shutdown or crash to pending."""
+        with self._lock, self._db:
+            return self._db.execute("UPDATE jobs SET state = 'pending' WHERE state = 'running'").rowcount
+
+    def enqueue(
+        self, kind: str, key: str, payload: dict, ttl: Optional[float] = None, priority: int = 0
+    ) -> Optional[int]:
+        """
+        Add a job unless one with the same kind and key is already queued.
+
+        Args:
+            kind: Which handler runs the job
+            key: Identity for deduplication (e.g. the recording's path)
+            payload: JSON-serializable arguments for the handler
+            ttl: Drop the job if it hasn't run within this many seconds
+            priority: Jobs above 0 run ahead of the backlog (see JobRunner)
+
+        Returns:
+            The new job's id, or None if it was a duplicate.
+        """
+        now = time.time()
+        with self._lock, self._db:
+            cursor = self._db.execute(
+                "INSERT OR IGNORE INTO jobs (kind, key, payload, state, priority, next_attempt, expires, created) "
+                "VALUES (?, ?, ?, 'pending', ?, ?, ?, ?)",
+                (kind, key, json.dumps(payload), priority, now, now + ttl if ttl else None, now),
+            )
+        return cursor.lastrowid if cursor.rowcount else None
+
+    def claim(self, min_priority: int = 0) -> Optional[dict]:
+        """
+        Take the most urgent, then oldest, due job and mark it running.
+
+        Args:
+            min_priority: Only consider jobs with at least this priority
+
+        Returns:
+            {"id", "kind", "key", "payload", "attempts"}, or None if nothing is due.
+        """
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE jobs SET state = 'expired' WHERE state = 'pending' AND expires IS NOT NULL AND expires < ?",
+                (now,),
+            )
+            row = self._db.execute(
+                "SELECT id, kind, key, payload, attempts FROM jobs "
+                "WHERE state = 'pending' AND next_attempt <= ? AND priority >= ? "
+                "ORDER BY priority DESC, next_attempt, id LIMIT 1",
+                (now, min_priority),
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE jobs SET state = 'running' WHERE id = ?", (row[0],))
+        return {"id": row[0], "kind": row[1], "key": row[2], "payload": json.loads(row[3]), "attempts": row[4]}
+
+    def complete(self, job_id: int):
+        """Remove a finished job."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def fail(self, job_id: int, error: str, retry: bool = True) -> Optional[float]:
+        """
+        Record a failed attempt and schedule the next one.
+
+        Returns:
+            Seconds until the retry, or None if the job has given up.
+        """
+        with self._lock, self._db:
+            row = self._db.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            attempts = row[0] + 1
+            if not retry or self.max_attempts and attempts >= self.max_attempts:
+                self._db.execute(
+                    "UPDATE jobs SET state = 'failed', attempts = ?, last_error = ? WHERE id = ?",
+                    (attempts, error, job_id),
+                )
+                return None
+            delay = backoff_delay(attempts, self.base_delay, self.max_delay)
+            self._db.execute(
+                "UPDATE jobs SET state = 'pending', attempts = ?, last_error = ?, next_attempt = ? WHERE id = ?",
+                (attempts, error, time.time() + delay, job_id),
+            )
+        return delay
+
+    def retry_failed(self) -> int:
+        """Give every failed job a fresh set of attempts."""
+        with self._lock, self._db:
+            return self._db.execute(
+                "UPDATE OR IGNORE jobs SET state = 'pending', attempts = 0, next_attempt = ? WHERE state = 'failed'",
+                (time.time(),),
+            ).rowcount
+
+    def next_due_in(self, min_priority: int = 0) -> Optional[float]:
+        """Seconds until the next pending job is due (0 if one is), or None if none are pending."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT MIN(next_attempt) FROM jobs WHERE state = 'pending' AND priority >= ?", (min_priority,)
+            ).fetchone()
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] - time.time())
+
+    def counts(self) -> dict:
+        """Number of jobs in each state."""
+        with self._lock:
+            rows = self._db.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        counts = {"pending": 0, "running": 0, "failed": 0, "expired": 0}
+        counts.update(dict(rows))
+        return counts
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class RateLimiter:
+    """Token bucket allowing per_minute starts on average, burst at once."""
+
+    def __init__(self, per_minute: float, burst: int = 1):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, stop: Optional[threading.Event] = None) -> bool:
+        """Wait for a token; False if stop was set while waiting."""
+        while True:
+            with self._lock:
+                if not self.interval:
+                    return True
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) / self.interval)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) * self.interval
+            if stop is None:
+                time.sleep(wait)
+            elif stop.wait(wait):
+                return False
+
+
+class JobRunner:
+    """
+    Drains a JobQueue with worker threads at a limited rate.
+
+    handlers maps a job kind to handler(payload) -> result. A handler that
+    raises is retried later by the queue (not at all for PermanentJobError).
+    Starts are spread by a token bucket of per_minute, so a backlog built
+    up while offline goes out gradually rather than all at once. Jobs with
+    a priority above 0 are claimed first, and priority_workers extra
+    threads run only those without waiting for a token, so a short
+    interactive job isn't held behind a backlog or long-running handlers.
+    Callbacks run on the worker thread that ran the job.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: dict[str, Callable[[dict], object]],
+        per_minute: float = 30.0,
+        max_workers: int = 2,
+        priority_workers: int = 1,
+        poll_seconds: float = 5.0,
+        on_done: Optional[Callable[[dict, object], None]] = None,
+        on_failed: Optional[Callable[[dict, str, Optional[float]], None]] = None,
+    ):
+        self.queue = queue
+        self.handlers = handlers
+        self.limiter = RateLimiter(per_minute, burst=max_workers)
+        self.max_workers = max(1, int(max_workers))
+        self.priority_workers = max(0, int(priority_workers))
+        self.poll_seconds = poll_seconds
+        self.on_done = on_done
+        self.on_failed = on_failed
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._priority_wake = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._threads)
+
+    def start(self):
+        if self._threads:
+            return
+        self._stop.clear()
+        for index in range(self.max_workers):
+            thread = threading.Thread(target=self._work, name=f"jobs-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        for index in range(self.priority_workers):
+            thread = threading.Thread(target=self._work, args=(True,), name=f"jobs-priority-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def wake(self):
+        """Check for due jobs now (e.g. after enqueuing one)."""
+        self._wake.set()
+        self._priority_wake.set()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop taking jobs and wait for running handlers to return."""
+        self._stop.set()
+        self._wake.set()
+        self._priority_wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _idle(self, min_priority: int, wake: threading.Event):
+        """Sleep until the next job is due, a wake-up, or the poll interval."""
+        due = self.queue.next_due_in(min_priority)
+        wake.wait(self.poll_seconds if due is None else min(due, self.poll_seconds))
+        wake.clear()
+
+    def _work(self, priority_only: bool = False):
+        try:
+            self._drain(priority_only)
+        except sqlite3.ProgrammingError:
+            pass  # Queue closed under a slow handler; its job resumes on the next launch
+
+    def _drain(self, priority_only: bool):
+        min_priority = 1 if priority_only else 0
+        wake = self._priority_wake if priority_only else self._wake
+        while not self._stop.is_set():
+            if self.queue.next_due_in(min_priority) != 0:
+                self._idle(min_priority, wake)
+                continue
+            if not priority_only and not self.limiter.acquire(self._stop):
+                return
+            job = self.queue.claim(min_priority)
+            if job is None:
+                continue
+            handler = self.handlers.get(job["kind"])
+            try:
+                if handler is None:
+                    raise PermanentJobError(f"No handler for {job['kind']} jobs")
+                result = handler(job["payload"])
+            except Exception as e:
+                retry_in = self.queue.fail(job["id"], str(e), retry=not isinstance(e, PermanentJobError))
+                if self.on_failed:
+                    self.on_failed(job, str(e), retry_in)
+                continue
+            self.queue.complete(job["id"])
+            if self.on_done:
+                self.on_done(job, result)
@@ -0,0 +1,200 @@
+"""
+MacroVox Live Transcription
+Streams a recording's LiveAudioFeed to a DeepGram-compatible websocket
+"""
+
+import json
+import threading
+import time
+from typing import Callable, Optional
+from urllib.parse import urlencode
+
+from websockets.exceptions import ConnectionClosed
+from websockets.sync.client import connect
+
+from ..audio.live_feed import LiveAudioFeed
+from .transcript import Transcript
+
+DEEPGRAM_LISTEN_URL = "wss://api.deepgram.com/v1/listen"
+
+_KEEPALIVE = json.dumps({"type": "KeepAlive"})
+_CLOSE_STREAM = json.dumps({"type": "CloseStream"})
+
+
+def listen_url(base: str, sample_rate: int, model: str = "nova-2") -> str:
+    """Build a streaming URL for 16-bit mono PCM with interim results."""
+    params = {
+        "model": model,
+        "encoding": "linear16",
+        "sample_rate": int(sample_rate),
+        "channels": 1,
+        "interim_results": "true",
+        "smart_format": "true",
+        "punctuate": "true",
+    }
+    return f"{base}?{urlencode(params)}"
+
+
+class LiveTranscriptionSession:
+    """
+    One websocket session for the lifetime of a recording.
+
+    A sender thread reads the feed, so the capture callback only ever
+    copies into the feed's ring. Each send carries whatever has queued
+    since the last one (about 100 ms normally, up to a second when the
+    connection is slow), and a blocked send simply lets the feed's
+    bounded ring absorb the backlog. When the recording stops the feed is
+    closed; the session sends the tail and CloseStream, then waits for the
+    server's last results.
+
+    Callbacks run on the session's threads:
+        on_partial(text): interim text for the segment being spoken
+        on_final(text): settled text for that segment (may be empty)
+        on_error(message): connection or protocol failure
+        on_closed(transcript): session over; all final text joined
+          (check completed to tell a clean end from a failed one)
+    """
+
+    def __init__(
+        self,
+        feed: LiveAudioFeed,
+        api_key: Optional[str] = None,
+        url: str = DEEPGRAM_LISTEN_URL,
+        model: str = "nova-2",
+        on_partial: Optional[Callable[[str], None]] = None,
+        on_final: Optional[Callable[[str], None]] = None,
+        on_error: Optional[Callable[[str], None]] = None,
+        on_closed: Optional[Callable[[str], None]] = None,
+        keepalive_seconds: float = 5.0,
+        connect_timeout: float = 10.0,
+        close_timeout: float = 10.0,
+    ):
+        self.feed = feed
+        self.url = listen_url(url, feed.target_rate, model)
+        self.api_key = api_key
+        self.on_partial = on_partial
+        self.on_final = on_final
+        self.on_error = on_error
+        self.on_closed = on_closed
+        self.keepalive_seconds = keepalive_seconds
+        self.connect_timeout = connect_timeout
+        self.close_timeout = close_timeout
+
+        self.bytes_sent = 0
+        self.messages_sent = 0
+        self.first_word_at: Optional[float] = None  # perf_counter timestamps
+        self.finished_at: Optional[float] = None
+        self._finals: list[str] = []
+        self._words: list[dict] = []
+        self._ws = None
+        self._aborted = False
+        self._failed = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def transcript(self) -> str:
+        """Final text received so far."""
+        return " ".join(self._finals)
+
+    def to_transcript(self) -> Transcript:
+        """Final results so far as a Transcript (with word timings if the server sent them)."""
+        return Transcript.from_result({
+            "metadata": {"duration": self.feed.frames_read / self.feed.sample_rate, "channels": 1},
+            "results": {"channels": [{"alternatives": [{
+                "transcript": self.transcript,
+                "words": self._words,
+            }]}]},
+        })
+
+    @property
+    def completed(self) -> bool:
+        """Whether the session ran to the end without an error or being stopped."""
+        return self.finished_at is not None and not self._aborted and not self._failed
+
+    def start(self):
+        """Connect and start streaming in the background."""
+        self._thread = threading.Thread(target=self._run, name="live-transcription", daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the session has closed. Returns False on timeout."""
+        if self._thread:
+            self._thread.join(timeout)
+            return not self._thread.is_alive()
+        return True
+
+    def stop(self):
+        """Abandon the session without waiting for final results."""
+        self._aborted = True
+        self.feed.close()
+        if self._ws is not None:
+            self._ws.close()
+
+    def _error(self, message: str):
+        self._failed = True
+        if self.on_error and not self._aborted:
+            self.on_error(message)
+
+    def _run(self):
+        headers = {"Authorization": f"Token {self.api_key}"} if self.api_key else None
+        try:
+            self._ws = connect(
+                self.url, additional_headers=headers, open_timeout=self.connect_timeout
+            )
+        except Exception as e:
+            self._error(f"Live transcription could not connect: {e}")
+            self._finish()
+            return
+
+        receiver = threading.Thread(target=self._receive, daemon=True)
+        receiver.start()
+        try:
+            while not self._aborted:
+                data = self.feed.read(timeout=self.keepalive_seconds)
+                if data is None:
+                    self._ws.send(_CLOSE_STREAM)
+                    break
+                # Silence from the feed still needs a heartbeat to keep the session
+                self._ws.send(data if data else _KEEPALIVE)
+                self.bytes_sent += len(data)
+                self.messages_sent += 1
+            receiver.join(self.close_timeout)
+        except ConnectionClosed as e:
+            self._error(f"Live transcription connection closed: {e}")
+        except Exception as e:
+            self._error(f"Live transcription failed: {e}")
+        finally:
+            self._ws.close()
+            receiver.join(self.close_timeout)
+            self._finish()
+
+    def _receive(self):
+        """Dispatch results until the server closes the connection."""
+        try:
+            for message in self._ws:
+                if isinstance(message, bytes):
+                    continue
+                result = json.loads(message)
+                if result.get("type") != "Results":
+                    continue
+                alternatives = result.get("channel", {}).get("alternatives") or [{}]
+                text = alternatives[0].get("transcript", "")
+                if text and self.first_word_at is None:
+                    self.first_word_at = time.perf_counter()
+                if result.get("is_final"):
+                    if text:
+                        self._finals.append(text)
+                        self._words.extend(alternatives[0].get("words") or [])
+                    if self.on_final:
+                        self.on_final(text)
+                elif text and self.on_partial:
+                    self.on_partial(text)
+        except ConnectionClosed:
+            pass
+        except Exception as e:
+            self._error(f"Live transcription result error: {e}")
+
+    def _finish(self):
+        self.finished_at = time.perf_counter()
+        if self.on_closed:
+            self.on_closed(self.transcript)
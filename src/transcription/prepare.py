@@ -0,0 +1,222 @@
+"""
+MacroVox Upload Preparation
+Transcode recordings to compact mono speech audio in a worker process
+"""
+
+import multiprocessing
+import tempfile
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+import soundfile as sf
+
+from ..audio.resample import PolyphaseResampler
+from .upload import iter_file_chunks, upload_headers
+
+UPLOAD_SAMPLE_RATE = 16000
+
+# codec -> (libsndfile format, subtype, Content-Type)
+UPLOAD_CODECS = {
+    "flac": ("FLAC", "PCM_16", "audio/flac"),
+    "opus": ("OGG", "OPUS", "audio/ogg"),
+}
+
+# Encoded bytes are handed to the uploader in pieces of this size
+_PIPE_CHUNK = 1 << 16
+
+
+def needs_preparation(path: str | Path, target_rate: int = UPLOAD_SAMPLE_RATE) -> bool:
+    """
+    Whether transcoding would shrink the upload.
+
+    False for files already compressed, mono and at or below target_rate
+    (such as transcription proxies), and for files libsndfile can't read,
+    which are uploaded as they are.
+    """
+    try:
+        info = sf.info(str(path))
+    except RuntimeError:
+        return False
+    return not (info.format in ("FLAC", "OGG") and info.channels == 1 and info.samplerate <= target_rate)
+
+
+def _mono_blocks(src: sf.SoundFile, target_rate: int, blocksize: int = 65536) -> Iterator[np.ndarray]:
+    """Yield a file's audio mixed to mono and resampled, block by block."""
+    resampler = PolyphaseResampler(src.samplerate, target_rate) if src.samplerate != target_rate else None
+    for block in src.blocks(blocksize=blocksize, dtype="float32", always_2d=True):
+        mono = block.mean(axis=1) if block.shape[1] > 1 else block[:, 0]
+        yield resampler.process(mono) if resampler else mono
+    if resampler:
+        yield resampler.flush()
+
+
+class _PipeWriter:
+    """Write-only file object for soundfile that sends bytes down a Pipe."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._pending = bytearray()
+        self._position = 0
+
+    def write(self, data) -> int:
+        self._pending += data
+        self._position += len(data)
+        if len(self._pending) >= _PIPE_CHUNK:
+            self.flush()
+        return len(data)
+
+    def flush(self):
+        if self._pending:
+            self._conn.send(bytes(self._pending))
+            self._pending.clear()
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        # Ogg is written strictly forward; only position queries are allowed
+        if offset == 0 and whence in (1, 2) or whence == 0 and offset == self._position:
+            return self._position
+        raise OSError("Upload stream is not seekable")
+
+    def read(self, size: int = -1) -> bytes:
+        return b""
+
+
+def _encode_to_pipe(source: str, codec: str, target_rate: int, conn):
+    """
+    Transcode worker process.
+
+    Sends encoded bytes, then None when done, or an error message string.
+    """
+    format, subtype, _ = UPLOAD_CODECS[codec]
+    try:
+        with sf.SoundFile(source) as src:
+            rate = min(src.samplerate, target_rate)
+            if format == "FLAC":
+                # FLAC rewrites its header on close, so encode fully before sending
+                with tempfile.TemporaryDirectory(prefix="macrovox-upload-") as folder:
+                    target = Path(folder) / "upload.flac"
+                    with sf.SoundFile(target, "w", rate, 1, subtype, format=format) as dst:
+                        for block in _mono_blocks(src, rate):
+                            dst.write(block)
+                    for chunk in iter_file_chunks(target, _PIPE_CHUNK):
+                        conn.send(chunk)
+            else:
+                # Ogg pages go out as they are encoded, overlapping with the upload
+                sink = _PipeWriter(conn)
+                with sf.SoundFile(sink, "w", rate, 1, subtype, format=format) as dst:
+                    for block in _mono_blocks(src, rate):
+                        dst.write(block)
+                sink.flush()
+        conn.send(None)
+    except Exception as e:
+        try:
+            conn.send(f"{type(e).__name__}: {e}")
+        except OSError:
+            pass  # The uploader stopped reading
+    finally:
+        conn.close()
+
+
+class PreparedUpload:
+    """
+    Request body that transcodes a recording for upload as it is read.
+
+    A capture is usually 44.1/48 kHz PCM WAV; speech recognition needs no
+    more than 16 kHz mono. Iterating starts a worker process that mixes
+    down, resamples and encodes (lossless FLAC, or Opus at several times
+    smaller again), and yields the encoded bytes, so the original is never
+    loaded whole and the encode runs off the UI and upload threads. Opus
+    is streamed while it encodes; FLAC is sent once its header is final.
+    The size isn't known ahead, so the body goes out with chunked transfer
+    encoding.
+    """
+
+    def __init__(self, source: str | Path, codec: str = "flac", target_rate: int = UPLOAD_SAMPLE_RATE):
+        if codec not in UPLOAD_CODECS:
+            raise ValueError(f"Unknown upload codec: {codec}")
+        self.source = Path(source)
+        self.codec = codec
+        self.target_rate = int(target_rate)
+        self.bytes_sent = 0
+        self._process: Optional[multiprocessing.Process] = None
+
+    @property
+    def content_type(self) -> str:
+        return UPLOAD_CODECS[self.codec][2]
+
+    def __iter__(self) -> Iterator[bytes]:
+        context = multiprocessing.get_context("spawn")
+        conn, child_conn = context.Pipe(duplex=False)
+        self._process = context.Process(
+            target=_encode_to_pipe,
+            args=(str(self.source), self.codec, self.target_rate, child_conn),
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        try:
+            while True:
+                try:
+                    item = conn.recv()
+                except EOFError:
+                    raise RuntimeError("Upload transcoder exited unexpectedly") from None
+                if item is None:
+                    return
+                if isinstance(item, str):
+                    raise RuntimeError(f"Could not transcode {self.source.name} for upload: {item}")
+                self.bytes_sent += len(item)
+                yield item
+        finally:
+            conn.close()
+            self.close()
+
+    def close(self):
+        """Stop the worker, e.g. when the upload was abandoned."""
+        if self._process is not None:
+            self._process.join(timeout=1.0)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join()
+            self._process = None
+
+
+def request_transcription(
+    client,
+    file_path: str | Path,
+    options: dict,
+    codec: str = "flac",
+    target_rate: int = UPLOAD_SAMPLE_RATE,
+) -> dict:
+    """
+    Send one file to a DeepgramClient's pre-recorded endpoint.
+
+    The body is streamed from disk, or from a PreparedUpload when
+    transcoding shrinks it (codec "" sends every file as it is). A
+    streamed body can only be read once, so the SDK's own retries are
+    turned off: a resend would carry an empty or half-used body. Callers
+    retry instead (ChunkedTranscriber per chunk, JobRunner per job).
+
+    Returns:
+        The response as a dict.
+    """
+    file_path = Path(file_path)
+    if codec and needs_preparation(file_path, target_rate):
+        body = PreparedUpload(file_path, codec, target_rate)
+        # Lower case, so it replaces the SDK's own content-type when merged
+        headers = {"content-type": body.content_type}
+    else:
+        body = iter_file_chunks(file_path)
+        headers = upload_headers(file_path)
+    try:
+        response = client.listen.v1.media.transcribe_file(
+            request=iter(body),
+            **options,
+            request_options={"additional_headers": headers, "max_retries": 0},
+        )
+    finally:
+        if isinstance(body, PreparedUpload):
+            body.close()
+    return response.dict()
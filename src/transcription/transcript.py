@@ -0,0 +1,356 @@
+"""
+MacroVox Transcript Model
+Compact word-timed transcripts with a fast binary sidecar format
+"""
+
+import re
+import struct
+from typing import Iterable, Optional
+
+import numpy as np
+
+_MAGIC = b"MVTR"
+_VERSION = 1
+# Fields are laid out so every array starts 4-byte aligned
+_HEADER = struct.Struct("<4sBxHd")           # magic, version, channels, duration
+_CHANNEL = struct.Struct("<fIIIBBxxII")      # confidence, words, paragraphs, sentences,
+                                             # has speakers, has text, blob bytes, text bytes
+
+_NORMALIZE = re.compile(r"[^\w']+")
+
+
+def _normalize(word: str) -> str:
+    """Lowercase a word and drop surrounding punctuation, for search."""
+    return _NORMALIZE.sub("", word.lower())
+
+
+class TranscriptChannel:
+    """
+    One channel's transcript: words with timings, plus sentence and paragraph breaks.
+
+    Per-word data lives in parallel numpy arrays (start, end, confidence
+    and optionally speaker), and the words themselves in one UTF-8 blob
+    with end offsets, so an hour of speech is a handful of buffers rather
+    than tens of thousands of dicts. Sentences and paragraphs are stored
+    as the index of their first word.
+    """
+
+    __slots__ = (
+        "confidence",
+        "starts",
+        "ends",
+        "confidences",
+        "speakers",
+        "paragraph_words",
+        "sentence_words",
+        "_blob",
+        "_word_ends",
+        "_text",
+        "_words",
+    )
+
+    def __init__(
+        self,
+        words: list[str],
+        starts: np.ndarray,
+        ends: np.ndarray,
+        confidences: np.ndarray,
+        speakers: Optional[np.ndarray] = None,
+        paragraph_words: Optional[np.ndarray] = None,
+        sentence_words: Optional[np.ndarray] = None,
+        confidence: float = 0.0,
+        text: Optional[str] = None,
+    ):
+        encoded = [word.encode("utf-8") for word in words]
+        self._blob = b"".join(encoded)
+        self._word_ends = np.cumsum([len(word) for word in encoded], dtype=np.uint32)
+        self._words: Optional[list[str]] = list(words)
+        self.starts = np.asarray(starts, dtype=np.float32)
+        self.ends = np.asarray(ends, dtype=np.float32)
+        self.confidences = np.asarray(confidences, dtype=np.float32)
+        self.speakers = None if speakers is None else np.asarray(speakers, dtype=np.int16)
+        self.paragraph_words = np.asarray(
+            paragraph_words if paragraph_words is not None else [0] * bool(words), dtype=np.uint32
+        )
+        self.sentence_words = np.asarray(
+            sentence_words if sentence_words is not None else [], dtype=np.uint32
+        )
+        self.confidence = float(confidence)
+        # Only kept when it isn't simply the words joined by spaces
+        self._text = text if text and text != " ".join(words) else None
+
+    @classmethod
+    def from_alternative(cls, alternative: dict) -> "TranscriptChannel":
+        """Build from one DeepGram alternative (words, paragraphs, transcript)."""
+        items = alternative.get("words") or []
+        words = [item.get("punctuated_word") or item.get("word", "") for item in items]
+        starts = np.array([item.get("start", 0.0) for item in items], dtype=np.float64)
+        ends = np.array([item.get("end", 0.0) for item in items], dtype=np.float64)
+        confidences = [item.get("confidence", 0.0) for item in items]
+        speakers = [item["speaker"] for item in items] if items and "speaker" in items[0] else None
+
+        paragraphs = (alternative.get("paragraphs") or {}).get("paragraphs") or []
+        paragraph_words = sentence_words = None
+        if paragraphs and items:
+            # Breaks are located by start time; times come from the same words
+            paragraph_words = np.searchsorted(starts, [p.get("start", 0.0) - 1e-3 for p in paragraphs])
+            sentence_words = np.searchsorted(
+                starts,
+                [s.get("start", 0.0) - 1e-3 for p in paragraphs for s in p.get("sentences") or []],
+            )
+        return cls(
+            words,
+            starts,
+            ends,
+            confidences,
+            speakers,
+            paragraph_words,
+            sentence_words,
+            alternative.get("confidence", 0.0),
+            alternative.get("transcript", ""),
+        )
+
+    def __len__(self) -> int:
+        return len(self._word_ends)
+
+    @property
+    def words(self) -> list[str]:
+        """The words, with punctuation (decoded on first use)."""
+        if self._words is None:
+            text = self._blob.decode("utf-8")
+            if text.isascii():
+                bounds = self._word_ends.tolist()
+                self._words = [text[a:b] for a, b in zip([0] + bounds, bounds)]
+            else:
+                bounds = [0] + self._word_ends.tolist()
+                self._words = [self._blob[a:b].decode("utf-8") for a, b in zip(bounds, bounds[1:])]
+        return self._words
+
+    @property
+    def text(self) -> str:
+        return self._text if self._text is not None else " ".join(self.words)
+
+    def word_at(self, seconds: float) -> int:
+        """Index of the word being spoken at seconds (or the last one before it); -1 if none."""
+        return int(np.searchsorted(self.starts, seconds, side="right")) - 1
+
+    def find(self, phrase: str) -> list[int]:
+        """Indexes of the first word of each match of phrase, ignoring case and punctuation."""
+        terms = [_normalize(term) for term in phrase.split()]
+        terms = [term for term in terms if term]
+        if not terms:
+            return []
+        normalized = [_normalize(word) for word in self.words]
+        last = len(normalized) - len(terms)
+        return [
+            index for index, word in enumerate(normalized)
+            if word == terms[0] and index <= last and normalized[index:index + len(terms)] == terms
+        ]
+
+    def _spans(self, firsts: np.ndarray) -> list[tuple[float, float, str]]:
+        bounds = firsts.tolist() + [len(self)]
+        words = self.words
+        return [
+            (round(float(self.starts[a]), 3), round(float(self.ends[b - 1]), 3), " ".join(words[a:b]))
+            for a, b in zip(bounds, bounds[1:])
+            if b > a
+        ]
+
+    def paragraphs(self) -> list[tuple[float, float, str]]:
+        """(start, end, text) of each paragraph."""
+        return self._spans(self.paragraph_words)
+
+    def sentences(self) -> list[tuple[float, float, str]]:
+        """(start, end, text) of each sentence, if DeepGram returned sentences."""
+        return self._spans(self.sentence_words)
+
+    def _pack(self) -> list[bytes]:
+        text = self._text.encode("utf-8") if self._text is not None else b""
+        parts = [
+            _CHANNEL.pack(
+                self.confidence, len(self), len(self.paragraph_words), len(self.sentence_words),
+                self.speakers is not None, self._text is not None, len(self._blob), len(text),
+            ),
+            self._word_ends.tobytes(),
+            self.starts.tobytes(),
+            self.ends.tobytes(),
+            self.confidences.tobytes(),
+            self.paragraph_words.tobytes(),
+            self.sentence_words.tobytes(),
+        ]
+        if self.speakers is not None:
+            parts.append(self.speakers.tobytes())
+        parts += [self._blob, text]
+        size = sum(len(part) for part in parts)
+        parts.append(bytes(-size % 4))
+        return parts
+
+    @classmethod
+    def _unpack(cls, data: memoryview, offset: int) -> tuple["TranscriptChannel", int]:
+        (confidence, count, paragraphs, sentences, has_speakers, has_text, blob_size, text_size) = (
+            _CHANNEL.unpack_from(data, offset)
+        )
+        start = offset
+        offset += _CHANNEL.size
+
+        def take(dtype, n):
+            nonlocal offset
+            array = np.frombuffer(data, dtype=dtype, count=n, offset=offset)
+            offset += array.nbytes
+            return array
+
+        channel = cls.__new__(cls)
+        channel._word_ends = take(np.uint32, count)
+        channel.starts = take(np.float32, count)
+        channel.ends = take(np.float32, count)
+        channel.confidences = take(np.float32, count)
+        channel.paragraph_words = take(np.uint32, paragraphs)
+        channel.sentence_words = take(np.uint32, sentences)
+        channel.speakers = take(np.int16, count) if has_speakers else None
+        channel._blob = bytes(data[offset:offset + blob_size])
+        offset += blob_size
+        channel._text = bytes(data[offset:offset + text_size]).decode("utf-8") if has_text else None
+        offset += text_size
+        offset += -(offset - start) % 4
+        channel.confidence = confidence
+        channel._words = None
+        return channel, offset
+
+    @classmethod
+    def concatenate(cls, parts: list["TranscriptChannel"], offsets: list[float]) -> "TranscriptChannel":
+        """Join channel pieces in order, moving each piece's times by its offset."""
+        counts = np.cumsum([0] + [len(part) for part in parts])
+        words = [word for part in parts for word in part.words]
+        speakers = None
+        if parts and all(part.speakers is not None for part in parts):
+            speakers = np.concatenate([part.speakers for part in parts])
+        texts = [part.text.strip() for part in parts]
+        sizes = [len(part) for part in parts]
+        confidence = float(np.average([part.confidence for part in parts], weights=sizes)) if sum(sizes) else 0.0
+        return cls(
+            words,
+            np.concatenate([part.starts + offset for part, offset in zip(parts, offsets)]) if parts else [],
+            np.concatenate([part.ends + offset for part, offset in zip(parts, offsets)]) if parts else [],
+            np.concatenate([part.confidences for part in parts]) if parts else [],
+            speakers,
+            np.concatenate([part.paragraph_words + count for part, count in zip(parts, counts)]) if parts else None,
+            np.concatenate([part.sentence_words + count for part, count in zip(parts, counts)]) if parts else None,
+            confidence,
+            " ".join(text for text in texts if text),
+        )
+
+
+class Transcript:
+    """
+    A recording's transcript: one TranscriptChannel per audio channel.
+
+    Built from a DeepGram result with from_result() (keeping each
+    channel's top alternative), and stored with to_bytes()/from_bytes(),
+    a flat binary layout whose arrays load without parsing.
+    """
+
+    __slots__ = ("duration", "channels")
+
+    def __init__(self, channels: list[TranscriptChannel], duration: float = 0.0):
+        self.channels = channels
+        self.duration = float(duration)
+
+    @classmethod
+    def from_result(cls, result: dict) -> "Transcript":
+        """Build from a DeepGram pre-recorded response dict."""
+        channels = [
+            TranscriptChannel.from_alternative((channel.get("alternatives") or [{}])[0])
+            for channel in (result.get("results") or {}).get("channels") or []
+        ]
+        return cls(channels, (result.get("metadata") or {}).get("duration") or 0.0)
+
+    @classmethod
+    def concatenate(cls, parts: list["Transcript"], offsets: list[float], duration: float) -> "Transcript":
+        """
+        Join transcripts of consecutive pieces of one recording, in order.
+
+        Word, sentence and paragraph times are moved by each piece's offset
+        so they refer to the whole recording.
+        """
+        count = max((len(part.channels) for part in parts), default=0)
+        channels = []
+        for index in range(count):
+            pieces = [(part.channels[index], offset) for part, offset in zip(parts, offsets)
+                      if index < len(part.channels)]
+            channels.append(TranscriptChannel.concatenate([p for p, _ in pieces], [o for _, o in pieces]))
+        return cls(channels, duration)
+
+    @property
+    def text(self) -> str:
+        """Each channel's text, one per line."""
+        return "\n".join(channel.text for channel in self.channels).strip()
+
+    @property
+    def word_count(self) -> int:
+        return sum(len(channel) for channel in self.channels)
+
+    def to_bytes(self) -> bytes:
+        parts = [_HEADER.pack(_MAGIC, _VERSION, len(self.channels), self.duration)]
+        for channel in self.channels:
+            parts.extend(channel._pack())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Transcript":
+        """
+        Load a transcript written by to_bytes().
+
+        Raises:
+            ValueError if data is not a transcript in a known version.
+        """
+        view = memoryview(data)
+        if len(view) < _HEADER.size:
+            raise ValueError("Not a MacroVox transcript")
+        magic, version, count, duration = _HEADER.unpack_from(view, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Not a MacroVox transcript")
+        offset = _HEADER.size
+        channels = []
+        for _ in range(count):
+            channel, offset = TranscriptChannel._unpack(view, offset)
+            channels.append(channel)
+        return cls(channels, duration)
+
+
+def _srt_time(seconds: float) -> str:
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+
+
+def _cues(channel: TranscriptChannel, max_chars: int, max_seconds: float) -> Iterable[tuple[float, float, str]]:
+    """Group words into subtitle cues, breaking at sentences or the size limits."""
+    breaks = set(channel.sentence_words.tolist())
+    words = channel.words
+    first = 0
+    length = 0
+    for index, word in enumerate(words):
+        if index > first and (
+            index in breaks
+            or length + 1 + len(word) > max_chars
+            or channel.ends[index] - channel.starts[first] > max_seconds
+        ):
+            yield float(channel.starts[first]), float(channel.ends[index - 1]), " ".join(words[first:index])
+            first, length = index, 0
+        length += len(word) + (length > 0)
+    if first < len(words):
+        yield float(channel.starts[first]), float(channel.ends[-1]), " ".join(words[first:])
+
+
+def to_srt(transcript: Transcript, channel: int = 0, max_chars: int = 84, max_seconds: float = 6.0) -> str:
+    """SubRip subtitles for one channel of a transcript."""
+    if channel >= len(transcript.channels):
+        return ""
+    return "\n".join(
+        f"{number}\n{_srt_time(start)} --> {_srt_time(end)}\n{text}\n"
+        for number, (start, end, text) in enumerate(
+            _cues(transcript.channels[channel], max_chars, max_seconds), start=1
+        )
+    )
@@ -0,0 +1,37 @@
+"""
+MacroVox Streaming Upload
+Chunked request bodies read from disk instead of whole-file bytes
+"""
+
+import os
+from pathlib import Path
+from typing import Iterator
+
+# Big enough that per-chunk overhead vanishes, small enough to stay flat in RAM
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+
+def iter_file_chunks(path: str | Path, chunk_size: int = UPLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Yield a file's bytes in fixed-size chunks for a streamed request body.
+
+    Only one chunk is alive at a time, so memory use does not grow with
+    the recording's length. The file stays open until the generator is
+    exhausted or closed.
+    """
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def upload_headers(path: str | Path) -> dict[str, str]:
+    """
+    Headers for streaming a file as the request body.
+
+    A known Content-Length lets the HTTP client send the generator as a
+    plain body rather than falling back to chunked transfer encoding.
+    """
+    return {"Content-Length": str(os.path.getsize(path))}
@@ -10,6 +10,11 @@ from pathlib import Path
 
 from PySide6.QtCore import Qt, QTimer, Signal
 from PySide6.QtGui import QColor, QFont
+try:
+    from PySide6.QtMultimedia import QMediaDevices
+    HAS_QT_MULTIMEDIA = True
+except ImportError:
+    HAS_QT_MULTIMEDIA = False
 from PySide6.QtWidgets import (
     QApplication,
     QColorDialog,
@@ -30,15 +35,20 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from .panels import FileBrowserPanel, OutputPanel, TerminalPanel
+from .audio import LevelAnalyzer, device_registry
+from .panels import FileBrowserPanel, LevelMeter, OutputPanel, TerminalPanel
 from .recorder import VoiceRecorder
+from .recorder_process import RecorderProcess
 from .services import (
     set_api_key, has_api_key, DEEPGRAM_KEY, ANTHROPIC_KEY,
     DeepgramService,
     ClaudeService,
+    EncoderService,
+    JobService,
 )
 from .settings import Settings
 from .themes import DEFAULT_TAGS, get_theme
+from .transcription import DEFAULT_CACHE_PATH, write_transcript
 
 
 class FlowLayout(QHBoxLayout):
@@ -231,9 +241,16 @@ class SettingsDialog(QDialog):
         audio_group = QGroupBox("AUDIO")
         audio_layout = QFormLayout(audio_group)
 
+        mic_layout = QHBoxLayout()
         self.mic_combo = QComboBox()
         self._populate_microphones()
-        audio_layout.addRow("MICROPHONE", self.mic_combo)
+        mic_layout.addWidget(self.mic_combo, 1)
+        refresh_mic_btn = QPushButton("↻")
+        refresh_mic_btn.setFixedWidth(32)
+        refresh_mic_btn.setToolTip("Rescan audio devices")
+        refresh_mic_btn.clicked.connect(self._refresh_microphones)
+        mic_layout.addWidget(refresh_mic_btn)
+        audio_layout.addRow("MICROPHONE", mic_layout)
 
         self.format_combo = QComboBox()
         for fmt in VoiceRecorder.get_supported_formats():
@@ -381,6 +398,11 @@ class SettingsDialog(QDialog):
             if dev["id"] == current_device:
                 self.mic_combo.setCurrentIndex(self.mic_combo.count() - 1)
 
+    def _refresh_microphones(self):
+        """Rescan devices and repopulate the dropdown."""
+        device_registry.refresh()
+        self._populate_microphones()
+
     def _browse_folder(self):
         """Open folder browser dialog."""
         folder = QFileDialog.getExistingDirectory(
@@ -425,10 +447,39 @@ class RecorderPanel(QFrame):
 class VoiceMemoApp(QMainWindow):
     """Main application window - IDE-style voice-to-text workstation."""
 
+    # Raised from the recorder's writer thread; delivered on the UI thread
+    auto_stop_requested = Signal()
+    capture_finalized = Signal(str)
+    capture_failed = Signal(str)
+    # A recording is complete on disk (after any deferred encode)
+    file_finalized = Signal(str)
+    # One [rms, peak, bands...] array per meter frame, from the level analyzer
+    level_frame = Signal(object)
+
     def __init__(self):
         super().__init__()
         self.settings = Settings()
-        self.recorder = VoiceRecorder(self.settings.to_dict())
+        if self.settings.get("capture_process", False):
+            # Capture and writing run in their own process, clear of the GIL
+            self.recorder = RecorderProcess(self.settings.to_dict())
+        else:
+            self.recorder = VoiceRecorder(self.settings.to_dict())
+        self.recorder.on_auto_stop = self.auto_stop_requested.emit
+        self.auto_stop_requested.connect(self._on_auto_stop)
+        self.recorder.on_finalized = self.capture_finalized.emit
+        self.recorder.on_error = self.capture_failed.emit
+        self.capture_finalized.connect(self._on_capture_finalized)
+        self.capture_failed.connect(self._on_capture_failed)
+        self.file_finalized.connect(self._on_file_finalized)
+        
+        # Enumerate audio devices in the background; rescan on hotplug
+        device_registry.set_reinitialize_guard(lambda: not self.recorder.is_stream_open)
+        device_registry.start()
+        if HAS_QT_MULTIMEDIA:
+            self._media_devices = QMediaDevices(self)
+            self._media_devices.audioInputsChanged.connect(device_registry.invalidate)
+            if isinstance(self.recorder, RecorderProcess):
+                self._media_devices.audioInputsChanged.connect(self.recorder.invalidate_devices)
         self.recording_duration = 0
         self.timer = QTimer()
         self.timer.timeout.connect(self._update_duration)
@@ -441,6 +492,26 @@ class VoiceMemoApp(QMainWindow):
         self.deepgram.transcription_started.connect(self._on_transcription_started)
         self.deepgram.transcription_finished.connect(self._on_transcription_finished)
         self.deepgram.error_occurred.connect(self._on_transcription_error)
+        self.deepgram.partial_transcript.connect(self._on_live_partial)
+        self.deepgram.final_segment.connect(self._on_live_final)
+        self.deepgram.live_finished.connect(self._on_live_finished)
+        self.deepgram.chunk_progress.connect(self._on_chunk_progress)
+        self.deepgram.batch_progress.connect(self._on_batch_progress)
+        self.deepgram.batch_file_done.connect(self._on_batch_file_done)
+        self.deepgram.batch_finished.connect(self._on_batch_finished)
+        self._configure_deepgram()
+        # Live sessions (by feed) and the recording stem each one transcribes
+        self._live_stems: dict[object, str] = {}
+        # Live transcripts (by stem) of recordings not yet finalized on disk
+        self._live_transcribed: dict[str, object] = {}
+        # Finished recordings waiting to hear whether their live session succeeded
+        self._awaiting_live: dict[str, str] = {}
+        
+        # Background encoder for deferred flac/ogg recordings
+        self.encoder = EncoderService(self.settings.get("encode_workers") or None, self)
+        self.encoder.encode_progress.connect(self._on_encode_progress)
+        self.encoder.encode_finished.connect(self._on_encode_finished)
+        self.encoder.error_occurred.connect(self._on_encode_error)
         
         # Claude command interpretation service
         self.claude = ClaudeService(self)
@@ -450,12 +521,28 @@ class VoiceMemoApp(QMainWindow):
         self.claude.response_received.connect(self._on_claude_response)
         self.claude.error_occurred.connect(self._on_claude_error)
         
+        # Durable queue for transcription and interpretation requests
+        self.jobs = JobService(self)
+        self.jobs.register("transcribe", self.deepgram.run_transcription_job)
+        self.jobs.register("interpret", self.claude.run_interpret_job)
+        self.jobs.job_failed.connect(self._on_job_failed)
+        self.jobs.error_occurred.connect(lambda error: self.terminal.log(error, "error"))
+        
         # Command history for context
         self.command_history: list[str] = []
         
         self._setup_ui()
         self._apply_theme()
         self._connect_panels()
+        self._recover_segments()
+        self._start_jobs()
+        if self.settings.get("armed", False):
+            self._arm_recorder()
+
+        # Live meter: analyzed off the audio callback, capped at ~30 frames/s
+        self.level_analyzer = LevelAnalyzer(self.recorder, self.level_frame.emit)
+        self.level_frame.connect(self.level_meter.set_frame)
+        self.level_analyzer.start()
 
     def _setup_ui(self):
         """Initialize the IDE-style user interface."""
@@ -535,6 +622,10 @@ class VoiceMemoApp(QMainWindow):
         self.duration_label.setObjectName("durationLabel")
         layout.addWidget(self.duration_label)
 
+        # Live level and spectrum
+        self.level_meter = LevelMeter()
+        layout.addWidget(self.level_meter)
+
         # Device info
         device_name = self.settings.get("device_name", "Default")
         self.device_label = QLabel(f"◉ {device_name}")
@@ -542,6 +633,12 @@ class VoiceMemoApp(QMainWindow):
         self.device_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(self.device_label)
 
+        # Live capture-path readout (updated with the duration timer)
+        self.metrics_label = QLabel("")
+        self.metrics_label.setObjectName("deviceLabel")
+        self.metrics_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.metrics_label)
+
         layout.addSpacing(4)
 
         # Tags section
@@ -604,6 +701,7 @@ class VoiceMemoApp(QMainWindow):
         self.file_browser.file_selected.connect(
             lambda path: self.terminal.log(f"Selected: {Path(path).name}", "info")
         )
+        self.file_browser.transcribe_requested.connect(self._start_batch_transcription)
         
         # Terminal command handling
         self.terminal.command_entered.connect(self._handle_terminal_command)
@@ -611,6 +709,43 @@ class VoiceMemoApp(QMainWindow):
         # Output panel AI processing
         self.output_panel.process_with_ai.connect(self._process_text_with_ai)
         
+    def _recover_segments(self):
+        """Stitch recordings left in segments by a previous crash."""
+        recovered = self.recorder.recover_segments()
+        for path in recovered:
+            self.terminal.log(f"Recovered: {Path(path).name}", "warning")
+        if recovered:
+            self.file_browser.refresh()
+
+    def _start_jobs(self):
+        """Open the job queue and resume work left from the last session."""
+        self.jobs.start(
+            self.settings.get("job_queue_path") or None,
+            per_minute=self.settings.get("job_rate_per_minute", 30),
+            max_workers=self.settings.get("job_workers", 2),
+        )
+        counts = self.jobs.counts()
+        if counts.get("pending"):
+            self.terminal.log(f"Resuming {counts['pending']} queued jobs", "info")
+
+    def _on_job_failed(self, kind: str, payload: dict, error: str, retry_in):
+        """Report a failed job and when it will be tried again."""
+        what = "Transcription" if kind == "transcribe" else "Interpretation"
+        if retry_in is None:
+            self.terminal.log(f"{what} failed, giving up: {error}", "error")
+        else:
+            self.terminal.log(f"{what} failed, retrying in {retry_in:.0f}s: {error}", "warning")
+
+    def _arm_recorder(self):
+        """Open a warm input stream so REC captures the pre-roll."""
+        try:
+            self.recorder.arm()
+        except Exception as e:
+            self.terminal.log(f"Could not arm microphone: {e}", "error")
+            return
+        seconds = self.settings.get("pre_roll_seconds", 3.0)
+        self.terminal.log(f"Microphone armed ({seconds:g}s pre-roll)", "info")
+
     def _handle_terminal_command(self, command: str):
         """Handle commands from the terminal."""
         cmd_lower = command.lower().strip()
@@ -630,6 +765,30 @@ class VoiceMemoApp(QMainWindow):
         elif cmd_lower == "refresh":
             self.file_browser.refresh()
             self.terminal.log("File list refreshed", "success")
+        elif cmd_lower == "stats":
+            self.terminal.log(self.recorder.metrics.summary(), "info")
+        elif cmd_lower in ("arm", "disarm") and self.recorder.is_recording:
+            self.terminal.log(f"Stop recording before using {cmd_lower}", "warning")
+        elif cmd_lower == "arm":
+            self.settings.set("armed", True)
+            self._arm_recorder()
+        elif cmd_lower == "disarm":
+            self.settings.set("armed", False)
+            self.recorder.disarm()
+            self.terminal.log("Microphone disarmed", "info")
+        elif cmd_lower == "batch":
+            self._start_batch_transcription([self.recorder.get_output_folder()])
+        elif cmd_lower == "jobs":
+            counts = self.jobs.counts()
+            self.terminal.log(", ".join(f"{count} {state}" for state, count in counts.items()), "info")
+        elif cmd_lower == "retry":
+            self.terminal.log(f"Retrying {self.jobs.retry_failed()} failed jobs", "info")
+        elif cmd_lower == "cancel":
+            if self.deepgram.is_batch_running:
+                self.deepgram.cancel_batch()
+                self.terminal.log("Cancelling batch after files in flight", "warning")
+            else:
+                self.terminal.log("No batch running", "warning")
 
     def _rebuild_tag_buttons(self):
         """Rebuild tag buttons from settings."""
@@ -688,7 +847,10 @@ class VoiceMemoApp(QMainWindow):
     def _start_recording(self):
         """Start recording audio."""
         label = self._get_label()
+        live_feed = self._open_live_feed()
         filepath = self.recorder.start_recording(label)
+        if live_feed is not None:
+            self._start_live_transcription(live_feed, filepath)
 
         self.record_btn.setText("■ STOP")
         self.record_btn.setProperty("recording", True)
@@ -707,7 +869,7 @@ class VoiceMemoApp(QMainWindow):
         self.terminal.set_status("RECORDING", True)
 
     def _stop_recording(self):
-        """Stop recording audio."""
+        """Stop recording audio; the file is finalized in the background."""
         self.timer.stop()
         filepath = self.recorder.stop_recording()
 
@@ -717,7 +879,7 @@ class VoiceMemoApp(QMainWindow):
         self.record_btn.style().polish(self.record_btn)
 
         filename = Path(filepath).name if filepath else "Unknown"
-        self.status_label.setText(f"SAVED: {filename}")
+        self.status_label.setText(f"FINALIZING: {filename}")
         self.label_input.setEnabled(True)
         self.label_input.clear()
         self.settings_btn.setEnabled(True)
@@ -728,15 +890,135 @@ class VoiceMemoApp(QMainWindow):
             btn.set_selected(False)
         self.selected_tags.clear()
         
-        # Update terminal and refresh file browser
-        self.terminal.log(f"Saved: {filename}", "success")
+        # Ready for the next take; capture_finalized follows once the file is written
+        self.terminal.log(f"Stopped: {filename}", "info")
         self.terminal.set_status("READY", True)
+
+    def _open_live_feed(self):
+        """Tap the next recording for live transcription, if enabled."""
+        if not self.settings.get("live_transcription", False):
+            return None
+        if not (self.deepgram.is_configured or self.settings.get("live_transcription_url")):
+            return None
+        try:
+            return self.recorder.create_live_feed()
+        except RuntimeError as e:
+            self.terminal.log(f"Live transcription unavailable: {e}", "error")
+            return None
+
+    def _start_live_transcription(self, feed, filepath: str):
+        """Stream the recording to DeepGram; text fills the output as spoken."""
+        url = self.settings.get("live_transcription_url") or None
+        if self.deepgram.start_live_transcription(feed, url):
+            self.output_panel.clear()
+            self._live_stems[feed] = Path(filepath).stem
+            self.terminal.log("Live transcription started", "info")
+
+    def _on_live_partial(self, text: str):
+        """Show interim text for the segment being spoken."""
+        self.output_panel.append_text(text, partial=True)
+
+    def _on_live_final(self, text: str):
+        """Settle the current segment's text."""
+        self.output_panel.append_text(f"{text} " if text else "")
+
+    def _on_live_finished(self, feed, transcript):
+        """Keep a live session's Transcript, or fall back to a file transcription."""
+        stem = self._live_stems.pop(feed, None)
+        if stem is None:
+            return
+        filepath = self._awaiting_live.pop(stem, None)
+        if transcript is None:
+            if filepath is not None:
+                self._queue_transcription(filepath)
+        elif filepath is None:
+            self._live_transcribed[stem] = transcript
+        else:
+            self._save_live_transcript(filepath, transcript)
+
+    def _save_live_transcript(self, filepath: str, transcript):
+        """Store a live transcript as the recording's sidecar, like a file transcription."""
+        try:
+            write_transcript(filepath, transcript)
+        except OSError as e:
+            self.terminal.log(f"Could not save live transcript: {e}", "error")
+            self._queue_transcription(filepath)
+
+    def _abandon_live(self):
+        """Stop live transcription; its recordings get file transcriptions instead."""
+        self.deepgram.stop_live_transcription()
+        self._live_stems.clear()
+        for filepath in self._awaiting_live.values():
+            self._queue_transcription(filepath)
+        self._awaiting_live.clear()
+
+    def _on_capture_finalized(self, filepath: str):
+        """Handle the writer thread finishing a capture file."""
+        # Encode off the capture path; transcription waits for the final file
+        if self.recorder.is_deferred_encode:
+            target, fmt, subtype = self.recorder.encode_job(filepath)
+            self.terminal.log(f"Encoding {Path(target).name}...", "info")
+            self.encoder.submit(filepath, target, fmt, subtype)
+            return
+
+        self.file_finalized.emit(filepath)
+
+    def _on_capture_failed(self, error: str):
+        """Handle the writer thread failing to write a recording."""
+        if not self.recorder.is_recording:
+            self.status_label.setText("SAVE FAILED")
+        self.terminal.log(error, "error")
         self.file_browser.refresh()
-        
-        # Auto-transcribe if DeepGram is configured
+
+    def _on_file_finalized(self, filepath: str):
+        """A recording is complete on disk: show it and transcribe it."""
+        filename = Path(filepath).name
+        if not self.recorder.is_recording:
+            self.status_label.setText(f"SAVED: {filename}")
+        self.terminal.log(f"Saved: {filename}", "success")
+        self.file_browser.refresh()
+        self._transcribe_recording(filepath)
+
+    def _transcribe_recording(self, filepath: str):
+        """Auto-transcribe a finished recording if DeepGram is configured."""
+        stem = Path(filepath).stem if filepath else ""
+        if stem in self._live_transcribed:
+            # Its text already streamed in while recording
+            self._save_live_transcript(filepath, self._live_transcribed.pop(stem))
+            return
+        if stem in self._live_stems.values():
+            # Decided once the live session ends
+            self._awaiting_live[stem] = filepath
+            return
+        self._queue_transcription(filepath)
+
+    def _queue_transcription(self, filepath: str):
+        """Queue a recording for file transcription."""
         if filepath and self.deepgram.is_configured:
             self.terminal.log("Transcribing audio...", "info")
-            self.deepgram.transcribe_file_async(filepath)
+            self.jobs.submit("transcribe", str(Path(filepath).resolve()), {"path": filepath})
+
+    def _on_encode_progress(self, source: str, percent: int):
+        """Show encode progress for the most recent recording."""
+        if not self.recorder.is_recording:
+            self.status_label.setText(f"ENCODING {percent}%")
+
+    def _on_encode_finished(self, source: str, target: str):
+        """Handle a deferred encode completing."""
+        self.terminal.log(f"Encoded: {Path(target).name}", "success")
+        self.file_finalized.emit(target)
+
+    def _on_encode_error(self, error: str):
+        """Handle encoder error."""
+        self.terminal.log(error, "error")
+
+    def _on_auto_stop(self):
+        """Stop a recording that has gone quiet (auto_stop_seconds)."""
+        if not self.recorder.is_recording:
+            return
+        seconds = self.settings.get("auto_stop_seconds", 0)
+        self.terminal.log(f"No speech for {seconds:g}s, stopping", "info")
+        self._stop_recording()
 
     def _update_duration(self):
         """Update the duration display."""
@@ -744,6 +1026,7 @@ class VoiceMemoApp(QMainWindow):
         minutes = self.recording_duration // 60
         seconds = self.recording_duration % 60
         self.duration_label.setText(f"{minutes:02d}:{seconds:02d}")
+        self.metrics_label.setText(self.recorder.metrics.summary())
 
     def _open_output_folder(self):
         """Open the output folder in the system file explorer."""
@@ -761,11 +1044,15 @@ class VoiceMemoApp(QMainWindow):
         dialog.setStyleSheet(self.styleSheet())
         
         if dialog.exec() == QDialog.Accepted:
-            self.recorder.update_config(**self.settings.to_dict())
+            try:
+                self.recorder.update_config(**self.settings.to_dict())
+            except Exception as e:
+                self.terminal.log(f"Could not re-arm microphone: {e}", "error")
             self._apply_theme()
             device_name = self.settings.get("device_name", "Default")
             self.device_label.setText(f"◉ {device_name}")
             self._rebuild_tag_buttons()
+            self._configure_deepgram()
             
             # Update file browser with new output folder
             self.file_browser.set_folder(self.recorder.get_output_folder())
@@ -783,12 +1070,73 @@ class VoiceMemoApp(QMainWindow):
             return
             
         self.terminal.log("Interpreting command...", "info")
-        self.claude.interpret_command(
+        # Commands run as soon as they are interpreted, so stale requests expire unrun;
+        # the user is waiting on this one, so it goes ahead of queued transcriptions
+        self.jobs.submit(
+            "interpret",
             text,
-            working_dir=None,
-            recent_commands=self.command_history[-5:] if self.command_history else None
+            {
+                "transcript": text,
+                "working_dir": None,
+                "recent_commands": self.command_history[-5:] if self.command_history else None,
+            },
+            ttl=self.settings.get("interpret_job_ttl", 120),
+            priority=1,
         )
         
+    def _configure_deepgram(self):
+        """Apply transcription settings to the DeepGram service."""
+        self.deepgram.configure_chunking(
+            self.settings.get("transcribe_chunk_seconds", 300),
+            self.settings.get("transcribe_workers", 8),
+        )
+        self.deepgram.configure_batch(self.settings.get("batch_workers", 4))
+        self.deepgram.configure_upload(self.settings.get("upload_codec", "flac"))
+        cache_path = None
+        if self.settings.get("transcript_cache", True):
+            cache_path = self.settings.get("transcript_cache_path") or DEFAULT_CACHE_PATH
+        self.deepgram.configure_cache(cache_path, self.settings.get("transcript_cache_mb", 256))
+
+    def _on_chunk_progress(self, done: int, total: int):
+        """Report progress through a long recording sent in chunks."""
+        self.terminal.log(f"Transcribed part {done}/{total}", "info")
+
+    def _start_batch_transcription(self, paths: list[str]):
+        """Transcribe recordings (or folders of them) in the background."""
+        if not self.deepgram.is_configured:
+            self.terminal.log("DeepGram API key not configured", "error")
+            return
+        if self.deepgram.transcribe_batch_async(paths):
+            self.terminal.log(f"Batch transcription started ({self.deepgram.batch_workers} at a time)", "info")
+
+    def _on_batch_progress(self, progress: dict):
+        """Show how far a batch has got."""
+        if self.recorder.is_recording:
+            return
+        finished = progress["total"] - progress["remaining"]
+        self.status_label.setText(
+            f"BATCH {finished}/{progress['total']} · {progress['files_per_minute']:.1f} FILES/MIN"
+        )
+
+    def _on_batch_file_done(self, path: str, error: str):
+        """Log each file of a batch as it finishes."""
+        if error:
+            self.terminal.log(f"Failed: {Path(path).name} ({error})", "error")
+        else:
+            self.terminal.log(f"Transcribed: {Path(path).name}", "success")
+
+    def _on_batch_finished(self, report: dict):
+        """Summarize a finished batch."""
+        self.terminal.log(
+            f"Batch done: {report['done']} transcribed, {report['skipped']} skipped, "
+            f"{report['failed']} failed in {report['elapsed']:.0f}s "
+            f"({report['files_per_minute']:.1f} files/min, "
+            f"{report['audio_hours_per_minute']:.2f} audio h/min)",
+            "warning" if report["failed"] or report["cancelled"] else "success",
+        )
+        if not self.recorder.is_recording:
+            self.status_label.setText("READY")
+
     def _on_transcription_started(self):
         """Handle transcription start."""
         self.output_panel.set_text("Transcribing...")
@@ -837,8 +1185,20 @@ class VoiceMemoApp(QMainWindow):
 
     def closeEvent(self, event):
         """Handle window close - stop recording if active."""
+        self.level_analyzer.stop()
+        self._abandon_live()
         if self.recorder.is_recording:
             self._stop_recording()
+        self.recorder.disarm()
+        # Let stopped recordings finish writing, and queue their deferred encodes
+        self.recorder.wait_finalized(timeout=10.0)
+        QApplication.processEvents()
+        self.recorder.close()
+        self.encoder.shutdown(wait=True)
+        # Deliver finished encodes so their transcriptions are queued too
+        QApplication.processEvents()
+        # Unfinished jobs stay queued and resume on the next launch
+        self.jobs.close()
         event.accept()
 
 
@@ -0,0 +1,31 @@
+#!/usr/bin/env python
+"""
+Generate waveform peak sidecars for recordings made before they existed.
+Usage: python tools/backfill_peaks.py <folder> [--workers N] [--overwrite]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.audio.peaks import backfill_peaks  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill waveform peak sidecars")
+    parser.add_argument("folder", help="Recordings folder (searched recursively)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--overwrite", action="store_true", help="Rebuild existing sidecars")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    written = backfill_peaks(args.folder, max_workers=args.workers, overwrite=args.overwrite)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {len(written)} peak files in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()